@@ -0,0 +1,126 @@
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import Chia_Log_Collector as collector
+
+# Motifs de l'ancien analyseur (regex complète + strptime sur chaque ligne)
+legacy_log_pattern = collector.log_pattern
+legacy_other_patterns = [collector.pool_info_pattern, collector.farmer_info_pattern, collector.points_pattern]
+
+
+def legacy_parse_line(line):
+    match = legacy_log_pattern.match(line)
+    if match:
+        timestamp = datetime.strptime(match.group(1), '%Y-%m-%dT%H:%M:%S.%f')
+        return timestamp, int(match.group(2)), int(match.group(3)), float(match.group(4)), int(match.group(5))
+    for pattern in legacy_other_patterns:
+        if pattern.search(line):
+            return True
+    return None
+
+
+def fast_parse_line(line):
+    parsed_line = collector.parse_log_line(line)
+    if parsed_line:
+        return parsed_line
+    for marker, pattern in ((collector.pool_info_marker, collector.pool_info_pattern),
+                            (collector.farmer_info_marker, collector.farmer_info_pattern),
+                            (collector.points_marker, collector.points_pattern)):
+        if marker in line and pattern.search(line):
+            return True
+    return None
+
+
+# Génère un debug.log synthétique : une ligne harvester pour quatre lignes d'autres services
+def generate_log(file_path, entries):
+    timestamp = datetime.now() - timedelta(seconds=9.4 * entries)
+    with open(file_path, 'w') as file:
+        for i in range(entries):
+            timestamp += timedelta(seconds=9.4)
+            ts = timestamp.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+            proofs = 1 if random.random() < 0.02 else 0
+            file.write(f"{ts} 2.4.1 harvester chia.harvester.harvester: INFO     {random.randint(0, 9)} plots were eligible for farming "
+                       f"1a2b3c4d5e... Found {proofs} proofs. Time: {random.expovariate(1.5):.5f} s. Total 3210 plots\n")
+            file.write(f"{ts} 2.4.1 full_node chia.full_node.full_node: INFO     Added unfinished_block 4f2c, not farmed by us, "
+                       f"SP: 12 farmer response time: 0.0071, Pool pk xch1qq, validation time: 0.0021 seconds, cost: 0, percent full: 0.0%\n")
+            file.write(f"{ts} 2.4.1 full_node chia.full_node.full_node: INFO     ⏲️  Finished signage point 12/64: CC: 9a8b PoS: 7c6d\n")
+            file.write(f"{ts} 2.4.1 farmer chia.farmer.farmer: INFO     New signage point 4e5f... received from full node\n")
+            file.write(f"{ts} 2.4.1 wallet wallet_server: INFO     Received a signage point 12 from peer 127.0.0.1\n")
+            if i % 50 == 0:
+                file.write(f"{ts} 2.4.1 farmer chia.farmer.farmer: INFO     GET /farmer response: "
+                           f"{{'current_difficulty': 12, 'current_points': {i}}}\n")
+
+
+def measure(parse, lines):
+    start = time.perf_counter()
+    for line in lines:
+        parse(line)
+    return len(lines) / (time.perf_counter() - start)
+
+
+def reset_store():
+    collector.reset_log_data(["benchmark"])
+
+
+# Chargement complet d'un fichier par le chemin de FileSource.load : intervalles alignés sur les fins de ligne
+# analysés par parse_range, dans le processus courant puis sur un pool de processus, et fusionnés dans l'ordre
+def measure_cold_load(file_path, workers):
+    size = os.path.getsize(file_path)
+    ranges = collector.split_ranges(file_path, 0, size)
+    rates = []
+
+    reset_store()
+    start = time.perf_counter()
+    for range_start, range_stop in ranges:
+        collector.merge_parsed_range(collector.parse_range(file_path, range_start, range_stop, False))
+    rates.append(size / (time.perf_counter() - start))
+
+    reset_store()
+    # Démarrage des processus compris, comme lors du premier chargement de l'application
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(workers, 1), mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = [executor.submit(collector.parse_range, file_path, range_start, range_stop, False)
+                   for range_start, range_stop in ranges]
+        for future in futures:
+            collector.merge_parsed_range(future.result())
+    rates.append(size / (time.perf_counter() - start))
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark de l'analyse des lignes de debug.log")
+    parser.add_argument("--entries", type=int, default=100000, help="nombre de signage points générés")
+    parser.add_argument("--log", help="debug.log existant à utiliser à la place du log synthétique")
+    parser.add_argument("--workers", type=int, default=collector.parallel_workers, help="nombre de processus pour le chargement parallèle")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = args.log
+        if not file_path:
+            file_path = os.path.join(directory, "debug.log")
+            generate_log(file_path, args.entries)
+
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
+            lines = file.readlines()
+
+        serial_load, parallel_load = measure_cold_load(file_path, args.workers)
+
+    legacy_rate = measure(legacy_parse_line, lines)
+    fast_rate = measure(fast_parse_line, lines)
+
+    print(f"Lignes analysées : {len(lines)}")
+    print(f"Avant (regex + strptime)    : {legacy_rate:,.0f} lignes/s")
+    print(f"Après (filtre + décodage)   : {fast_rate:,.0f} lignes/s")
+    print(f"Accélération                : x{fast_rate / legacy_rate:.1f}")
+    print(f"Chargement séquentiel       : {serial_load / 1024 / 1024:,.1f} Mo/s")
+    print(f"Chargement parallèle ({args.workers:>2})  : {parallel_load / 1024 / 1024:,.1f} Mo/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2921 @@
+import argparse
+import ast
+import asyncio
+import bisect
+import copy
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import math
+import mmap
+import multiprocessing
+import os
+import platform
+import queue
+import re
+import shlex
+import signal
+import sqlite3
+import struct
+import subprocess
+import threading
+import time
+from array import array
+from collections import deque, namedtuple
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+from urllib.request import Request, urlopen
+
+import numpy as np
+
+# Chemin du log par défaut
+system = platform.system()
+if system == "Linux":
+    default_log_file = os.path.expanduser("~/.chia/mainnet/log/debug.log")
+elif system == "Windows":
+    default_log_file = os.path.expandvars(r"%systemdrive%\%homepath%\.chia\mainnet\log\debug.log")
+elif system == "Darwin":  # MacOS
+    default_log_file = os.path.expanduser("~/Library/Application Support/Chia/mainnet/log/debug.log")
+
+personal_log = r'\\VM-CHIA\.chia\mainnet\log\debug.log'
+
+# Regex de recherche des logs
+log_pattern = re.compile(r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}) \S+ harvester chia\.harvester\.harvester: INFO\s+(\d+) plots were eligible for farming \w+\.\.\. Found (\d+) proofs\. Time: ([\d.]+) s\. Total (\d+) plots')
+pool_info_pattern = re.compile(r"GET /pool_info response:\s+({.*})")
+farmer_info_pattern = re.compile(r"GET /farmer response:\s+({.*})")
+giga_horse_fee_pattern = re.compile(r"fee_rate = (?P<fee_rate>\d+\.\d+) %")
+points_pattern = re.compile(r"Points: (\d+)")
+
+# Sous-chaînes testées avant toute expression régulière pour rejeter rapidement les lignes inutiles
+harvester_marker = "harvester chia.harvester.harvester"
+eligible_marker = "eligible for farming"
+pool_info_marker = "GET /pool_info"
+farmer_info_marker = "GET /farmer"
+points_marker = "Points: "
+giga_horse_marker = "Found proof"
+
+# Recherche des marqueurs dans les octets du fichier mappé : un motif par marqueur, chacun commençant par
+# un littéral pour profiter de la recherche rapide du module re (une alternative unique serait bien plus lente)
+marker_patterns = [
+    re.compile(re.escape(eligible_marker.encode())),
+    re.compile(rb"GET /(?:pool_info|farmer)"),
+    re.compile(re.escape(points_marker.encode())),
+    re.compile(re.escape(giga_horse_marker.encode())),
+]
+
+# Taille des blocs lus lors du chargement du log (1 Mo)
+read_chunk_size = 1024 * 1024
+
+# Taille d'une fenêtre du fichier mappé examinée entre deux rapports de progression (16 Mo)
+scan_window_size = 16 * 1024 * 1024
+
+# Nombre de fichiers tournés (debug.log.1 ... debug.log.N) relus au démarrage
+log_history_depth = 7
+
+# Analyse parallèle du chargement initial : nombre de processus, taille d'un intervalle et volume minimal
+# à analyser (debug.log et ses fichiers tournés ensemble)
+parallel_workers = os.cpu_count() or 1
+parallel_range_size = 16 * 1024 * 1024  # octets
+parallel_min_size = 64 * 1024 * 1024  # octets
+
+# Surveillance du fichier : scrutation adaptative (intervalle doublé tant que rien ne change)
+watch_min_interval = 0.02  # secondes
+watch_max_interval = 2.0  # secondes
+
+# Ingestion asynchrone : durée d'un appel bloquant (partage réseau) au-delà de laquelle la source est signalée
+# lente, reconnexion exponentielle après une erreur, silence maximal d'un flux (un signage point toutes les
+# ~9 secondes) et nombre de lots en attente d'analyse avant de suspendre la lecture des sources
+source_timeout = 10  # secondes
+reconnect_min_delay = 1  # secondes
+reconnect_max_delay = 60  # secondes
+stream_idle_timeout = 120  # secondes
+source_queue_size = 64
+
+# Retard maximal d'un échantillon sur les plus récents au-delà duquel le LogStore est remis dans l'ordre,
+# une fois la source qui rattrapait son retard (chargement tardif, reconnexion) arrivée au bout de son log
+store_max_lag = 60000  # millisecondes
+
+# Préfixes des sources en flux : connexion TCP, socket Unix ou sortie d'une commande (ssh ... tail -F)
+stream_prefixes = ("tcp://", "unix://", "cmd:")
+
+# Historique persistant (SQLite) : conservation de chaque niveau en jours (None : sans limite) ; les
+# échantillons avec preuve trouvée ne sont jamais supprimés
+history_retention = {'samples': 30, 'rollup_1m': 180, 'rollup_1h': None}
+# Période au-delà de laquelle l'historique est lu dans les agrégats horaires plutôt que par minute
+history_minute_span = 7 * 86400000  # millisecondes
+# Intervalle entre deux applications de la politique de conservation, et nombre maximal d'échantillons
+# enregistrés par transaction
+history_retention_interval = 3600  # secondes
+history_batch_rows = 100000
+
+# Fenêtres glissantes des temps de recherche, quantiles affichés, et précision de l'histogramme logarithmique
+# (erreur relative maximale d'un quantile, entre sketch_min_value et sketch_max_value secondes)
+latency_windows = {"10 min": 10 * 60000, "1 h": 3600000, "24 h": 86400000}  # millisecondes
+latency_quantiles = (0.5, 0.95, 0.99)
+sketch_relative_accuracy = 0.01
+sketch_min_value = 0.001  # secondes
+sketch_max_value = 300  # secondes
+# Cadence des signage points (un toutes les 600 / 64 secondes) : intervalle attendu au départ, multiple de
+# l'intervalle appris au-delà duquel un écart entre deux lignes est un trou, vitesse d'apprentissage
+# (moyenne mobile exponentielle), trous et heures de comptage conservés
+signage_point_interval = 9375  # millisecondes
+cadence_gap_multiple = 3
+cadence_learning_rate = 0.01
+cadence_max_gaps = 1000
+cadence_hours = 7 * 24
+# Sans nouvelle ligne, un instantané est quand même publié à cet intervalle pour que les fenêtres vieillissent
+snapshot_refresh_interval = 60  # secondes
+
+# Alertes : délai minimal entre deux notifications d'une même règle pour un harvester, âge maximal d'un
+# échantillon pour notifier (le chargement de l'historique ne notifie pas) et délai d'envoi d'un webhook
+alert_cooldown = 1800  # secondes
+alert_max_age = 600  # secondes
+webhook_timeout = 5  # secondes
+# Règles utilisées sans fichier de configuration (voir create_alert_engine)
+default_alert_rules = [
+    {'type': 'slow_lookups', 'count': 5, 'window': 600},
+    {'type': 'plot_drop', 'plots': 10},
+    {'type': 'latency_quantile', 'threshold': 5, 'clear': 3},
+]
+
+# Fréquence maximale des rapports de progression pendant le chargement
+progress_interval = 0.1  # secondes
+progress_bytes = 8 * 1024 * 1024  # octets
+
+# API du collecteur : adresse d'écoute par défaut (locale), attente maximale d'une requête en long polling,
+# taille maximale d'une page d'échantillons et nombre de preuves récentes renvoyées par défaut
+collector_host = "127.0.0.1"
+collector_port = 8765
+collector_wait_max = 30  # secondes
+collector_page_rows = 100000
+recent_proofs_limit = 50
+
+# Client de l'API : attente demandée au collecteur et délai avant une nouvelle tentative après une erreur
+client_wait = 10  # secondes
+client_retry_delay = 5  # secondes
+
+# Les horodatages sont stockés en millisecondes depuis le 01/01/1970 (heure locale naïve, comme le log)
+naive_epoch = datetime(1970, 1, 1)
+one_millisecond = timedelta(milliseconds=1)
+ms_per_day = 86400000
+
+
+def to_epoch_ms(timestamp):
+    return (timestamp - naive_epoch) // one_millisecond
+
+
+def from_epoch_ms(timestamp_ms):
+    return naive_epoch + timedelta(milliseconds=int(timestamp_ms))
+
+
+def unix_timestamp(timestamp_ms):
+    # Les horodatages du log sont en heure locale naïve : datetime.timestamp() applique le fuseau de l'hôte
+    return from_epoch_ms(timestamp_ms).timestamp()
+
+
+class LogStore:
+    """Stockage en colonnes des échantillons du harvester, dans des tableaux NumPy à croissance amortie.
+
+    Chaque échantillon porte l'identifiant du harvester (indice de sa source) qui l'a produit.
+    """
+
+    columns = {
+        'timestamp': np.int64,
+        'eligible_plots': np.int32,
+        'proofs_found': np.int32,
+        'time_taken': np.float32,
+        'total_plots': np.int32,
+        'harvester': np.int16,
+    }
+    initial_capacity = 4096
+
+    def __init__(self):
+        self._size = 0
+        self._capacity = self.initial_capacity
+        self._arrays = {name: np.empty(self._capacity, dtype=dtype) for name, dtype in self.columns.items()}
+        # Maximum courant des horodatages, trié par construction, pour la recherche dichotomique. Les lignes
+        # de plusieurs harvesters arrivent presque dans l'ordre : _max_lag est le plus grand retard d'un
+        # échantillon sur ce maximum, dont les bornes de recherche sont élargies
+        self._running_max = np.empty(self._capacity, dtype=np.int64)
+        self._max_lag = 0
+        # Incrémenté par sort() : les indices d'une génération précédente ne désignent plus les mêmes lignes
+        self.generation = 0
+        # Identité du stockage, partagée par ses instantanés : un nouveau chargement (reset_log_data) ou un
+        # client resynchronisé repart d'un autre stockage, même à generation égale
+        self.origin = object()
+        # Points relevés dans le log ("Points: N"), et difficulté/points des réponses /farmer au fil du temps
+        self.points = array('q')
+        self.farmer = FarmerSeries()
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def max_lag(self):
+        return self._max_lag
+
+    def _grow(self, required):
+        capacity = self._capacity
+        while capacity < required:
+            capacity *= 2
+        for name, values in self._arrays.items():
+            grown = np.empty(capacity, dtype=values.dtype)
+            grown[:self._size] = values[:self._size]
+            self._arrays[name] = grown
+        running_max = np.empty(capacity, dtype=np.int64)
+        running_max[:self._size] = self._running_max[:self._size]
+        self._running_max = running_max
+        self._capacity = capacity
+
+    def append(self, timestamp_ms, eligible_plots, proofs_found, time_taken, total_plots, harvester=0):
+        index = self._size
+        if index >= self._capacity:
+            self._grow(index + 1)
+        arrays = self._arrays
+        running_max = timestamp_ms
+        if index:
+            previous = self._running_max[index - 1]
+            if timestamp_ms < previous:
+                self._max_lag = max(self._max_lag, int(previous - timestamp_ms))
+                running_max = previous
+        arrays['timestamp'][index] = timestamp_ms
+        arrays['eligible_plots'][index] = eligible_plots
+        arrays['proofs_found'][index] = proofs_found
+        arrays['time_taken'][index] = time_taken
+        arrays['total_plots'][index] = total_plots
+        arrays['harvester'][index] = harvester
+        self._running_max[index] = running_max
+        # La taille n'est publiée qu'une fois la ligne complète écrite
+        self._size = index + 1
+
+    def column(self, name):
+        # Vue en lecture seule sur les données présentes
+        return self._arrays[name][:self._size]
+
+    def slice(self, start, stop):
+        size = self._size
+        return {name: values[:size][start:stop] for name, values in self._arrays.items()}
+
+    def window_bounds(self, start_ms, end_ms=None):
+        # Indices [start, stop) qui contiennent tous les échantillons de [start_ms, end_ms], en O(log n) ;
+        # exactement ceux-là tant que les horodatages sont dans l'ordre
+        running_max = self._running_max[:self._size]
+        start = int(np.searchsorted(running_max, start_ms, side='left'))
+        stop = self._size if end_ms is None else int(np.searchsorted(running_max, end_ms + self._max_lag, side='right'))
+        return start, max(start, stop)
+
+    def window(self, start_ms, end_ms=None):
+        # Échantillons dont l'horodatage est compris dans [start_ms, end_ms], dans l'ordre chronologique
+        start, stop = self.window_bounds(start_ms, end_ms)
+        window = self.slice(start, stop)
+        if not self._max_lag:
+            return window
+
+        # Lignes arrivées dans le désordre : seule la fenêtre est filtrée puis triée
+        timestamps = window['timestamp']
+        mask = timestamps >= start_ms
+        if end_ms is not None:
+            mask &= timestamps <= end_ms
+        rows = np.flatnonzero(mask)
+        rows = rows[np.argsort(timestamps[rows], kind='stable')]
+        return {name: values[rows] for name, values in window.items()}
+
+    def extend(self, chunk):
+        # Ajout en bloc de colonnes déjà analysées (cache, analyse parallèle)
+        count = len(chunk['timestamp'])
+        if not count:
+            return
+        index = self._size
+        if index + count > self._capacity:
+            self._grow(index + count)
+        for name, values in self._arrays.items():
+            values[index:index + count] = chunk[name]
+        timestamps = self._arrays['timestamp'][index:index + count]
+        running_max = np.maximum.accumulate(timestamps)
+        if index:
+            np.maximum(running_max, self._running_max[index - 1], out=running_max)
+        self._max_lag = max(self._max_lag, int((running_max - timestamps).max()))
+        self._running_max[index:index + count] = running_max
+        self._size = index + count
+
+    def sort(self):
+        """Remet les échantillons dans l'ordre chronologique (après le chargement de plusieurs sources).
+
+        Les colonnes triées sont écrites dans de nouveaux tableaux : les instantanés déjà publiés ne
+        changent pas. Les indices changent en revanche : generation est incrémenté pour que les lecteurs
+        qui suivent les indices (résumé détaillé, client du collecteur) repartent du début.
+        """
+        if not self._max_lag:
+            return
+        size = self._size
+        order = np.argsort(self._arrays['timestamp'][:size], kind='stable')
+        for name, values in self._arrays.items():
+            ordered = np.empty(self._capacity, dtype=values.dtype)
+            ordered[:size] = values[:size][order]
+            self._arrays[name] = ordered
+        self._running_max = self._arrays['timestamp'].copy()
+        self._max_lag = 0
+        self.generation += 1
+
+    def snapshot(self):
+        """Copie figée en lecture seule, sans recopier les données.
+
+        Les ajouts suivants écrivent après la taille actuelle ou dans de nouveaux tableaux (_grow, sort) :
+        les vues renvoyées ne changent donc plus, et peuvent être lues depuis un autre thread.
+        """
+        snapshot = LogStore.__new__(LogStore)
+        snapshot._size = snapshot._capacity = self._size
+        snapshot._arrays = {}
+        for name, values in self._arrays.items():
+            view = values[:self._size]
+            view.flags.writeable = False
+            snapshot._arrays[name] = view
+        snapshot._running_max = self._running_max[:self._size]
+        snapshot._running_max.flags.writeable = False
+        snapshot._max_lag = self._max_lag
+        snapshot.generation = self.generation
+        snapshot.origin = self.origin
+        snapshot.points = array('q', self.points[-1:])
+        snapshot.farmer = self.farmer.snapshot()
+        return snapshot
+
+
+class FarmerSeries:
+    """Difficulté et points de la ferme relevés dans les réponses /farmer, en colonnes à croissance amortie.
+
+    Seuls les changements sont enregistrés : une réponse identique à la précédente n'ajoute rien, et un
+    relevé plus ancien que le dernier (fichier relu après le cache) est ignoré, ce qui garde la série dans
+    l'ordre chronologique. Comme LogStore, l'ajout se fait après la taille publiée, et snapshot() renvoie
+    des vues sans copie.
+    """
+
+    columns = {'timestamp': np.int64, 'difficulty': np.int64, 'points': np.int64}
+    initial_capacity = 256
+
+    def __init__(self):
+        self._size = 0
+        self._arrays = {name: np.empty(self.initial_capacity, dtype=dtype) for name, dtype in self.columns.items()}
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self, count):
+        capacity = len(self._arrays['timestamp'])
+        if self._size + count <= capacity:
+            return
+        while capacity < self._size + count:
+            capacity *= 2
+        for name, values in self._arrays.items():
+            grown = np.empty(capacity, dtype=values.dtype)
+            grown[:self._size] = values[:self._size]
+            self._arrays[name] = grown
+
+    def append(self, timestamp_ms, difficulty, points):
+        index = self._size
+        arrays = self._arrays
+        if index and (timestamp_ms < arrays['timestamp'][index - 1]
+                      or (arrays['difficulty'][index - 1] == difficulty and arrays['points'][index - 1] == points)):
+            return False
+        self._reserve(1)
+        arrays = self._arrays
+        arrays['timestamp'][index] = timestamp_ms
+        arrays['difficulty'][index] = difficulty
+        arrays['points'][index] = points
+        self._size = index + 1
+        return True
+
+    def extend(self, chunk):
+        # Ajout en bloc (cache, client du collecteur)
+        count = len(chunk['timestamp'])
+        self._reserve(count)
+        for name, values in self._arrays.items():
+            values[self._size:self._size + count] = chunk[name]
+        self._size += count
+
+    def slice(self, start, stop):
+        return {name: values[:self._size][start:stop] for name, values in self._arrays.items()}
+
+    def window(self, start_ms, end_ms=None):
+        # Relevés de [start_ms, end_ms], précédés du dernier relevé antérieur pour que la courbe en escalier
+        # commence au bord de la période
+        timestamps = self._arrays['timestamp'][:self._size]
+        start = max(int(np.searchsorted(timestamps, start_ms, side='right')) - 1, 0)
+        stop = self._size if end_ms is None else int(np.searchsorted(timestamps, end_ms, side='right'))
+        return self.slice(start, stop)
+
+    def snapshot(self):
+        snapshot = FarmerSeries.__new__(FarmerSeries)
+        snapshot._size = self._size
+        snapshot._arrays = {}
+        for name, values in self._arrays.items():
+            view = values[:self._size]
+            view.flags.writeable = False
+            snapshot._arrays[name] = view
+        return snapshot
+
+
+def later_timestamp(current, timestamp_ms):
+    return timestamp_ms if current is None else max(current, timestamp_ms)
+
+
+class ProofStats:
+    """Agrégats cumulés mis à jour à chaque échantillon, pour afficher les statistiques en O(1)."""
+
+    slow_threshold = 8  # secondes
+    # Bornes supérieures de l'histogramme des temps de recherche, resserrées autour du seuil de 8 secondes
+    latency_buckets = (0.5, 1, 2, 4, 6, 7, 7.5, 8, 8.5, 9, 10, 15, 20, 30)
+
+    def __init__(self):
+        self.count = 0
+        self.count_le_8 = 0
+        self.count_gt_8 = 0
+        self.time_sum = 0.0
+        self.time_min = None
+        self.time_max = None
+        self.total_proofs = 0
+        self.total_plots = 0
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.last_proof_le_8 = None
+        self.last_proof_gt_8 = None
+        self.eligible_plots_total = 0
+        # Nombre d'échantillons par intervalle de l'histogramme (non cumulé), le dernier au-delà de 30 secondes
+        self.time_buckets = [0] * (len(self.latency_buckets) + 1)
+
+    def add(self, timestamp_ms, eligible_plots, proofs_found, time_taken, total_plots):
+        self.count += 1
+        self.time_sum += time_taken
+        self.eligible_plots_total += eligible_plots
+        self.time_buckets[bisect.bisect_left(self.latency_buckets, time_taken)] += 1
+        if self.time_min is None or time_taken < self.time_min:
+            self.time_min = time_taken
+        if self.time_max is None or time_taken > self.time_max:
+            self.time_max = time_taken
+
+        slow = time_taken > self.slow_threshold
+        if slow:
+            self.count_gt_8 += 1
+        else:
+            self.count_le_8 += 1
+
+        # Les échantillons de plusieurs harvesters n'arrivent pas dans l'ordre chronologique : premier et
+        # derniers horodatages sont comparés plutôt que pris dans l'ordre d'arrivée
+        if proofs_found > 0:
+            self.total_proofs += proofs_found
+            if slow:
+                self.last_proof_gt_8 = later_timestamp(self.last_proof_gt_8, timestamp_ms)
+            else:
+                self.last_proof_le_8 = later_timestamp(self.last_proof_le_8, timestamp_ms)
+
+        if self.first_timestamp is None or timestamp_ms < self.first_timestamp:
+            self.first_timestamp = timestamp_ms
+        if self.last_timestamp is None or timestamp_ms >= self.last_timestamp:
+            self.last_timestamp = timestamp_ms
+            self.total_plots = total_plots
+
+    def add_columns(self, chunk):
+        # Version vectorisée de add() pour un bloc de colonnes
+        time_taken = chunk['time_taken']
+        count = len(time_taken)
+        if not count:
+            return
+        timestamps = chunk['timestamp']
+        proofs_found = chunk['proofs_found']
+
+        self.count += count
+        self.time_sum += float(time_taken.sum(dtype=np.float64))
+        self.eligible_plots_total += int(chunk['eligible_plots'].sum(dtype=np.int64))
+        buckets = np.bincount(np.searchsorted(self.latency_buckets, time_taken, side='left'), minlength=len(self.time_buckets))
+        self.time_buckets = [total + int(added) for total, added in zip(self.time_buckets, buckets)]
+        chunk_min, chunk_max = float(time_taken.min()), float(time_taken.max())
+        self.time_min = chunk_min if self.time_min is None else min(self.time_min, chunk_min)
+        self.time_max = chunk_max if self.time_max is None else max(self.time_max, chunk_max)
+
+        slow = time_taken > self.slow_threshold
+        count_gt_8 = int(np.count_nonzero(slow))
+        self.count_gt_8 += count_gt_8
+        self.count_le_8 += count - count_gt_8
+
+        found = proofs_found > 0
+        self.total_proofs += int(proofs_found[found].sum())
+        proofs_le_8 = found & ~slow
+        if proofs_le_8.any():
+            self.last_proof_le_8 = later_timestamp(self.last_proof_le_8, int(timestamps[proofs_le_8].max()))
+        proofs_gt_8 = found & slow
+        if proofs_gt_8.any():
+            self.last_proof_gt_8 = later_timestamp(self.last_proof_gt_8, int(timestamps[proofs_gt_8].max()))
+
+        chunk_first = int(timestamps.min())
+        if self.first_timestamp is None or chunk_first < self.first_timestamp:
+            self.first_timestamp = chunk_first
+        # Dernier échantillon du bloc : le plus récent, le dernier arrivé en cas d'égalité
+        newest = count - 1 - int(np.argmax(timestamps[::-1]))
+        if self.last_timestamp is None or timestamps[newest] >= self.last_timestamp:
+            self.last_timestamp = int(timestamps[newest])
+            self.total_plots = int(chunk['total_plots'][newest])
+
+    @property
+    def time_avg(self):
+        return self.time_sum / self.count if self.count else None
+
+    def snapshot(self):
+        # Copie superficielle, sauf pour l'histogramme qui est modifié sur place
+        snapshot = copy.copy(self)
+        snapshot.time_buckets = list(self.time_buckets)
+        return snapshot
+
+    def as_dict(self):
+        return dict(vars(self), time_avg=self.time_avg)
+
+    @classmethod
+    def from_dict(cls, values):
+        stats = cls()
+        for name, default in vars(stats).items():
+            setattr(stats, name, values.get(name, default))
+        stats.time_buckets = list(stats.time_buckets)
+        return stats
+
+
+class LatencySketch:
+    """Histogramme à intervalles logarithmiques des temps de recherche (de type DDSketch).
+
+    L'intervalle i couvre ]γ^(i-1), γ^i] × sketch_min_value, avec γ = (1 + α) / (1 - α) : un quantile est
+    renvoyé avec une erreur relative d'au plus α (sketch_relative_accuracy), en mémoire fixe. Deux
+    histogrammes se combinent en additionnant leurs compteurs, et un échantillon se retire en décrémentant
+    son intervalle : mise à jour en O(1).
+    """
+
+    gamma = (1 + sketch_relative_accuracy) / (1 - sketch_relative_accuracy)
+    size = math.ceil(math.log(sketch_max_value / sketch_min_value, gamma)) + 1
+
+    def __init__(self):
+        self.counts = np.zeros(self.size, dtype=np.int64)
+        self.count = 0
+
+    @classmethod
+    def index(cls, value):
+        if value <= sketch_min_value:
+            return 0
+        return min(math.ceil(math.log(value / sketch_min_value, cls.gamma)), cls.size - 1)
+
+    @classmethod
+    def value(cls, index):
+        # Valeur représentative de l'intervalle, à une erreur relative α de toutes ses valeurs
+        return 0.0 if index == 0 else sketch_min_value * 2 * cls.gamma ** index / (cls.gamma + 1)
+
+    def add(self, index, weight=1):
+        self.counts[index] += weight
+        self.count += weight
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.count += other.count
+
+    def quantiles(self, quantiles):
+        # Rang au plus proche : la plus petite valeur dont le rang cumulé dépasse q × (n - 1)
+        cumulative = np.cumsum(self.counts)
+        return [self.value(int(np.searchsorted(cumulative, q * (self.count - 1), side='right'))) for q in quantiles]
+
+
+class SlidingLatency:
+    """Temps de recherche d'une fenêtre glissante de duration millisecondes.
+
+    Les échantillons d'un harvester arrivent dans l'ordre chronologique : ils sortent de la fenêtre par le
+    début de la file (O(1) amorti par échantillon) et sont retirés de l'histogramme ; deux files monotones
+    gardent le minimum et le maximum de la fenêtre sans la parcourir.
+    """
+
+    def __init__(self, duration):
+        self.duration = duration
+        self.samples = deque()  # (horodatage, intervalle de l'histogramme)
+        self.minimum = deque()  # (horodatage, temps), temps croissants
+        self.maximum = deque()  # (horodatage, temps), temps décroissants
+        self.sketch = LatencySketch()
+
+    def add(self, timestamp_ms, time_taken, index):
+        self.samples.append((timestamp_ms, index))
+        self.sketch.add(index)
+        while self.minimum and self.minimum[-1][1] >= time_taken:
+            self.minimum.pop()
+        self.minimum.append((timestamp_ms, time_taken))
+        while self.maximum and self.maximum[-1][1] <= time_taken:
+            self.maximum.pop()
+        self.maximum.append((timestamp_ms, time_taken))
+        self.expire(timestamp_ms)
+
+    def expire(self, now_ms):
+        cutoff = now_ms - self.duration
+        while self.samples and self.samples[0][0] <= cutoff:
+            self.sketch.add(self.samples.popleft()[1], -1)
+        while self.minimum and self.minimum[0][0] <= cutoff:
+            self.minimum.popleft()
+        while self.maximum and self.maximum[0][0] <= cutoff:
+            self.maximum.popleft()
+
+
+class HarvesterLatency:
+    """Fenêtres glissantes (latency_windows) des temps de recherche d'un harvester."""
+
+    def __init__(self):
+        self.windows = [SlidingLatency(duration) for duration in latency_windows.values()]
+
+    def add(self, timestamp_ms, time_taken):
+        index = LatencySketch.index(time_taken)
+        for window in self.windows:
+            window.add(timestamp_ms, time_taken, index)
+
+    def add_columns(self, chunk):
+        # Seuls les échantillons encore dans la plus longue fenêtre à l'heure actuelle sont ajoutés, un à un :
+        # au chargement, les blocs plus anciens ne passent pas par la boucle
+        timestamps = chunk['timestamp']
+        if not len(timestamps):
+            return
+        recent = timestamps > to_epoch_ms(datetime.now()) - max(latency_windows.values())
+        for timestamp_ms, time_taken in zip(timestamps[recent].tolist(), chunk['time_taken'][recent].tolist()):
+            self.add(timestamp_ms, time_taken)
+
+
+class CadenceTracker:
+    """Cadence des signage points d'un harvester : intervalle attendu appris et trous dans la suite des lignes.
+
+    Le harvester écrit une ligne par signage point reçu ; un écart de plus de multiple fois l'intervalle
+    appris est un trou (harvester ou liaison farmer → harvester bloqué), dont les signage points manqués
+    sont comptés dans l'heure où il commence. L'intervalle est une moyenne mobile exponentielle des seuls
+    écarts normaux : O(1) par échantillon, et add_columns fait le même calcul en vectoriel au chargement.
+    """
+
+    # Lignes traitées ensemble par add_columns : borne aussi les puissances de (1 - taux) du calcul vectoriel
+    block_size = 1024
+
+    def __init__(self, multiple=cadence_gap_multiple):
+        self.multiple = multiple
+        self.interval = float(signage_point_interval)
+        self.last = None
+        self.missed = 0
+        self.gaps = deque(maxlen=cadence_max_gaps)  # (début, fin, signage points manqués)
+        self.hourly = deque(maxlen=cadence_hours)  # [début de l'heure, signage points manqués]
+
+    def add(self, timestamp_ms):
+        # Une ligne en retard ou en double (horodatage déjà dépassé) ne change rien
+        last = self.last
+        if last is not None and timestamp_ms <= last:
+            return
+        self.last = timestamp_ms
+        if last is None:
+            return
+        interval = timestamp_ms - last
+        if interval > self.multiple * self.interval:
+            self.record(last, timestamp_ms, self.interval)
+        elif interval * self.multiple >= self.interval:
+            self.interval += cadence_learning_rate * (interval - self.interval)
+
+    def add_columns(self, timestamps):
+        # Même résultat que add() ligne par ligne ; une ligne en retard a un écart nul avec le maximum courant
+        if not len(timestamps):
+            return
+        start = [self.last] if self.last is not None else [timestamps[0]]
+        latest = np.maximum.accumulate(np.concatenate((np.asarray(start, dtype=np.int64), timestamps)))
+        intervals = (timestamps - latest[:-1]).astype(np.float64)
+        for block in range(0, len(intervals), self.block_size):
+            rows = slice(block, block + self.block_size)
+            self.add_intervals(intervals[rows], latest[:-1][rows], timestamps[rows])
+        self.last = int(latest[-1])
+
+    def add_intervals(self, intervals, starts, ends):
+        """Trous et moyenne mobile d'un bloc d'écarts, en vectoriel.
+
+        Chaque décision (trou, écart appris) dépend de l'intervalle appris juste avant la ligne : les décisions
+        sont d'abord prises avec l'intervalle du début du bloc, la moyenne après chaque ligne est calculée d'un
+        seul coup, puis les décisions sont reprises avec ces intervalles jusqu'à ce qu'elles ne changent plus.
+        Chaque passe corrige au moins la première décision fausse ; l'intervalle variant peu, une ou deux
+        passes suffisent en pratique.
+        """
+        keep = 1 - cadence_learning_rate
+        previous = np.full(len(intervals), self.interval)
+        choices = None
+        while True:
+            gaps = intervals > self.multiple * previous
+            learned = (intervals > 0) & ~gaps & (intervals * self.multiple >= previous)
+            current = np.where(gaps, 2, learned.astype(np.int8))
+            if choices is not None and np.array_equal(current, choices):
+                break
+            choices = current
+            # Après n écarts appris : keep^n × (intervalle initial + taux × Σ écart appris / keep^(rang de l'écart))
+            learned_count = np.cumsum(learned)
+            weighted = np.where(learned, intervals * keep ** -learned_count.astype(np.float64), 0.0)
+            after = keep ** learned_count * (self.interval + cadence_learning_rate * np.cumsum(weighted))
+            previous = np.concatenate(([self.interval], after[:-1]))
+        for index in np.flatnonzero(gaps).tolist():
+            self.record(int(starts[index]), int(ends[index]), float(previous[index]))
+        self.interval = float(after[-1])
+
+    def record(self, start_ms, end_ms, interval):
+        # interval : intervalle appris juste avant le trou
+        missed = max(round((end_ms - start_ms) / interval) - 1, 1)
+        self.missed += missed
+        self.gaps.append((start_ms, end_ms, missed))
+        hour = start_ms - start_ms % 3600000
+        if self.hourly and self.hourly[-1][0] == hour:
+            self.hourly[-1][1] += missed
+        else:
+            self.hourly.append([hour, missed])
+
+    def snapshot(self):
+        # Forme directement sérialisable en JSON, comme les résumés de summarize_latency
+        return {'interval': self.interval, 'missed': self.missed, 'gaps': [list(gap) for gap in self.gaps],
+                'hourly': [list(hour) for hour in self.hourly]}
+
+
+def missed_signage_points(cadence, start_ms):
+    # Signage points manqués dans les trous commencés depuis start_ms, d'après le comptage par heure
+    return sum(missed for hour, missed in cadence['hourly'] if hour >= start_ms - start_ms % 3600000)
+
+
+def latency_summary(sketch, minimum, maximum):
+    if not sketch.count:
+        return None
+    summary = {'count': sketch.count, 'min': minimum, 'max': maximum}
+    for quantile, value in zip(latency_quantiles, sketch.quantiles(latency_quantiles)):
+        summary[f"p{round(quantile * 100)}"] = value
+    return summary
+
+
+def summarize_latency(latencies, now_ms):
+    """Résumé des fenêtres glissantes à now_ms : {fenêtre: [ferme, harvester 0, harvester 1, ...]}.
+
+    Chaque résumé donne count, min, max et les quantiles (p50, p95, p99), ou None pour une fenêtre vide.
+    La ferme combine les histogrammes et les min/max de ses harvesters, sans parcourir les échantillons.
+    """
+    summary = {}
+    for position, label in enumerate(latency_windows):
+        windows = [latency.windows[position] for latency in latencies]
+        farm = LatencySketch()
+        for window in windows:
+            window.expire(now_ms)
+            farm.merge(window.sketch)
+        minima = [window.minimum[0][1] for window in windows if window.minimum]
+        maxima = [window.maximum[0][1] for window in windows if window.maximum]
+        summary[label] = [latency_summary(farm, min(minima, default=None), max(maxima, default=None))] + [
+            latency_summary(window.sketch, window.minimum[0][1] if window.minimum else None,
+                            window.maximum[0][1] if window.maximum else None) for window in windows]
+    return summary
+
+
+# Données écrites uniquement par le thread d'ingestion (LogIngestor)
+log_data = LogStore()
+proof_stats = ProofStats()
+# Nom, agrégats et fenêtres glissantes de chaque harvester, indexés par l'identifiant stocké dans la colonne 'harvester'
+harvester_names = ["local"]
+harvester_stats = [ProofStats()]
+harvester_latency = [HarvesterLatency()]
+harvester_cadence = [CadenceTracker()]
+giga_horse_info = []
+pool_info = {}
+farmer_info = {}
+# Dernière réponse /pool_info et /farmer vue, pour ne pas redécoder une réponse identique
+last_responses = {}
+
+# État publié vers l'interface et l'API : chaque champ est une copie que le thread d'ingestion ne modifie plus
+LogSnapshot = namedtuple('LogSnapshot', ['store', 'stats', 'pool_info', 'farmer_info', 'giga_horse_info', 'harvesters', 'harvester_stats',
+                                         'harvester_status', 'latency', 'alerts', 'cadence'])
+
+
+def reset_log_data(names, gap_multiple=cadence_gap_multiple):
+    # Remise à zéro avant un nouveau chargement, avec un agrégat par harvester
+    log_data.__init__()
+    proof_stats.__init__()
+    harvester_names[:] = names
+    harvester_stats[:] = [ProofStats() for _ in names]
+    harvester_latency[:] = [HarvesterLatency() for _ in names]
+    harvester_cadence[:] = [CadenceTracker(gap_multiple) for _ in names]
+    giga_horse_info.clear()
+    pool_info.clear()
+    farmer_info.clear()
+    last_responses.clear()
+
+
+def is_stream_source(source):
+    return source.startswith(stream_prefixes)
+
+
+def harvester_name(file_path):
+    # Nom d'affichage d'une source : la machine d'un flux TCP ou d'un chemin UNC (//machine/partage/...), le premier
+    # argument d'une commande (ssh machine ...), sinon le répertoire qui contient .chia (dossier de l'utilisateur
+    # ou point de montage du partage), sinon le répertoire du log
+    if file_path.startswith("tcp://"):
+        return urlsplit(file_path).hostname or file_path
+    if file_path.startswith("cmd:"):
+        arguments = [word for word in shlex.split(file_path[len("cmd:"):])[1:] if not word.startswith("-")]
+        return arguments[0] if arguments else file_path
+    if file_path.startswith("unix://"):
+        return os.path.basename(file_path[len("unix://"):]) or file_path
+    parts = [part for part in re.split(r"[\\/]+", file_path) if part]
+    if file_path.startswith(("\\\\", "//")) and parts:
+        return parts[0]
+    if ".chia" in parts[1:]:
+        return parts[parts.index(".chia", 1) - 1]
+    return parts[-2] if len(parts) > 1 else file_path
+
+
+def parse_sources(specs):
+    """Convertit des sources "chemin" ou "nom=chemin" en (noms, chemins), sans chemin ni nom en double."""
+    names, paths = [], []
+    for spec in specs:
+        name, separator, path = spec.partition("=")
+        if not separator or not name or re.search(r"[\\/:\s]", name):
+            name, path = harvester_name(spec), spec
+        if path in paths:
+            continue
+        unique_name, suffix = name, 2
+        while unique_name in names:
+            unique_name = f"{name} ({suffix})"
+            suffix += 1
+        names.append(unique_name)
+        paths.append(path)
+    return names, paths
+
+
+# Millisecondes au début de chaque jour déjà rencontré
+day_ms_cache = {}
+
+
+def parse_timestamp_ms(line):
+    # Décodage à position fixe de 'AAAA-MM-JJTHH:MM:SS.mmm' en millisecondes depuis 1970, sans strptime
+    day = line[:10]
+    day_ms = day_ms_cache.get(day)
+    if day_ms is None:
+        day_ms = to_epoch_ms(datetime(int(line[0:4]), int(line[5:7]), int(line[8:10])))
+        day_ms_cache[day] = day_ms
+    return day_ms + int(line[11:13]) * 3600000 + int(line[14:16]) * 60000 + int(line[17:19]) * 1000 + int(line[20:23])
+
+
+def parse_log_line(line):
+    # Rejet rapide des lignes qui ne viennent pas du harvester
+    if eligible_marker not in line or harvester_marker not in line:
+        return None
+
+    match = log_pattern.match(line)
+    if match:
+        # Le motif est ancré en début de ligne : l'horodatage est à position fixe
+        timestamp = parse_timestamp_ms(line)
+        eligible_plots = int(match.group(2))
+        proofs_found = int(match.group(3))
+        time_taken = float(match.group(4))
+        total_plots = int(match.group(5))
+        return timestamp, eligible_plots, proofs_found, time_taken, total_plots
+    return None
+
+
+def parse_response(text):
+    """Dictionnaire d'une réponse écrite dans le log, None si elle n'en est pas un.
+
+    Chia écrit la représentation Python du dictionnaire ('clé': valeur) : le JSON est décodé par json, le
+    reste par ast.literal_eval, qui n'accepte que des littéraux (jamais d'appel ni d'expression).
+    """
+    if not (text.startswith('{') and text.endswith('}')):
+        return None
+    try:
+        info = json.loads(text) if text.startswith('{"') else ast.literal_eval(text)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return None
+    return info if isinstance(info, dict) else None
+
+
+def match_response(line, marker, pattern):
+    # Texte de la réponse, None si la ligne n'en contient pas ou répète la dernière réponse du même type
+    if marker not in line:
+        return None
+    match = pattern.search(line)
+    if not match:
+        return None
+    text = match.group(1)
+    if last_responses.get(marker) == text:
+        return ""
+    last_responses[marker] = text
+    return text
+
+
+def parse_pool_info(line):
+    text = match_response(line, pool_info_marker, pool_info_pattern)
+    if text is None:
+        return False
+    info = parse_response(text) if text else None
+    if info is not None:
+        pool_info['name'] = info.get('name')
+        # La description se termine par le lien Discord entre parenthèses, quand le pool en donne une
+        description = info.get('description')
+        pool_info['discord'] = description.split(' ')[-1].strip('()') if isinstance(description, str) and description else None
+        pool_info['fee'] = info.get('fee')
+    return True
+
+
+def parse_farmer_info(line):
+    text = match_response(line, farmer_info_marker, farmer_info_pattern)
+    if text is None:
+        return False
+    info = parse_response(text) if text else None
+    if info is not None:
+        difficulty, points = info.get('current_difficulty'), info.get('current_points')
+        farmer_info['current_difficulty'] = difficulty
+        farmer_info['current_points'] = points
+        if isinstance(difficulty, int) and isinstance(points, int):
+            try:
+                log_data.farmer.append(parse_timestamp_ms(line), difficulty, points)
+            except ValueError:
+                # Ligne sans horodatage (flux tronqué) : seules les dernières valeurs sont gardées
+                pass
+    return True
+
+
+def parse_giga_horse_info(log_lines):
+    for line in log_lines:
+        if "Found proof" in line:
+            match = giga_horse_fee_pattern.search(line)
+            if match:
+                info = match.groupdict()
+                return float(info.get('fee_rate'))
+    return False
+
+
+def parse_giga_horse_line(line):
+    # Conserve la dernière ligne GigaHorse contenant le taux de frais
+    if giga_horse_marker in line and giga_horse_fee_pattern.search(line):
+        giga_horse_info[:] = [line]
+        return True
+    return False
+
+
+def parse_points(line):
+    if points_marker not in line:
+        return False
+    match = points_pattern.search(line)
+    if match:
+        points = int(match.group(1))
+        log_data.points.append(points)
+        return True
+    return False
+
+
+def ingest_line(line, harvester=0):
+    # Analyse d'une ligne et stockage des données extraites, pour la ferme et pour le harvester
+    parsed_line = parse_log_line(line)
+    if parsed_line:
+        timestamp_ms, eligible_plots, proofs_found, time_taken, total_plots = parsed_line
+        log_data.append(timestamp_ms, eligible_plots, proofs_found, time_taken, total_plots, harvester)
+        proof_stats.add(timestamp_ms, eligible_plots, proofs_found, time_taken, total_plots)
+        harvester_stats[harvester].add(timestamp_ms, eligible_plots, proofs_found, time_taken, total_plots)
+        harvester_latency[harvester].add(timestamp_ms, time_taken)
+        harvester_cadence[harvester].add(timestamp_ms)
+        return True
+
+    # Parsing other info
+    if not parse_pool_info(line) and not parse_farmer_info(line) and not parse_points(line):
+        parse_giga_horse_line(line)
+    return False
+
+
+def split_ranges(file_path, start, stop, range_size=parallel_range_size):
+    # Découpe [start, stop) en intervalles d'environ range_size octets qui commencent tous en début de ligne
+    if start >= stop:
+        return []
+    bounds = [start]
+    with open(file_path, 'rb') as file:
+        position = start + range_size
+        while position < stop:
+            file.seek(position)
+            file.readline()
+            position = file.tell()
+            if position >= stop:
+                break
+            bounds.append(position)
+            position += range_size
+    bounds.append(stop)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+# Résultat d'un intervalle analysé hors du thread d'ingestion
+ParsedRange = namedtuple('ParsedRange', ['columns', 'info_lines', 'consumed'])
+
+
+def parse_range(file_path, start, stop, final_partial, harvester=0):
+    """Analyse les lignes de [start, stop) et renvoie un ParsedRange, sans modifier les données globales.
+
+    Appelé dans un processus de travail ou un thread du pool d'ingestion : les échantillons sont rangés
+    dans un LogStore local, et les autres lignes à marqueur (pool, farmer, points, GigaHorse), peu
+    nombreuses, sont renvoyées telles quelles pour être analysées lors de la fusion.
+    """
+    store = LogStore()
+    info_lines = []
+    consumed = 0
+    with open_shared(file_path) as file, mmap.mmap(file.fileno(), stop, access=mmap.ACCESS_READ) as mapped:
+        for lines, consumed in scan_mapped_lines(mapped, start, stop, final_partial=final_partial):
+            for line in lines:
+                parsed_line = parse_log_line(line)
+                if parsed_line:
+                    store.append(*parsed_line, harvester)
+                else:
+                    info_lines.append(line)
+
+    columns = {name: store.column(name).copy() for name in LogStore.columns}
+    return ParsedRange(columns, info_lines, consumed)
+
+
+def add_sample_columns(chunk):
+    # Agrégats de la ferme et de chaque harvester pour un bloc de colonnes
+    proof_stats.add_columns(chunk)
+    harvesters = chunk['harvester']
+    for harvester, stats in enumerate(harvester_stats):
+        rows = harvesters == harvester
+        if rows.all():
+            stats.add_columns(chunk)
+            harvester_latency[harvester].add_columns(chunk)
+            harvester_cadence[harvester].add_columns(chunk['timestamp'])
+        elif rows.any():
+            rows_chunk = {name: values[rows] for name, values in chunk.items()}
+            stats.add_columns(rows_chunk)
+            harvester_latency[harvester].add_columns(rows_chunk)
+            harvester_cadence[harvester].add_columns(rows_chunk['timestamp'])
+
+
+def merge_parsed_range(parsed):
+    # Les intervalles sont fusionnés dans l'ordre du fichier : les dernières informations vues l'emportent
+    log_data.extend(parsed.columns)
+    add_sample_columns(parsed.columns)
+    for line in parsed.info_lines:
+        ingest_line(line)
+
+
+def rotated_log_paths(file_path, depth):
+    # Fichiers tournés existants, du plus ancien (debug.log.N) au plus récent (debug.log.1)
+    return [path for path in (f"{file_path}.{index}" for index in range(depth, 0, -1)) if os.path.exists(path)]
+
+
+def read_complete_lines(file_path, offset, final_partial=False):
+    """Lit les lignes ajoutées depuis offset et renvoie (lignes, nouvelle position)."""
+    with open(file_path, 'rb') as file:
+        file.seek(offset)
+        data = file.read()
+    end = len(data) if final_partial else data.rfind(b"\n") + 1
+    lines = data[:end].decode("utf-8", errors="replace").splitlines()
+    return lines, offset + end
+
+
+def open_shared(file_path):
+    """Ouvre le log en lecture binaire sans empêcher Chia de le renommer lors d'une rotation.
+
+    Sous Windows, open() refuse le renommage d'un fichier ouvert : le fichier est donc ouvert avec
+    CreateFileW et FILE_SHARE_DELETE.
+    """
+    if system != "Windows":
+        return open(file_path, 'rb', buffering=0)
+
+    import msvcrt
+    generic_read = 0x80000000
+    share_all = 0x00000001 | 0x00000002 | 0x00000004  # FILE_SHARE_READ | WRITE | DELETE
+    open_existing = 3
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.CreateFileW.argtypes = [ctypes.c_wchar_p, ctypes.c_uint32, ctypes.c_uint32, ctypes.c_void_p, ctypes.c_uint32, ctypes.c_uint32, ctypes.c_void_p]
+    kernel32.CreateFileW.restype = ctypes.c_void_p
+    handle = kernel32.CreateFileW(file_path, generic_read, share_all, None, open_existing, 0x80, None)
+    if handle is None or handle == ctypes.c_void_p(-1).value:
+        raise ctypes.WinError(ctypes.get_last_error())
+    return open(msvcrt.open_osfhandle(handle, os.O_RDONLY | os.O_BINARY), 'rb', buffering=0)
+
+
+def scan_mapped_lines(mapped, start, stop, final_partial=True, window_size=scan_window_size):
+    """Découpe en lignes le fichier mappé en mémoire entre start et stop.
+
+    Les marqueurs sont cherchés directement dans les octets : seules les lignes qui en contiennent un
+    sont décodées, les autres ne sont jamais converties en str. Renvoie (lignes, octets consommés)
+    pour chaque fenêtre d'environ window_size octets, toujours terminée par une fin de ligne.
+    """
+    if not final_partial:
+        # Une dernière ligne en cours d'écriture sera lue par le LogTailer
+        stop = mapped.rfind(b"\n", start, stop) + 1 or start
+
+    position = start
+    while position < stop:
+        end = stop
+        if position + window_size < stop:
+            newline = mapped.find(b"\n", position + window_size, stop)
+            if newline >= 0:
+                end = newline + 1
+
+        # Début de chaque ligne contenant un marqueur, une seule fois par ligne et dans l'ordre du fichier
+        line_starts = set()
+        for pattern in marker_patterns:
+            for match in pattern.finditer(mapped, position, end):
+                line_starts.add(mapped.rfind(b"\n", position, match.start()) + 1 or position)
+
+        lines = []
+        for line_start in sorted(line_starts):
+            line_end = mapped.find(b"\n", line_start, end)
+            lines.append(mapped[line_start:line_end if line_end >= 0 else end].decode("utf-8", errors="replace"))
+
+        position = end
+        yield lines, end - start
+
+
+class IncrementalReader:
+    """Lecture incrémentale d'un fichier gardé ouvert.
+
+    Les octets ajoutés sont lus dans un tampon réutilisé. La dernière ligne incomplète est conservée
+    pour la lecture suivante, et offset n'avance que des octets des lignes complètes renvoyées.
+    """
+
+    def __init__(self, file_path, offset=0, buffer_size=read_chunk_size):
+        self.file = open_shared(file_path)
+        self.inode = os.fstat(self.file.fileno()).st_ino
+        self.buffer = bytearray(buffer_size)
+        self.view = memoryview(self.buffer)
+        self.seek(offset)
+
+    def seek(self, offset):
+        self.file.seek(offset)
+        self.offset = offset
+        self.partial = b""
+
+    @property
+    def position(self):
+        # Position de lecture dans le fichier, ligne incomplète comprise
+        return self.offset + len(self.partial)
+
+    def read_lines(self, final_partial=False):
+        blocks = [self.partial]
+        while True:
+            count = self.file.readinto(self.buffer)
+            if not count:
+                break
+            blocks.append(self.view[:count].tobytes())
+
+        data = b"".join(blocks)
+        end = len(data) if final_partial else data.rfind(b"\n") + 1
+        self.partial = data[end:]
+        self.offset += end
+        return data[:end].decode("utf-8", errors="replace").splitlines()
+
+    def close(self):
+        self.view.release()
+        self.file.close()
+
+
+class LogTailer:
+    """Suivi d'un fichier de log à travers les rotations et les troncatures.
+
+    Le fichier est identifié par son inode et la position lue, et reste ouvert entre deux lectures
+    (IncrementalReader). Lors d'une rotation (debug.log renommé en debug.log.1 et remplacé), la fin de
+    l'ancien fichier est lue par le descripteur encore ouvert avant de passer au nouveau ; lors d'une
+    troncature, la lecture reprend au début. Aucun octet déjà lu n'est relu.
+    """
+
+    def __init__(self, file_path, offset=0, inode=None, max_rotations=log_history_depth):
+        self.file_path = file_path
+        self.offset = offset
+        self.inode = inode
+        self.max_rotations = max(max_rotations, 1)
+        self.reader = None
+
+    def find_rotated(self):
+        # Cherche l'ancien fichier (même inode) parmi debug.log.1 ... debug.log.N
+        for path in (f"{self.file_path}.{index}" for index in range(1, self.max_rotations + 1)):
+            try:
+                if os.stat(path).st_ino == self.inode:
+                    return path
+            except OSError:
+                continue
+        return None
+
+    def read_new_lines(self):
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            # Rotation en cours : le nouveau fichier n'existe pas encore
+            return []
+
+        lines = []
+        # Certains partages réseau renvoient un inode nul : seule la taille permet alors de détecter un changement
+        if self.reader is None:
+            if self.inode and stat.st_ino and stat.st_ino != self.inode:
+                # Rotation survenue avant l'ouverture : l'ancien fichier est retrouvé par son inode
+                rotated_path = self.find_rotated()
+                if rotated_path:
+                    rotated_lines, _ = read_complete_lines(rotated_path, self.offset, final_partial=True)
+                    lines.extend(rotated_lines)
+                self.offset = 0
+            elif stat.st_size < self.offset:
+                self.offset = 0
+            self.reader = IncrementalReader(self.file_path, self.offset)
+        elif stat.st_ino and stat.st_ino != self.reader.inode:
+            # Rotation : le descripteur ouvert donne encore accès à la fin de l'ancien fichier
+            lines.extend(self.reader.read_lines(final_partial=True))
+            self.reader.close()
+            self.reader = IncrementalReader(self.file_path)
+        elif stat.st_size < self.reader.position:
+            # Troncature, ou rotation sur un partage à inode nul : le descripteur ouvert peut désigner l'ancien
+            # fichier renommé. Sa fin éventuelle est lue, puis le fichier est rouvert par son chemin
+            lines.extend(self.reader.read_lines(final_partial=True))
+            self.reader.close()
+            self.reader = IncrementalReader(self.file_path)
+
+        lines.extend(self.reader.read_lines())
+        self.inode = self.reader.inode
+        self.offset = self.reader.offset
+        return lines
+
+    def close(self):
+        if self.reader:
+            self.reader.close()
+            self.reader = None
+
+
+class InotifyWatcher:
+    """Détection des modifications par inotify (Linux), via ctypes, lue par la boucle asyncio (add_reader).
+
+    Un seul descripteur inotify surveille les répertoires de tous les logs, pour voir aussi les rotations.
+    Les fichiers dont le répertoire n'a pas pu être surveillé restent en scrutation adaptative, et comme
+    inotify ne voit pas les écritures faites par une autre machine sur un partage réseau, chaque source
+    refait de toute façon un os.stat après watch_max_interval sans événement.
+    """
+
+    in_modify = 0x00000002
+    in_close_write = 0x00000008
+    in_moved_from = 0x00000040
+    in_moved_to = 0x00000080
+    in_create = 0x00000100
+    in_delete = 0x00000200
+    in_nonblock = 0o4000
+    in_cloexec = 0o2000000
+    event_header = struct.Struct('iIII')
+
+    def __init__(self, file_paths):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(self.in_nonblock | self.in_cloexec)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        mask = self.in_modify | self.in_close_write | self.in_moved_from | self.in_moved_to | self.in_create | self.in_delete
+        # Fichier surveillé pour chaque couple (répertoire surveillé, nom)
+        self.watched = {}
+        watches = {}
+        for path in file_paths:
+            directory = os.path.dirname(os.path.abspath(path)).encode()
+            if directory not in watches:
+                watches[directory] = libc.inotify_add_watch(self.fd, directory, mask)
+            if watches[directory] >= 0:
+                self.watched[(watches[directory], os.path.basename(path).encode())] = path
+
+    def read_changes(self):
+        # Ensemble des fichiers surveillés modifiés depuis la lecture précédente (sans attendre)
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            watch, _, _, length = self.event_header.unpack_from(data, offset)
+            offset += self.event_header.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            path = self.watched.get((watch, name))
+            if path is not None:
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def create_watcher(file_paths):
+    # inotify sous Linux ; None ailleurs ou si inotify n'est pas disponible (scrutation adaptative seule)
+    if system == "Linux":
+        try:
+            return InotifyWatcher(file_paths)
+        except (OSError, AttributeError):
+            pass
+    return None
+
+
+def user_cache_dir():
+    # Répertoire de cache de l'utilisateur selon le système
+    if system == "Windows":
+        base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+    elif system == "Darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return os.path.join(base, "ChiaLogMonitor")
+
+
+def user_data_dir():
+    # Répertoire des données persistantes de l'utilisateur selon le système
+    if system == "Windows":
+        base = os.environ.get("APPDATA", os.path.expanduser("~"))
+    elif system == "Darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_DATA_HOME", os.path.expanduser("~/.local/share"))
+    return os.path.join(base, "ChiaLogMonitor")
+
+
+def default_history_path():
+    return os.path.join(user_data_dir(), "history.sqlite3")
+
+
+class LogCache:
+    """Cache disque des données analysées d'un ensemble de sources.
+
+    Les colonnes du LogStore sont enregistrées en .npy (relues entièrement en mémoire : un fichier encore
+    mappé ne pourrait pas être remplacé par save sous Windows), les informations
+    pool/farmer et la position atteinte dans chaque fichier dans meta.json, avec une empreinte de chaque
+    fichier (inode, hash des 4 premiers Ko). Chaque source est validée séparément au démarrage : un fichier
+    qui a tourné depuis est retrouvé parmi debug.log.1 ... debug.log.N, et les échantillons d'un fichier
+    introuvable, tronqué ou qui n'avait pas fini son chargement sont écartés et relus depuis le fichier ;
+    ceux d'un flux sont toujours conservés.
+    """
+
+    version = 4
+    head_size = 4096
+
+    def __init__(self, file_paths, cache_root=None):
+        self.file_paths = [path if is_stream_source(path) else os.path.abspath(path) for path in file_paths]
+        key = hashlib.sha1("\n".join(self.file_paths).encode("utf-8")).hexdigest()
+        self.directory = os.path.join(cache_root or user_cache_dir(), key)
+        self.meta_path = os.path.join(self.directory, "meta.json")
+
+    def fingerprint(self, file_path, head_size=head_size):
+        with open(file_path, 'rb') as file:
+            head = file.read(head_size)
+        return {
+            'inode': os.stat(file_path).st_ino,
+            'head': hashlib.sha1(head).hexdigest(),
+            'head_size': len(head),
+        }
+
+    def matches(self, fingerprint, file_path):
+        # Un fichier de moins de 4 Ko lors de l'enregistrement a pu grandir : seuls les octets hachés alors sont comparés
+        return self.fingerprint(file_path, fingerprint['head_size']) == fingerprint
+
+    def column_path(self, name):
+        return os.path.join(self.directory, f"{name}.npy")
+
+    def read(self):
+        """Renvoie (colonnes relues en mémoire, métadonnées), ou None sans cache utilisable."""
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as file:
+                meta = json.load(file)
+            if meta.get('version') != self.version or len(meta['offsets']) != len(self.file_paths):
+                return None
+            count = meta['count']
+            return {name: np.load(self.column_path(name))[:count] for name in LogStore.columns}, meta
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def resume_plan(self, meta, harvester):
+        """Fichiers à lire pour reprendre la source là où le cache s'est arrêté, None si son cache est invalide.
+
+        Renvoie [[chemin, position, final_partial], ...] comme FileSource.pending. Si debug.log a tourné
+        depuis l'enregistrement, le fichier lu alors est cherché parmi debug.log.1 ... debug.log.N : sa fin
+        puis les fichiers plus récents sont lus, sans relire tout l'historique.
+
+        Appel bloquant (empreinte des fichiers) : une erreur d'accès à debug.log est propagée pour que la
+        source réessaie plus tard plutôt que de tout relire.
+        """
+        path = self.file_paths[harvester]
+        offset = meta['offsets'][harvester]
+        fingerprint = meta['fingerprints'][harvester]
+        if offset is None or not fingerprint:
+            return None
+        if self.matches(fingerprint, path):
+            return [[path, offset, False]] if offset <= os.path.getsize(path) else None
+
+        # Du plus récent (debug.log.1) au plus ancien
+        rotated = rotated_log_paths(path, log_history_depth)[::-1]
+        for index, rotated_path in enumerate(rotated):
+            try:
+                if not self.matches(fingerprint, rotated_path):
+                    continue
+                if offset > os.path.getsize(rotated_path):
+                    return None
+            except OSError:
+                continue
+            newer = [[newer_path, 0, True] for newer_path in rotated[:index][::-1]]
+            return [[rotated_path, offset, True]] + newer + [[path, 0, False]]
+        return None
+
+    def save(self, snapshot, offsets):
+        """Enregistre un LogSnapshot ; offsets donne la position atteinte dans chaque fichier (None : à relire).
+
+        L'instantané est figé : l'enregistrement peut se faire dans un autre thread que l'ingestion.
+        """
+        store = snapshot.store
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Les métadonnées sont retirées pendant l'écriture pour ne jamais décrire des colonnes incomplètes
+            if os.path.exists(self.meta_path):
+                os.remove(self.meta_path)
+
+            for name in LogStore.columns:
+                temporary_path = self.column_path(name) + ".tmp"
+                with open(temporary_path, 'wb') as file:
+                    np.save(file, store.column(name))
+                os.replace(temporary_path, self.column_path(name))
+
+            fingerprints = []
+            for path, offset in zip(self.file_paths, offsets):
+                try:
+                    fingerprints.append(self.fingerprint(path) if offset is not None else None)
+                except OSError:
+                    # Source injoignable : elle sera relue entièrement au prochain démarrage
+                    fingerprints.append(None)
+            meta = {
+                'version': self.version,
+                'fingerprints': fingerprints,
+                'offsets': [offset if fingerprint else None for offset, fingerprint in zip(offsets, fingerprints)],
+                'count': len(store),
+                # Seul le dernier relevé de points est utile à l'affichage
+                'points': store.points[-1:].tolist(),
+                'farmer_series': columns_to_json(store.farmer.slice(0, len(store.farmer))),
+                'pool_info': snapshot.pool_info,
+                'farmer_info': snapshot.farmer_info,
+                'giga_horse_info': snapshot.giga_horse_info,
+            }
+            temporary_path = self.meta_path + ".tmp"
+            with open(temporary_path, 'w', encoding='utf-8') as file:
+                json.dump(meta, file)
+            os.replace(temporary_path, self.meta_path)
+        except OSError:
+            # Le cache n'est qu'une optimisation : une erreur d'écriture n'empêche pas la surveillance
+            pass
+
+
+class SampleDatabase:
+    """Historique persistant des échantillons (SQLite en mode WAL), au-delà de ce que garde debug.log.
+
+    Chaque échantillon est enregistré une seule fois (clé horodatage + harvester, par nom : l'historique
+    survit aux changements de la liste des sources), par lots dans une seule transaction. Les agrégats par
+    minute et par heure (nombre, min/max/somme des temps, recherches > 8 s, preuves, parcelles éligibles)
+    sont recalculés pour les seules périodes touchées par le lot. La conservation (history_retention)
+    supprime les échantillons sans preuve puis les agrégats trop anciens.
+
+    write et apply_retention sont appelés par un seul thread d'écriture ; read_history ouvre sa propre
+    connexion en lecture seule et peut être appelé depuis n'importe quel thread.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS harvesters (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL);
+        CREATE TABLE IF NOT EXISTS samples (
+            timestamp INTEGER NOT NULL, harvester INTEGER NOT NULL, eligible_plots INTEGER, proofs_found INTEGER,
+            time_taken REAL, total_plots INTEGER, PRIMARY KEY (timestamp, harvester)) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS samples_proofs ON samples (timestamp) WHERE proofs_found > 0;
+    """ + "".join(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            timestamp INTEGER NOT NULL, harvester INTEGER NOT NULL, count INTEGER, time_min REAL, time_max REAL,
+            time_sum REAL, slow INTEGER, proofs INTEGER, eligible_plots INTEGER, total_plots INTEGER,
+            PRIMARY KEY (timestamp, harvester)) WITHOUT ROWID;
+    """ for table in ('rollup_1m', 'rollup_1h'))
+
+    # Agrégat d'une période recalculé depuis le niveau inférieur (échantillons ou agrégats par minute)
+    rollup_queries = {
+        'rollup_1m': """
+            INSERT OR REPLACE INTO rollup_1m
+            SELECT ?, harvester, COUNT(*), MIN(time_taken), MAX(time_taken), SUM(time_taken), SUM(time_taken > 8),
+                   SUM(proofs_found), SUM(eligible_plots), MAX(total_plots)
+            FROM samples WHERE timestamp >= ?1 AND timestamp < ?1 + 60000 AND harvester = ?2 GROUP BY harvester""",
+        'rollup_1h': """
+            INSERT OR REPLACE INTO rollup_1h
+            SELECT ?, harvester, SUM(count), MIN(time_min), MAX(time_max), SUM(time_sum), SUM(slow),
+                   SUM(proofs), SUM(eligible_plots), MAX(total_plots)
+            FROM rollup_1m WHERE timestamp >= ?1 AND timestamp < ?1 + 3600000 AND harvester = ?2 GROUP BY harvester""",
+    }
+    rollup_columns = {
+        'timestamp': np.int64, 'count': np.int64, 'time_min': np.float64, 'time_max': np.float64, 'time_sum': np.float64,
+        'slow': np.int64, 'proofs': np.int64, 'eligible_plots': np.int64, 'total_plots': np.int64,
+    }
+
+    def __init__(self, path, retention=history_retention):
+        self.path = path
+        self.retention = dict(retention)
+        self.connection = None
+        self.harvester_ids = {}
+        self.last_retention = 0
+
+    def open(self):
+        """Ouvre la base (créée au besoin) ; renvoie True si elle vient d'être créée."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        created = not os.path.exists(self.path)
+        connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        # WAL : les lectures (graphiques, API) ne bloquent pas l'écriture ; NORMAL suffit en WAL
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(self.schema)
+        self.connection = connection
+        self.harvester_ids = {name: harvester_id for harvester_id, name in connection.execute("SELECT id, name FROM harvesters")}
+        return created
+
+    def harvester_id(self, name):
+        if name not in self.harvester_ids:
+            self.connection.execute("INSERT OR IGNORE INTO harvesters (name) VALUES (?)", (name,))
+            self.harvester_ids[name] = self.connection.execute("SELECT id FROM harvesters WHERE name = ?", (name,)).fetchone()[0]
+        return self.harvester_ids[name]
+
+    def write(self, chunks, names):
+        """Enregistre des blocs de colonnes d'échantillons (colonne 'harvester' : indice dans names)."""
+        try:
+            if self.connection is None:
+                self.open()
+            with self.connection:
+                ids = np.array([self.harvester_id(name) for name in names], dtype=np.int64)
+                minutes = set()
+                for columns in chunks:
+                    if not len(columns['timestamp']):
+                        continue
+                    harvesters = ids[columns['harvester']]
+                    # Un échantillon déjà enregistré (log relu sans cache) est ignoré
+                    self.connection.executemany(
+                        "INSERT OR IGNORE INTO samples VALUES (?, ?, ?, ?, ?, ?)",
+                        zip(columns['timestamp'].tolist(), harvesters.tolist(), columns['eligible_plots'].tolist(),
+                            columns['proofs_found'].tolist(), columns['time_taken'].astype(np.float64).round(5).tolist(),
+                            columns['total_plots'].tolist()))
+                    minutes.update(zip((columns['timestamp'] // 60000 * 60000).tolist(), harvesters.tolist()))
+                hours = {(minute // 3600000 * 3600000, harvester) for minute, harvester in minutes}
+                self.connection.executemany(self.rollup_queries['rollup_1m'], sorted(minutes))
+                self.connection.executemany(self.rollup_queries['rollup_1h'], sorted(hours))
+            if time.monotonic() - self.last_retention >= history_retention_interval:
+                self.apply_retention()
+        except (sqlite3.Error, OSError):
+            # L'historique n'est qu'un complément : une erreur d'écriture n'empêche pas la surveillance
+            pass
+
+    def apply_retention(self, now_ms=None):
+        self.last_retention = time.monotonic()
+        now_ms = now_ms if now_ms is not None else to_epoch_ms(datetime.now())
+        with self.connection:
+            for table, days in self.retention.items():
+                if days is None:
+                    continue
+                # Les preuves trouvées, rares, restent visibles sur toute la durée de l'historique
+                condition = " AND proofs_found = 0" if table == 'samples' else ""
+                self.connection.execute(f"DELETE FROM {table} WHERE timestamp < ?{condition}", (now_ms - days * ms_per_day,))
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def read_history(self, start_ms, end_ms, harvester=None):
+        """Agrégats et preuves trouvées de [start_ms, end_ms) pour le harvester nommé, ou pour toute la ferme.
+
+        Renvoie {'resolution': durée d'un agrégat en ms, 'rollups': colonnes, 'proofs': colonnes} ; le coût ne
+        dépend que du nombre d'agrégats de la période (2 160 pour 90 jours par heure), pas du nombre d'échantillons.
+        """
+        history = empty_history(start_ms, end_ms)
+        table = 'rollup_1m' if history['resolution'] == 60000 else 'rollup_1h'
+        if not os.path.exists(self.path):
+            return history
+
+        # Agrégats de plusieurs harvesters sur la même période regroupés pour la ferme
+        filter_sql = " AND harvester = (SELECT id FROM harvesters WHERE name = ?)" if harvester is not None else ""
+        parameters = (start_ms, end_ms) + ((harvester,) if harvester is not None else ())
+        connection = sqlite3.connect(Path(os.path.abspath(self.path)).as_uri() + "?mode=ro", uri=True, timeout=30)
+        try:
+            rows = connection.execute(
+                f"""SELECT timestamp, SUM(count), MIN(time_min), MAX(time_max), SUM(time_sum), SUM(slow), SUM(proofs),
+                          SUM(eligible_plots), SUM(total_plots)
+                   FROM {table} WHERE timestamp >= ? AND timestamp < ?{filter_sql} GROUP BY timestamp ORDER BY timestamp""",
+                parameters).fetchall()
+            proof_rows = connection.execute(
+                f"""SELECT timestamp, eligible_plots, proofs_found, time_taken, total_plots, harvester
+                   FROM samples WHERE timestamp >= ? AND timestamp < ? AND proofs_found > 0{filter_sql} ORDER BY timestamp""",
+                parameters).fetchall()
+        finally:
+            connection.close()
+
+        if rows:
+            history['rollups'] = {name: np.array(values, dtype=dtype) for (name, dtype), values in zip(self.rollup_columns.items(), zip(*rows))}
+        if proof_rows:
+            # La colonne harvester contient l'identifiant du harvester dans la base
+            history['proofs'] = {name: np.array(values, dtype=dtype) for (name, dtype), values in zip(LogStore.columns.items(), zip(*proof_rows))}
+        return history
+
+
+def empty_history(start_ms, end_ms):
+    # Agrégats par minute jusqu'à history_minute_span, par heure au-delà
+    return {
+        'resolution': 60000 if end_ms - start_ms <= history_minute_span else 3600000,
+        'rollups': {name: np.empty(0, dtype=dtype) for name, dtype in SampleDatabase.rollup_columns.items()},
+        'proofs': {name: np.empty(0, dtype=dtype) for name, dtype in LogStore.columns.items()},
+    }
+
+
+def history_to_json(history):
+    return {'resolution': history['resolution'], 'rollups': columns_to_json(history['rollups']),
+            'proofs': columns_to_json(history['proofs'])}
+
+
+def history_from_json(body):
+    return {'resolution': body['resolution'],
+            'rollups': {name: np.asarray(body['rollups'][name], dtype=dtype) for name, dtype in SampleDatabase.rollup_columns.items()},
+            'proofs': columns_from_json(body['proofs'])}
+
+
+class AlertRule:
+    """Règle d'alerte évaluée à chaque échantillon d'un harvester, en temps constant.
+
+    measure() renvoie la valeur suivie (None : pas encore mesurable). L'alerte se déclenche quand la
+    valeur dépasse threshold et ne retombe que lorsqu'elle revient à clear ou en dessous (hystérésis) ;
+    AlertEngine limite les notifications à une par cooldown.
+    """
+
+    # Durée d'historique nécessaire à la règle, rejouée lors d'un chargement en bloc
+    span = 0
+
+    def __init__(self, threshold, clear=None, cooldown=alert_cooldown):
+        self.threshold = threshold
+        self.clear = threshold if clear is None else clear
+        self.cooldown = cooldown * 1000
+
+    def new_state(self):
+        return None
+
+    def measure(self, state, active, harvester, timestamp_ms, time_taken, total_plots):
+        raise NotImplementedError
+
+    def describe(self, value):
+        raise NotImplementedError
+
+
+class SlowLookupsRule(AlertRule):
+    """Plus de count recherches au-delà de seconds secondes sur les window dernières secondes."""
+
+    def __init__(self, count=5, window=600, seconds=ProofStats.slow_threshold, clear=None, cooldown=alert_cooldown):
+        super().__init__(count, count // 2 if clear is None else clear, cooldown)
+        self.window = window * 1000
+        self.seconds = seconds
+        self.span = self.window
+
+    def new_state(self):
+        # Horodatages des recherches lentes encore dans la fenêtre
+        return deque()
+
+    def measure(self, state, active, harvester, timestamp_ms, time_taken, total_plots):
+        if time_taken > self.seconds:
+            state.append(timestamp_ms)
+        while state and state[0] <= timestamp_ms - self.window:
+            state.popleft()
+        return len(state)
+
+    def describe(self, value):
+        return f"{value} recherches de plus de {self.seconds:g} s en {self.window // 60000} min (seuil {self.threshold})"
+
+
+class PlotDropRule(AlertRule):
+    """Baisse de plus de plots parcelles par rapport à l'échantillon précédent (un disque a disparu).
+
+    Une fois déclenchée, la baisse est mesurée par rapport au total d'avant la chute : l'alerte retombe
+    quand les parcelles sont revenues (à clear près).
+    """
+
+    def __init__(self, plots=10, clear=0, cooldown=alert_cooldown):
+        super().__init__(plots, clear, cooldown)
+
+    def new_state(self):
+        return {'previous': None, 'reference': None}
+
+    def measure(self, state, active, harvester, timestamp_ms, time_taken, total_plots):
+        if not active:
+            state['reference'] = state['previous']
+        state['previous'] = total_plots
+        if state['reference'] is None:
+            return None
+        return state['reference'] - total_plots
+
+    def describe(self, value):
+        return f"{value} parcelles en moins (seuil {self.threshold})"
+
+
+class LatencyQuantileRule(AlertRule):
+    """Quantile des temps de recherche au-dessus de threshold secondes sur une fenêtre glissante.
+
+    La règle tient sa propre fenêtre (SlidingLatency, histogramme de taille fixe), avancée échantillon par
+    échantillon : le quantile est celui de la fenêtre qui se termine à l'échantillon évalué, même au milieu
+    d'un gros lot, pour un coût constant par échantillon.
+    """
+
+    def __init__(self, threshold=5, clear=None, quantile=0.95, window="10 min", min_count=10, cooldown=alert_cooldown):
+        super().__init__(threshold, clear, cooldown)
+        self.quantile = quantile
+        self.window = window
+        self.duration = latency_windows[window]
+        self.min_count = min_count
+        self.span = self.duration
+
+    def new_state(self):
+        return SlidingLatency(self.duration)
+
+    def measure(self, state, active, harvester, timestamp_ms, time_taken, total_plots):
+        state.add(timestamp_ms, time_taken, LatencySketch.index(time_taken))
+        if state.sketch.count < self.min_count:
+            return None
+        return state.sketch.quantiles([self.quantile])[0]
+
+    def describe(self, value):
+        return f"p{round(self.quantile * 100)} des temps de recherche sur {self.window} : {value:.2f} s (seuil {self.threshold:g} s)"
+
+
+class EventSink:
+    """Notification dans la file d'événements de l'interface, affichée en fenêtre (show_alert)."""
+
+    def __init__(self, events):
+        self.events = events
+
+    def send(self, alert):
+        self.events.put(("alert", alert, None))
+
+
+class WebhookSink:
+    """POST JSON de l'alerte vers url (webhook local, relais vers une messagerie...), dans un thread."""
+
+    def __init__(self, url):
+        self.url = url
+
+    def send(self, alert):
+        threading.Thread(target=self.post, args=(alert,), daemon=True).start()
+
+    def post(self, alert):
+        request = Request(self.url, data=json.dumps(alert).encode("utf-8"), headers={"Content-Type": "application/json"}, method="POST")
+        try:
+            with urlopen(request, timeout=webhook_timeout):
+                pass
+        except OSError:
+            # Destinataire injoignable : l'alerte reste visible dans l'interface et /api/stats
+            pass
+
+
+class ScriptSink:
+    """Lance command avec le message en argument et l'alerte en JSON dans la variable CHIA_ALERT, sans attendre."""
+
+    def __init__(self, command):
+        self.command = command
+
+    def send(self, alert):
+        try:
+            subprocess.Popen(shlex.split(self.command) + [alert['message']], env=dict(os.environ, CHIA_ALERT=json.dumps(alert)),
+                             stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError:
+            pass
+
+
+alert_rule_types = {'slow_lookups': SlowLookupsRule, 'plot_drop': PlotDropRule, 'latency_quantile': LatencyQuantileRule}
+alert_sink_types = {'webhook': WebhookSink, 'script': ScriptSink}
+
+
+class AlertEngine:
+    """Évaluation incrémentale des règles d'alerte, appelée par le thread d'ingestion pour chaque échantillon.
+
+    Chaque règle garde un état par harvester : le coût par échantillon est constant, sans relire
+    l'historique. Les alertes actives sont publiées dans chaque LogSnapshot ; déclenchements et retours à
+    la normale sont envoyés aux sinks (EventSink, WebhookSink, ScriptSink), au plus une fois par cooldown
+    de la règle et seulement pour des échantillons de moins de alert_max_age secondes. Une alerte déclenchée
+    sans être notifiée (échantillons anciens, cooldown) l'est dès qu'un échantillon récent la maintient ;
+    son retour à la normale n'est envoyé que si son déclenchement l'a été.
+    """
+
+    def __init__(self, rules, sinks=()):
+        self.rules = list(rules)
+        self.sinks = list(sinks)
+        self.states = {}
+        # (indice de la règle, harvester) -> alerte active, et horodatage de la dernière notification
+        self.active = {}
+        self.notified = {}
+        self.span = max((rule.span for rule in self.rules), default=0)
+
+    def add_columns(self, chunk, names, bulk=False):
+        # Chargement en bloc : seuls les échantillons récents, utiles à l'état actuel des règles, sont rejoués
+        timestamps = chunk['timestamp']
+        if not len(timestamps) or not self.rules:
+            return
+        rows = slice(None)
+        if bulk:
+            rows = timestamps >= to_epoch_ms(datetime.now()) - max(self.span, alert_max_age * 1000)
+        for harvester, timestamp_ms, time_taken, total_plots in zip(
+                chunk['harvester'][rows].tolist(), timestamps[rows].tolist(), chunk['time_taken'][rows].tolist(), chunk['total_plots'][rows].tolist()):
+            self.add(harvester, timestamp_ms, time_taken, total_plots, names)
+
+    def add(self, harvester, timestamp_ms, time_taken, total_plots, names):
+        for index, rule in enumerate(self.rules):
+            key = (index, harvester)
+            if key not in self.states:
+                self.states[key] = rule.new_state()
+            active = key in self.active
+            value = rule.measure(self.states[key], active, harvester, timestamp_ms, time_taken, total_plots)
+            if value is None:
+                continue
+            if not active and value > rule.threshold:
+                alert = {'rule': type(rule).__name__, 'harvester': names[harvester], 'state': "déclenchée", 'since': timestamp_ms,
+                         'timestamp': timestamp_ms, 'value': value, 'threshold': rule.threshold,
+                         'message': f"[{names[harvester]}] {rule.describe(value)}", 'notified': False}
+                self.active[key] = alert
+                self.deliver(key, rule, alert)
+            elif active and value <= rule.clear:
+                alert = self.active.pop(key)
+                if alert['notified']:
+                    self.notify(key, dict(alert, state="résolue", timestamp=timestamp_ms, value=value,
+                                          message=f"[{names[harvester]}] Retour à la normale : {rule.describe(value)}"))
+            elif active:
+                alert = self.active[key]
+                alert.update(timestamp=timestamp_ms, value=value)
+                if not alert['notified']:
+                    self.deliver(key, rule, alert)
+
+    def deliver(self, key, rule, alert):
+        # Une alerte qui oscille autour du seuil n'est notifiée qu'une fois par cooldown ; sur un échantillon
+        # ancien (chargement, rattrapage), rien n'est envoyé et le cooldown ne démarre pas
+        if to_epoch_ms(datetime.now()) - alert['timestamp'] > alert_max_age * 1000:
+            return
+        if alert['timestamp'] - self.notified.get(key, -rule.cooldown) < rule.cooldown:
+            return
+        alert['notified'] = True
+        self.notify(key, alert)
+
+    def notify(self, key, alert):
+        self.notified[key] = alert['timestamp']
+        for sink in self.sinks:
+            sink.send(dict(alert))
+
+    def snapshot(self):
+        return tuple(dict(alert) for alert in self.active.values())
+
+
+def create_alert_engine(config_path=None, sinks=()):
+    """AlertEngine configuré par un fichier JSON {"rules": [...], "sinks": [...]}, ou avec les règles par défaut.
+
+    Chaque règle ou sink est un objet {"type": ..., paramètres} : slow_lookups (count, window, seconds),
+    plot_drop (plots), latency_quantile (threshold, quantile, window) avec clear et cooldown pour toutes
+    les règles, webhook (url) et script (command). sinks s'ajoute à ceux du fichier.
+    """
+    config = {}
+    if config_path:
+        with open(config_path, 'r', encoding='utf-8') as file:
+            config = json.load(file)
+    try:
+        rules = [alert_rule_types[spec['type']](**{name: value for name, value in spec.items() if name != 'type'})
+                 for spec in config.get('rules', default_alert_rules)]
+        sinks = list(sinks) + [alert_sink_types[spec['type']](**{name: value for name, value in spec.items() if name != 'type'})
+                               for spec in config.get('sinks', [])]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Configuration des alertes invalide : {e}")
+    return AlertEngine(rules, sinks)
+
+
+class DaemonThreadPool(Executor):
+    """Pool de threads démons pour les appels bloquants de l'ingestion (fichiers locaux, partages réseau).
+
+    Les threads sont créés à la demande, jusqu'à max_workers, puis réutilisés. Contrairement à
+    ThreadPoolExecutor, un appel bloqué sur un partage injoignable n'empêche pas de quitter l'application.
+    """
+
+    def __init__(self, max_workers):
+        self.max_workers = max(max_workers, 1)
+        self.tasks = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        self.threads = 0
+        self.idle = 0
+        self.pending = 0
+
+    def submit(self, function, *args, **kwargs):
+        future = Future()
+        with self.lock:
+            self.pending += 1
+            if self.idle < self.pending and self.threads < self.max_workers:
+                self.threads += 1
+                threading.Thread(target=self.work, daemon=True).start()
+        self.tasks.put((future, function, args, kwargs))
+        return future
+
+    def work(self):
+        while True:
+            with self.lock:
+                self.idle += 1
+            task = self.tasks.get()
+            with self.lock:
+                self.idle -= 1
+                self.pending -= 1
+            if task is None:
+                break
+            future, function, args, kwargs = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = function(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        # Les threads se terminent après les tâches déjà soumises ; un appel encore bloqué finira seul
+        with self.lock:
+            threads = self.threads
+            self.threads = self.max_workers
+            self.pending += threads
+        for _ in range(threads):
+            self.tasks.put(None)
+
+
+def describe_source_error(error):
+    if isinstance(error, FileNotFoundError):
+        return "fichier introuvable"
+    if isinstance(error, asyncio.TimeoutError):
+        return "aucune réponse"
+    return str(error) or type(error).__name__
+
+
+class FileSource:
+    """Source fichier (disque local ou partage monté) : chargement initial puis suivi par un LogTailer.
+
+    Tous les accès au fichier passent par le pool de threads de l'ingestion (LogIngestor.call) : un
+    partage lent ne retient que la tâche de sa source. Après une erreur, la source réessaie avec un délai
+    doublé à chaque échec et reprend là où elle s'était arrêtée, sans relire ni sauter d'octets.
+    """
+
+    def __init__(self, ingestor, harvester, file_path):
+        self.ingestor = ingestor
+        self.harvester = harvester
+        self.file_path = file_path
+        # Fichiers restant à charger [chemin, position, final_partial], None tant que le chargement n'est pas planifié
+        self.pending = None
+        self.inode = None
+        self.tailer = None
+        self.load_reported = False
+        # Événement levé par le watcher inotify ; sans watcher, la source est scrutée avec un intervalle adaptatif
+        self.changed = asyncio.Event()
+        self.watched = False
+        self.delay = reconnect_min_delay
+
+    async def run(self):
+        while True:
+            try:
+                if self.tailer is None:
+                    await self.load()
+                await self.follow()
+            except Exception as e:
+                await self.ingestor.set_status(self.harvester, f"{describe_source_error(e)}, nouvelle tentative dans {self.delay} s")
+                await self.ingestor.release_loading(self.harvester)
+                if self.tailer:
+                    try:
+                        await self.ingestor.call(self.harvester, self.tailer.close)
+                    except OSError:
+                        pass
+                await asyncio.sleep(self.delay)
+                self.delay = min(self.delay * 2, reconnect_max_delay)
+
+    async def plan(self):
+        # Reprise depuis le cache (éventuellement dans un fichier tourné depuis), sinon relecture de l'historique
+        ingestor = self.ingestor
+        pending = None
+        if ingestor.cached:
+            pending = await ingestor.call(self.harvester, ingestor.cache.resume_plan, ingestor.cached[1], self.harvester)
+        resumed = pending is not None
+        if not resumed:
+            history = await ingestor.call(self.harvester, rotated_log_paths, self.file_path, log_history_depth)
+            pending = [[path, 0, True] for path in history] + [[self.file_path, 0, False]]
+        sizes = [await ingestor.call(self.harvester, os.path.getsize, path) for path, _, _ in pending]
+
+        # Plus aucun accès au fichier à partir d'ici : après une erreur, plan() est refait sans que les
+        # échantillons du cache aient déjà été publiés, et ils ne le sont qu'une fois
+        if resumed:
+            await ingestor.put("cached", self.harvester, ingestor.cached_rows(self.harvester))
+        ingestor.release_cached(self.harvester)
+        for size, (_, offset, _) in zip(sizes, pending):
+            ingestor.progress['total'] += max(size - offset, 0)
+        self.pending = pending
+
+    async def load(self):
+        ingestor = self.ingestor
+        if self.pending is None:
+            await self.plan()
+
+        # Intervalles de tous les fichiers restants (historique tourné puis debug.log), dans l'ordre
+        files = []
+        for entry in self.pending:
+            path, offset, _ = entry
+            stat = await ingestor.call(self.harvester, os.stat, path)
+            files.append((entry, stat.st_ino, await ingestor.call(self.harvester, split_ranges, path, offset, stat.st_size)))
+
+        futures = []
+        backlog = sum(stop - start for _, _, ranges in files for start, stop in ranges)
+        if parallel_workers > 1 and backlog >= parallel_min_size:
+            # Gros historique (Chia tourne debug.log vers 50 Mo) : les intervalles de tous les fichiers sont
+            # répartis ensemble sur tous les cœurs, puis fusionnés dans l'ordre des fichiers
+            pool = ingestor.process_pool()
+            futures = [[ingestor.loop.run_in_executor(pool, parse_range, entry[0], start, stop, entry[2], self.harvester) for start, stop in ranges]
+                       for entry, _, ranges in files]
+        try:
+            for index, (entry, inode, ranges) in enumerate(files):
+                path, _, final_partial = entry
+                for range_index, (start, stop) in enumerate(ranges):
+                    if futures:
+                        parsed = await ingestor.wait(self.harvester, futures[index][range_index])
+                    else:
+                        parsed = await ingestor.call(self.harvester, parse_range, path, start, stop, final_partial, self.harvester)
+                    await ingestor.put("columns", self.harvester, parsed)
+                    entry[1] = start + parsed.consumed
+                self.inode = inode
+                self.pending.pop(0)
+        finally:
+            for file_futures in futures:
+                for future in file_futures:
+                    future.cancel()
+
+        # Le suivi reprend exactement là où la lecture initiale s'est arrêtée
+        self.tailer = LogTailer(self.file_path, entry[1], self.inode)
+        self.load_reported = True
+        await ingestor.put("loaded", self.harvester, self.tailer.offset)
+
+    async def follow(self):
+        ingestor = self.ingestor
+        interval = watch_min_interval
+        # Après le chargement, une reconnexion ou une source qui ne répondait plus, le retard est rattrapé
+        # jusqu'à la première lecture vide
+        catching_up = True
+        while True:
+            self.changed.clear()
+            lines = await ingestor.call(self.harvester, self.tailer.read_new_lines)
+            self.delay = reconnect_min_delay
+            catching_up = catching_up or ingestor.reported_status[self.harvester] is not None
+            await ingestor.set_status(self.harvester, None)
+            if lines:
+                # Un seul lot par lecture : une rafale de lignes ne produit qu'un rendu
+                await ingestor.put("lines", self.harvester, (lines, self.tailer.offset))
+                interval = watch_min_interval
+            else:
+                if catching_up:
+                    catching_up = False
+                    await ingestor.put("caught_up", self.harvester, None)
+                interval = min(interval * 2, watch_max_interval)
+            try:
+                await asyncio.wait_for(self.changed.wait(), watch_max_interval if self.watched else interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def close(self):
+        # Sans attendre : un partage bloqué ne retarde pas l'arrêt
+        if self.tailer:
+            self.ingestor.executor.submit(self.tailer.close)
+
+
+class StreamSource:
+    """Source en flux : lignes lues sur une connexion TCP (tcp://machine:port), un socket Unix
+    (unix:///chemin) ou la sortie d'une commande (cmd:ssh machine tail -F ~/.chia/mainnet/log/debug.log).
+
+    Le flux ne contient que les lignes écrites depuis la connexion : il n'y a pas de chargement initial.
+    Après une erreur, une fin de flux ou stream_idle_timeout sans donnée, la connexion est refaite avec
+    un délai doublé à chaque échec. Les dernières lignes renvoyées à chaque connexion (tail -F en rejoue
+    10) ne sont pas comptées deux fois : voir LogIngestor.skip_replayed.
+    """
+
+    def __init__(self, ingestor, harvester, source):
+        self.ingestor = ingestor
+        self.harvester = harvester
+        self.source = source
+        self.writer = None
+        self.process = None
+        self.load_reported = True
+
+    async def connect(self):
+        if self.source.startswith("tcp://"):
+            url = urlsplit(self.source)
+            reader, self.writer = await asyncio.open_connection(url.hostname, url.port)
+        elif self.source.startswith("unix://"):
+            reader, self.writer = await asyncio.open_unix_connection(self.source[len("unix://"):])
+        else:
+            self.process = await asyncio.create_subprocess_exec(*shlex.split(self.source[len("cmd:"):]), stdin=asyncio.subprocess.DEVNULL,
+                                                                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL)
+            reader = self.process.stdout
+        return reader
+
+    async def run(self):
+        ingestor = self.ingestor
+        if ingestor.cached:
+            await ingestor.put("cached", self.harvester, ingestor.cached_rows(self.harvester))
+        ingestor.release_cached(self.harvester)
+        await ingestor.put("loaded", self.harvester, None)
+
+        delay = reconnect_min_delay
+        while True:
+            try:
+                reader = await asyncio.wait_for(self.connect(), source_timeout)
+                await ingestor.put("connected", self.harvester, None)
+                partial = b""
+                while True:
+                    data = await asyncio.wait_for(reader.read(read_chunk_size), stream_idle_timeout)
+                    if not data:
+                        raise ConnectionError("fin du flux")
+                    delay = reconnect_min_delay
+                    await ingestor.set_status(self.harvester, None)
+                    lines = (partial + data).split(b"\n")
+                    partial = lines.pop()
+                    if lines:
+                        # file bornée : si l'analyse prend du retard, le flux n'est plus lu et l'émetteur ralentit
+                        await ingestor.put("lines", self.harvester, ([line.rstrip(b"\r").decode("utf-8", errors="replace") for line in lines], None))
+            except Exception as e:
+                self.close()
+                await ingestor.set_status(self.harvester, f"{describe_source_error(e)}, nouvelle tentative dans {delay} s")
+            except BaseException:
+                self.close()
+                raise
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, reconnect_max_delay)
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+        if self.process:
+            if self.process.returncode is None:
+                try:
+                    self.process.kill()
+                except ProcessLookupError:
+                    pass
+            self.process = None
+
+
+class LogIngestor(threading.Thread):
+    """Thread d'ingestion : seul à analyser les lignes et à modifier log_data et les agrégats.
+
+    sources est une liste de sources, une par harvester : fichiers ("chemin" ou "nom=chemin", disques
+    locaux ou partages montés) ou flux (tcp://, unix://, cmd:). Avec database (SampleDatabase), chaque
+    nouvel échantillon est aussi enregistré dans l'historique persistant, par lots, dans un thread dédié. Le thread fait tourner une boucle asyncio :
+    une tâche par source (FileSource, StreamSource) fait les lectures, avec délai maximal et reconnexion,
+    et dépose ce qu'elle lit dans une file bornée. Une seule tâche vide cette file et modifie les données ;
+    elle publie dans events des messages (type, valeur, valeur) : ("progress", octets lus, total),
+    ("done", LogSnapshot) quand toutes les sources ont fini leur chargement ou échoué, puis ("snapshot",
+    LogSnapshot) après chaque lot de nouvelles lignes ou changement d'état d'une source, et ("error",
+    titre, message) sur une erreur inattendue. La boucle Tk ne fait que vider cette file et afficher le
+    dernier instantané reçu. Avec alerts (AlertEngine), chaque échantillon passe par les règles d'alerte
+    et les alertes actives sont publiées dans les instantanés. gap_multiple règle la détection des trous
+    dans la cadence des signage points (CadenceTracker).
+    """
+
+    def __init__(self, sources, events, database=None, alerts=None, gap_multiple=cadence_gap_multiple):
+        super().__init__(daemon=True)
+        self.names, self.file_paths = parse_sources(sources)
+        self.events = events
+        self.database = database
+        self.alerts = alerts
+        self.gap_multiple = gap_multiple
+        self.stopping = threading.Event()
+        self.loop = None
+        # État de chaque source affiché par l'interface (None : la source fonctionne)
+        self.status = [None] * len(self.file_paths)
+
+    def publish(self, kind, first=None, second=None):
+        self.events.put((kind, first, second))
+
+    def snapshot(self):
+        return LogSnapshot(log_data.snapshot(), proof_stats.snapshot(), dict(pool_info), dict(farmer_info), list(giga_horse_info),
+                           tuple(harvester_names), [stats.snapshot() for stats in harvester_stats], tuple(self.status),
+                           summarize_latency(harvester_latency, to_epoch_ms(datetime.now())),
+                           self.alerts.snapshot() if self.alerts else (), [cadence.snapshot() for cadence in harvester_cadence])
+
+    async def call(self, harvester, function, *args):
+        # Appel bloquant exécuté dans le pool de threads
+        return await self.wait(harvester, self.loop.run_in_executor(self.executor, function, *args))
+
+    async def wait(self, harvester, future):
+        """Attend le résultat d'un appel bloquant.
+
+        Au-delà de source_timeout, la source est signalée comme ne répondant plus mais l'appel n'est pas
+        abandonné (le fichier ne peut pas être relu tant qu'il est en cours) : seule la tâche de cette source
+        l'attend, les autres continuent. Les opérations communes (harvester None) sont abandonnées.
+        """
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), source_timeout)
+        except asyncio.TimeoutError:
+            if harvester is None:
+                raise
+            await self.set_status(harvester, f"ne répond plus depuis {source_timeout} s")
+            await self.release_loading(harvester)
+            return await future
+
+    async def put(self, kind, harvester, value):
+        await self.queue.put((kind, harvester, value))
+
+    async def release_loading(self, harvester):
+        # Une source lente ou en échec ne retarde pas la fin du chargement des autres : ses données suivront
+        source = self.sources[harvester]
+        if not source.load_reported:
+            source.load_reported = True
+            await self.put("loaded", harvester, None)
+
+    async def set_status(self, harvester, status):
+        # Seuls les changements d'état passent par la file
+        if self.reported_status[harvester] != status:
+            self.reported_status[harvester] = status
+            await self.put("status", harvester, status)
+
+    def process_pool(self):
+        # spawn plutôt que fork : le processus parent contient déjà des threads (Tk, ingestion)
+        if self.processes is None:
+            self.processes = ProcessPoolExecutor(max_workers=parallel_workers, mp_context=multiprocessing.get_context('spawn'))
+        return self.processes
+
+    def cached_rows(self, harvester):
+        columns = self.cached[0]
+        rows = np.flatnonzero(columns['harvester'] == harvester)
+        return ParsedRange({name: np.asarray(values[rows]) for name, values in columns.items()}, [], 0)
+
+    def release_cached(self, harvester):
+        # Colonnes du cache libérées dès que toutes les sources ont repris (ou écarté) leurs échantillons
+        self.cache_pending.discard(harvester)
+        if not self.cache_pending:
+            self.cached = None
+
+    def history(self, start_ms, end_ms, harvester=None):
+        # Appelé depuis un thread de l'interface ou de l'API : lecture seule de l'historique, sans toucher aux données
+        if self.database is None:
+            return empty_history(start_ms, end_ms)
+        return self.database.read_history(start_ms, end_ms, harvester)
+
+    def flush_history(self):
+        # Un seul lot en cours d'écriture : ce qui arrive entre-temps part dans le lot suivant
+        if not self.history_chunks or (self.history_future and not self.history_future.done()):
+            return
+        chunks, rows = [], 0
+        while self.history_chunks and rows < history_batch_rows:
+            chunks.append(self.history_chunks.pop(0))
+            rows += len(chunks[-1]['timestamp'])
+        self.history_future = self.loop.run_in_executor(self.history_executor, self.database.write, chunks, list(self.names))
+        self.history_future.add_done_callback(lambda _: self.flush_history())
+
+    async def close_history(self):
+        # Lots restants écrits avant l'arrêt, puis connexion fermée dans le thread d'écriture
+        try:
+            while self.history_chunks or (self.history_future and not self.history_future.done()):
+                if self.history_future and not self.history_future.done():
+                    await self.wait(None, self.history_future)
+                else:
+                    self.flush_history()
+            await self.wait(None, self.loop.run_in_executor(self.history_executor, self.database.close))
+        except asyncio.TimeoutError:
+            pass
+
+    def apply(self, kind, harvester, value):
+        # Seule fonction qui modifie les données : toujours appelée par la tâche d'analyse
+        if kind == "lines":
+            lines, offset = value
+            if harvester in self.replay_cutoff:
+                lines = self.skip_replayed(harvester, lines)
+            start = len(log_data)
+            for line in lines:
+                ingest_line(line, harvester)
+            if offset is not None:
+                self.offsets[harvester] = offset
+            if len(log_data) > start and (self.database or self.alerts):
+                rows = log_data.slice(start, len(log_data))
+                if self.alerts:
+                    self.alerts.add_columns(rows, self.names)
+                if self.database:
+                    self.history_chunks.append({name: values.copy() for name, values in rows.items()})
+            return bool(lines)
+        if kind in ("columns", "cached"):
+            merge_parsed_range(value)
+            self.progress['done'] += value.consumed
+            # Les échantillons du cache sont déjà dans l'historique, sauf si celui-ci vient d'être créé
+            if self.database and (kind == "columns" or self.history_created):
+                self.history_chunks.append(value.columns)
+            if self.alerts:
+                self.alerts.add_columns(value.columns, self.names, bulk=True)
+            return len(value.columns['timestamp']) > 0
+        if kind == "loaded":
+            self.loading.discard(harvester)
+            self.offsets[harvester] = value
+            return True
+        if kind == "status":
+            self.status[harvester] = value
+            return True
+        if kind == "caught_up":
+            self.caught_up = True
+        if kind == "connected" and harvester_stats[harvester].last_timestamp is not None:
+            self.replay_cutoff[harvester] = harvester_stats[harvester].last_timestamp
+        return False
+
+    def skip_replayed(self, harvester, lines):
+        """Retire les échantillons rejoués par un flux qui vient de se connecter.
+
+        Les échantillons au plus tard au dernier horodatage connu du harvester (y compris ceux du cache)
+        sont déjà enregistrés ; le filtre s'arrête au premier échantillon plus récent. Les autres lignes
+        (pool, farmer) sont gardées : elles ne font que remplacer les informations par les mêmes.
+        """
+        cutoff = self.replay_cutoff[harvester]
+        for index, line in enumerate(lines):
+            parsed_line = parse_log_line(line)
+            if parsed_line and parsed_line[0] > cutoff:
+                del self.replay_cutoff[harvester]
+                return [line for line in lines[:index] if not parse_log_line(line)] + lines[index:]
+        return [line for line in lines if not parse_log_line(line)]
+
+    def report_progress(self):
+        # Limiter les rapports à un tous les progress_interval ou progress_bytes
+        progress = self.progress
+        now = time.monotonic()
+        if now - progress['time'] >= progress_interval or progress['done'] - progress['bytes'] >= progress_bytes:
+            self.publish("progress", progress['done'], progress['total'])
+            progress['time'] = now
+            progress['bytes'] = progress['done']
+
+    async def consume(self):
+        loaded = False
+        while True:
+            try:
+                kind, harvester, value = await asyncio.wait_for(self.queue.get(), snapshot_refresh_interval)
+            except asyncio.TimeoutError:
+                # Aucune ligne reçue : les fenêtres glissantes vieillissent quand même
+                if loaded:
+                    self.publish("snapshot", self.snapshot())
+                continue
+            changed = self.apply(kind, harvester, value)
+            while not self.queue.empty():
+                changed = self.apply(*self.queue.get_nowait()) or changed
+            if self.database:
+                self.flush_history()
+
+            if self.loading:
+                self.report_progress()
+            elif not loaded:
+                # Les sources sont lues en parallèle : remise dans l'ordre chronologique avant la première publication
+                loaded = True
+                log_data.sort()
+                self.publish("progress", self.progress['total'], self.progress['total'])
+                self.publish("done", self.snapshot())
+                if self.processes:
+                    self.processes.shutdown(wait=False)
+                    self.processes = None
+                self.save_task = self.loop.create_task(self.save_cache())
+            elif changed or self.caught_up:
+                # Une source a rattrapé un long retard : les fenêtres resteraient trop larges. Le tri n'a lieu
+                # qu'une fois par rattrapage : un décalage d'horloge entre harvesters, qui se reproduit à chaque
+                # lot, ne relance pas un tri (et un rendu complet) à chaque lot
+                if self.caught_up and log_data.max_lag > store_max_lag:
+                    log_data.sort()
+                self.publish("snapshot", self.snapshot())
+            self.caught_up = False
+
+    async def save_cache(self):
+        # Empreintes des fichiers (éventuellement sur un partage) et écriture faites dans le pool de threads
+        async with self.save_lock:
+            try:
+                await self.wait(None, self.loop.run_in_executor(self.executor, self.cache.save, self.snapshot(), list(self.offsets)))
+            except asyncio.TimeoutError:
+                pass
+
+    def on_watch_event(self):
+        for path in self.watcher.read_changes():
+            self.sources_by_path[path].changed.set()
+
+    async def start_watcher(self):
+        # inotify_add_watch peut lui aussi bloquer sur un partage : fait dans le pool, sans retarder les sources
+        file_sources = [source for source in self.sources if isinstance(source, FileSource)]
+        try:
+            watcher = await self.wait(None, self.loop.run_in_executor(self.executor, create_watcher, [source.file_path for source in file_sources]))
+        except asyncio.TimeoutError:
+            return
+        if watcher is None:
+            return
+        self.watcher = watcher
+        self.sources_by_path = {source.file_path: source for source in file_sources}
+        self.loop.add_reader(watcher.fd, self.on_watch_event)
+        watched = set(watcher.watched.values())
+        for source in file_sources:
+            source.watched = source.file_path in watched
+            source.changed.set()
+
+    def run(self):
+        asyncio.run(self.main())
+
+    async def main(self):
+        self.stopped = asyncio.Event()
+        self.loop = asyncio.get_running_loop()
+        if self.stopping.is_set():
+            return
+
+        count = len(self.file_paths)
+        self.queue = asyncio.Queue(source_queue_size)
+        self.executor = DaemonThreadPool(count + 2)
+        self.processes = None
+        self.watcher = None
+        self.save_lock = asyncio.Lock()
+        self.save_task = None
+        self.reported_status = [None] * count
+        # Position atteinte dans le fichier de chaque source, une fois son chargement terminé
+        self.offsets = [None] * count
+        self.loading = set(range(count))
+        # Levé par une source arrivée au bout de son retard, jusqu'à la fin du lot en cours
+        self.caught_up = False
+        # Dernier horodatage connu de chaque flux qui vient de se connecter, tant qu'il rejoue des lignes déjà lues
+        self.replay_cutoff = {}
+        self.progress = {'done': 0, 'total': 0, 'time': time.monotonic(), 'bytes': 0}
+        reset_log_data(self.names, self.gap_multiple)
+
+        # Écritures de l'historique dans un seul thread, à la suite les unes des autres
+        self.history_executor = DaemonThreadPool(1)
+        self.history_chunks = []
+        self.history_future = None
+        self.history_created = False
+        if self.database:
+            try:
+                self.history_created = await self.wait(None, self.loop.run_in_executor(self.history_executor, self.database.open))
+            except (asyncio.TimeoutError, sqlite3.Error, OSError):
+                pass
+
+        self.cache = LogCache(self.file_paths)
+        self.cache_pending = set(range(count))
+        try:
+            self.cached = await self.wait(None, self.loop.run_in_executor(self.executor, self.cache.read))
+        except asyncio.TimeoutError:
+            self.cached = None
+        if self.cached:
+            meta = self.cached[1]
+            log_data.points.extend(meta.get('points', []))
+            log_data.farmer.extend(columns_from_json(meta['farmer_series'], FarmerSeries.columns))
+            pool_info.update(meta.get('pool_info', {}))
+            farmer_info.update(meta.get('farmer_info', {}))
+            giga_horse_info[:] = meta.get('giga_horse_info', [])
+
+        self.sources = [StreamSource(self, harvester, path) if is_stream_source(path) else FileSource(self, harvester, path)
+                        for harvester, path in enumerate(self.file_paths)]
+        consumer = self.loop.create_task(self.consume())
+        tasks = [self.loop.create_task(source.run()) for source in self.sources]
+        try:
+            await self.start_watcher()
+            # Une erreur inattendue de l'analyse arrête l'ingestion, comme une demande d'arrêt
+            stop = self.loop.create_task(self.stopped.wait())
+            await asyncio.wait([stop, consumer], return_when=asyncio.FIRST_COMPLETED)
+            if consumer.done() and not consumer.cancelled() and consumer.exception():
+                e = consumer.exception()
+                self.publish("error", "Erreur de lecture", f"Une erreur est survenue lors de la lecture du fichier de log : {str(e)}")
+            stop.cancel()
+        finally:
+            # asyncio.wait_for peut absorber une annulation qui arrive en même temps que son résultat (Python
+            # < 3.12) : l'annulation est renouvelée jusqu'à ce que toutes les tâches soient terminées
+            pending = tasks + [consumer]
+            while pending:
+                for task in pending:
+                    task.cancel()
+                _, pending = await asyncio.wait(pending, timeout=1)
+            await asyncio.gather(*tasks, consumer, return_exceptions=True)
+            if self.watcher:
+                self.loop.remove_reader(self.watcher.fd)
+                self.watcher.close()
+            # Le cache reprendra au début de la première ligne non encore analysée de chaque fichier
+            await self.save_cache()
+            if self.database:
+                await self.close_history()
+            for source in self.sources:
+                source.close()
+            self.executor.shutdown(wait=False)
+            self.history_executor.shutdown(wait=False)
+            if self.processes:
+                self.processes.shutdown(wait=False, cancel_futures=True)
+
+    def stop(self, timeout=None):
+        self.stopping.set()
+        loop = self.loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self.stopped.set)
+            except RuntimeError:
+                # Boucle déjà terminée
+                pass
+        self.join(timeout)
+
+
+def default_log_path():
+    # Même choix que l'interface : le log partagé s'il est accessible, sinon le log local de Chia
+    return personal_log if os.path.exists(personal_log) else default_log_file
+
+
+def columns_to_json(columns):
+    # Les temps (float32) sont arrondis à la précision du log pour ne pas exposer le bruit de conversion
+    return {name: (values.astype(np.float64).round(5) if values.dtype.kind == 'f' else values).tolist()
+            for name, values in columns.items()}
+
+
+def columns_from_json(columns, dtypes=LogStore.columns):
+    return {name: np.asarray(columns[name], dtype=dtype) for name, dtype in dtypes.items()}
+
+
+def format_metric_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(int(value))
+
+
+def format_label_value(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_metrics(snapshot):
+    """Rend l'instantané au format texte Prometheus/OpenMetrics.
+
+    Les séries du harvester portent un label harvester ; les totaux de la ferme s'obtiennent par sum().
+    Toutes les valeurs proviennent des agrégats tenus à jour pendant l'analyse : une collecte ne
+    parcourt jamais l'historique.
+    """
+    harvesters = [(f'harvester="{format_label_value(name)}"', stats) for name, stats in zip(snapshot.harvesters, snapshot.harvester_stats)]
+    lines = [
+        "# HELP chia_harvester_lookup_seconds Temps de recherche des preuves par signage point.",
+        "# TYPE chia_harvester_lookup_seconds histogram",
+    ]
+    for label, stats in harvesters:
+        cumulative = 0
+        for bound, count in zip(ProofStats.latency_buckets + (float('inf'),), stats.time_buckets):
+            cumulative += count
+            bound_label = "+Inf" if bound == float('inf') else format_metric_value(float(bound))
+            lines.append(f'chia_harvester_lookup_seconds_bucket{{{label},le="{bound_label}"}} {cumulative}')
+        lines.append(f"chia_harvester_lookup_seconds_sum{{{label}}} {format_metric_value(float(stats.time_sum))}")
+        lines.append(f"chia_harvester_lookup_seconds_count{{{label}}} {stats.count}")
+
+    harvester_metrics = [
+        ("chia_harvester_signage_points_total", "counter", "Signage points traités par le harvester.", lambda stats, cadence: stats.count),
+        ("chia_harvester_eligible_plots_total", "counter", "Parcelles éligibles cumulées sur tous les signage points.",
+         lambda stats, cadence: stats.eligible_plots_total),
+        ("chia_harvester_proofs_found_total", "counter", "Preuves trouvées.", lambda stats, cadence: stats.total_proofs),
+        ("chia_harvester_total_plots", "gauge", "Nombre de parcelles du harvester.", lambda stats, cadence: stats.total_plots if stats.count else None),
+        ("chia_harvester_last_sample_timestamp_seconds", "gauge", "Horodatage Unix du dernier signage point.",
+         lambda stats, cadence: unix_timestamp(stats.last_timestamp) if stats.last_timestamp is not None else None),
+        ("chia_harvester_missed_signage_points_total", "counter", "Signage points manqués d'après les trous dans la cadence des lignes.",
+         lambda stats, cadence: cadence['missed']),
+        ("chia_harvester_signage_point_interval_seconds", "gauge", "Intervalle appris entre deux signage points.",
+         lambda stats, cadence: cadence['interval'] / 1000 if stats.count else None),
+    ]
+    for name, kind, description, value_of in harvester_metrics:
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {kind}")
+        for (label, stats), cadence in zip(harvesters, snapshot.cadence):
+            # Valeur encore inconnue (aucun signage point lu pour ce harvester) : la série est omise
+            value = value_of(stats, cadence)
+            if value is not None:
+                lines.append(f"{name}{{{label}}} {format_metric_value(value)}")
+
+    farmer_metrics = [
+        ("chia_farmer_difficulty", "gauge", "Difficulté actuelle de la ferme.", snapshot.farmer_info.get('current_difficulty')),
+        ("chia_farmer_points", "gauge", "Points actuels de la ferme.", snapshot.farmer_info.get('current_points')),
+    ]
+    for name, kind, description, value in farmer_metrics:
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {kind}")
+        # Valeur encore inconnue (aucune réponse /farmer par exemple) : la série est omise
+        if value is not None:
+            lines.append(f"{name} {format_metric_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+class Collector:
+    """Service de collecte sans interface : un LogIngestor et le dernier instantané publié.
+
+    Les événements du thread d'ingestion sont consommés par un thread dédié ; l'API ne lit que
+    l'instantané courant, jamais les données en cours d'écriture.
+    """
+
+    def __init__(self, sources, database=None, alerts=None, gap_multiple=cadence_gap_multiple):
+        self.events = queue.Queue()
+        self.ingestor = LogIngestor(sources, self.events, database, alerts, gap_multiple)
+        names = self.ingestor.names
+        self.snapshot = self.ingestor.snapshot()._replace(harvesters=tuple(names), harvester_stats=[ProofStats() for _ in names], latency={},
+                                                          alerts=(), cadence=[CadenceTracker().snapshot() for _ in names])
+        self.loaded = False
+        self.progress = (0, 0)
+        self.error = None
+        # Réveille les requêtes en attente (long polling) à chaque événement
+        self.changed = threading.Condition()
+        self.thread = threading.Thread(target=self.consume_events, daemon=True)
+
+    def start(self):
+        self.ingestor.start()
+        self.thread.start()
+
+    def consume_events(self):
+        while True:
+            kind, first, second = self.events.get()
+            if kind == "stop":
+                break
+            with self.changed:
+                if kind == "progress":
+                    self.progress = (first, second)
+                elif kind == "error":
+                    self.error = f"{first} : {second}"
+                    self.loaded = True
+                elif kind in ("done", "snapshot"):
+                    self.snapshot = first
+                    self.loaded = True
+                self.changed.notify_all()
+
+    def wait_for_update(self, since, generation, timeout):
+        # Rend la main dès que des échantillons au-delà de since sont disponibles, ou au prochain événement
+        with self.changed:
+            store = self.snapshot.store
+            if len(store) <= since and store.generation == generation and timeout > 0:
+                self.changed.wait(timeout)
+
+    def state(self, snapshot):
+        return {
+            'sources': [{'name': name, 'file': path} for name, path in zip(self.ingestor.names, self.ingestor.file_paths)],
+            'loaded': self.loaded,
+            'progress': {'done': self.progress[0], 'total': self.progress[1]},
+            'error': self.error,
+            'count': len(snapshot.store),
+            'generation': snapshot.store.generation,
+            'stats': snapshot.stats.as_dict(),
+            'harvesters': [{'name': name, 'stats': stats.as_dict(), 'status': status, 'cadence': cadence}
+                           for name, stats, status, cadence in zip(snapshot.harvesters, snapshot.harvester_stats, snapshot.harvester_status,
+                                                                   snapshot.cadence)],
+            'latency': snapshot.latency,
+            'alerts': snapshot.alerts,
+            'pool_info': snapshot.pool_info,
+            'farmer_info': snapshot.farmer_info,
+            'giga_horse_info': snapshot.giga_horse_info,
+            'points': snapshot.store.points[-1] if snapshot.store.points else None,
+        }
+
+    def stop(self, timeout=None):
+        self.ingestor.stop(timeout)
+        self.events.put(("stop", None, None))
+        self.thread.join(timeout)
+
+
+class CollectorRequestHandler(BaseHTTPRequestHandler):
+    """API JSON en lecture seule du collecteur.
+
+    GET /api/stats                         agrégats de la ferme et par harvester, informations pool/farmer, état du chargement
+    GET /api/window?start=ms[&end=ms]      échantillons d'une période, en colonnes
+    GET /api/proofs[?limit=N]              dernières preuves trouvées
+    GET /api/history?start=ms&end=ms       agrégats par minute ou par heure et preuves trouvées, lus dans l'historique
+    (&harvester=nom limite /api/window, /api/proofs et /api/history aux échantillons d'un harvester)
+    GET /api/farmer?start=ms[&end=ms]      difficulté et points de la ferme relevés dans les réponses /farmer
+    GET /api/snapshot?since=N&generation=G[&farmer=F][&wait=s]
+                                           agrégats, échantillons ajoutés depuis l'indice N et relevés /farmer depuis
+                                           l'indice F (client de l'interface)
+    GET /metrics                           métriques au format Prometheus
+    """
+
+    server_version = "ChiaLogCollector"
+    routes = {
+        '/api/stats': 'api_stats',
+        '/api/window': 'api_window',
+        '/api/proofs': 'api_proofs',
+        '/api/snapshot': 'api_snapshot',
+        '/api/history': 'api_history',
+        '/api/farmer': 'api_farmer',
+    }
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/metrics':
+            self.send_text(format_metrics(self.server.collector.snapshot), "text/plain; version=0.0.4; charset=utf-8")
+            return
+        route = self.routes.get(url.path)
+        if route is None:
+            self.send_json({'error': f"Chemin inconnu : {url.path}"}, status=404)
+            return
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            body = getattr(self, route)(self.server.collector, query)
+        except (KeyError, ValueError) as e:
+            self.send_json({'error': f"Paramètre invalide : {e}"}, status=400)
+            return
+        self.send_json(body)
+
+    def send_json(self, body, status=200):
+        self.send_text(json.dumps(body), "application/json; charset=utf-8", status)
+
+    def send_text(self, text, content_type, status=200):
+        data = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Service permanent : pas de journal par requête
+        pass
+
+    @staticmethod
+    def api_stats(collector, query):
+        return collector.state(collector.snapshot)
+
+    @staticmethod
+    def harvester_rows(snapshot, query, columns):
+        # Masque des échantillons du harvester demandé (None : toute la ferme)
+        if 'harvester' not in query:
+            return None
+        return columns['harvester'] == snapshot.harvesters.index(query['harvester'])
+
+    @classmethod
+    def api_window(cls, collector, query):
+        start_ms = int(query['start'])
+        end_ms = int(query['end']) if 'end' in query else None
+        snapshot = collector.snapshot
+        window = snapshot.store.window(start_ms, end_ms)
+        rows = cls.harvester_rows(snapshot, query, window)
+        if rows is not None:
+            window = {name: values[rows] for name, values in window.items()}
+        return {'start': start_ms, 'end': end_ms, 'columns': columns_to_json(window)}
+
+    @staticmethod
+    def api_farmer(collector, query):
+        start_ms = int(query['start'])
+        end_ms = int(query['end']) if 'end' in query else None
+        return {'start': start_ms, 'end': end_ms, 'columns': columns_to_json(collector.snapshot.store.farmer.window(start_ms, end_ms))}
+
+    @classmethod
+    def api_proofs(cls, collector, query):
+        limit = int(query.get('limit', recent_proofs_limit))
+        snapshot = collector.snapshot
+        store = snapshot.store
+        found = store.column('proofs_found') > 0
+        harvester_rows = cls.harvester_rows(snapshot, query, {'harvester': store.column('harvester')})
+        if harvester_rows is not None:
+            found &= harvester_rows
+        rows = np.flatnonzero(found)[-limit:] if limit > 0 else []
+        return {'columns': columns_to_json({name: store.column(name)[rows] for name in LogStore.columns})}
+
+    @staticmethod
+    def api_history(collector, query):
+        start_ms = int(query['start'])
+        end_ms = int(query['end'])
+        harvester = query.get('harvester')
+        if harvester is not None and harvester not in collector.snapshot.harvesters:
+            raise ValueError(harvester)
+        return history_to_json(collector.ingestor.history(start_ms, end_ms, harvester))
+
+    @staticmethod
+    def api_snapshot(collector, query):
+        since = int(query.get('since', 0))
+        generation = int(query.get('generation', 0))
+        farmer_since = int(query.get('farmer', 0))
+        collector.wait_for_update(since, generation, min(float(query.get('wait', 0)), collector_wait_max))
+
+        # Instantané lu une seule fois : agrégats et échantillons sont toujours cohérents
+        snapshot = collector.snapshot
+        count = len(snapshot.store)
+        # Collecteur redémarré, log rechargé ou échantillons réordonnés (generation) : le client repart du début
+        start = since if since <= count and generation == snapshot.store.generation else 0
+        stop = min(count, start + collector_page_rows)
+        body = collector.state(snapshot)
+        body.update(start=start, columns=columns_to_json(snapshot.store.slice(start, stop)))
+        # Relevés /farmer ajoutés depuis l'indice farmer (série en ajout seul, jamais réordonnée)
+        farmer = snapshot.store.farmer
+        farmer_start = farmer_since if farmer_since <= len(farmer) else 0
+        body.update(farmer_start=farmer_start, farmer=columns_to_json(farmer.slice(farmer_start, len(farmer))))
+        return body
+
+
+class CollectorClient(threading.Thread):
+    """Client de l'API du collecteur, interchangeable avec LogIngestor côté interface.
+
+    Les échantillons publiés par le collecteur sont recopiés dans un LogStore local, et les mêmes
+    messages que LogIngestor sont publiés dans events : progression, "done" au premier instantané
+    complet, puis "snapshot" à chaque nouvel échantillon, et ("alert", alerte) pour chaque alerte
+    déclenchée par les règles du collecteur après le chargement.
+    """
+
+    def __init__(self, url, events):
+        super().__init__(daemon=True)
+        self.url = url.rstrip("/")
+        self.events = events
+        self.stopping = threading.Event()
+        self.store = LogStore()
+        self.loaded = False
+        self.error_reported = False
+        # Alertes actives déjà vues, pour ne notifier que les nouvelles
+        self.alerts_seen = set()
+
+    def publish(self, kind, first=None, second=None):
+        if not self.stopping.is_set():
+            self.events.put((kind, first, second))
+
+    def fetch(self, wait):
+        query = f"since={len(self.store)}&generation={self.store.generation}&farmer={len(self.store.farmer)}&wait={wait}"
+        with urlopen(f"{self.url}/api/snapshot?{query}", timeout=wait + client_retry_delay) as response:
+            return json.load(response)
+
+    def run(self):
+        wait = 0
+        while not self.stopping.is_set():
+            try:
+                state = self.fetch(wait)
+            except (OSError, ValueError) as e:
+                # Collecteur injoignable : signalé une seule fois, puis nouvelles tentatives
+                if not self.error_reported:
+                    self.publish("error", "Erreur du collecteur", f"Le collecteur {self.url} est injoignable : {str(e)}")
+                    self.error_reported = True
+                self.stopping.wait(client_retry_delay)
+                continue
+
+            if state['start'] != len(self.store) or state['generation'] != self.store.generation:
+                # La série /farmer ne dépend pas de l'ordre des échantillons : elle est gardée
+                farmer = self.store.farmer
+                self.store = LogStore()
+                self.store.generation = state['generation']
+                self.store.farmer = farmer
+            if state['farmer_start'] != len(self.store.farmer):
+                self.store.farmer = FarmerSeries()
+            self.store.extend(columns_from_json(state['columns']))
+            self.store.farmer.extend(columns_from_json(state['farmer'], FarmerSeries.columns))
+            if state['points'] is not None:
+                self.store.points[:] = array('q', [state['points']])
+
+            # Pages suivantes demandées sans attendre tant que le client est en retard
+            wait = client_wait if len(self.store) >= state['count'] else 0
+            if not state['loaded']:
+                self.publish("progress", state['progress']['done'], state['progress']['total'])
+                continue
+            if wait == 0:
+                continue
+
+            harvesters = state['harvesters']
+            snapshot = LogSnapshot(self.store.snapshot(), ProofStats.from_dict(state['stats']),
+                                   state['pool_info'], state['farmer_info'], state['giga_horse_info'],
+                                   tuple(harvester['name'] for harvester in harvesters),
+                                   [ProofStats.from_dict(harvester['stats']) for harvester in harvesters],
+                                   tuple(harvester['status'] for harvester in harvesters), state['latency'], tuple(state['alerts']),
+                                   [harvester['cadence'] for harvester in harvesters])
+            self.publish("snapshot" if self.loaded else "done", snapshot)
+            # Une alerte active peut n'être notifiée que plus tard (déclenchée pendant le chargement ou le cooldown)
+            alerts_seen = {(alert['rule'], alert['harvester'], alert['since']) for alert in snapshot.alerts if alert['notified']}
+            if self.loaded:
+                for alert in snapshot.alerts:
+                    if alert['notified'] and (alert['rule'], alert['harvester'], alert['since']) not in self.alerts_seen:
+                        self.publish("alert", alert)
+            self.alerts_seen = alerts_seen
+            self.loaded = True
+
+    def history(self, start_ms, end_ms, harvester=None):
+        # Même interface que LogIngestor.history, l'historique étant celui du collecteur
+        query = f"start={start_ms}&end={end_ms}" + (f"&harvester={quote(harvester)}" if harvester is not None else "")
+        with urlopen(f"{self.url}/api/history?{query}", timeout=client_wait + client_retry_delay) as response:
+            return history_from_json(json.load(response))
+
+    def stop(self, timeout=None):
+        # Aucune ressource à libérer : la requête en cours se termine d'elle-même (thread démon)
+        self.stopping.set()
+
+
+def main():
+    # Nécessaire pour les processus d'analyse parallèle dans un exécutable PyInstaller
+    multiprocessing.freeze_support()
+
+    parser = argparse.ArgumentParser(description="Collecteur sans interface des logs Chia, avec API JSON locale")
+    parser.add_argument("--log", action="append",
+                        help="source à suivre, à répéter pour chaque harvester : fichier debug.log (local ou sur un partage monté), "
+                             "tcp://machine:port, unix:///chemin ou \"cmd:ssh machine tail -F ~/.chia/mainnet/log/debug.log\" ; "
+                             "\"nom=source\" pour nommer le harvester")
+    parser.add_argument("--host", default=collector_host, help="adresse d'écoute (0.0.0.0 pour accepter les connexions du réseau)")
+    parser.add_argument("--port", type=int, default=collector_port, help="port de l'API")
+    parser.add_argument("--history", default=default_history_path(), help="base SQLite de l'historique persistant")
+    parser.add_argument("--no-history", action="store_true", help="n'enregistre pas l'historique")
+    parser.add_argument("--retention-days", type=int, default=history_retention['samples'],
+                        help="conservation des échantillons sans preuve, en jours (les agrégats sont gardés plus longtemps)")
+    parser.add_argument("--alerts", help="configuration JSON des règles et des destinataires (webhook, script) des alertes")
+    parser.add_argument("--gap-multiple", type=float, default=cadence_gap_multiple,
+                        help="écart entre deux signage points, en multiple de l'intervalle habituel, au-delà duquel des signage points sont comptés manqués")
+    args = parser.parse_args()
+
+    try:
+        alerts = create_alert_engine(args.alerts)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    database = None
+    if not args.no_history:
+        # Les agrégats par minute sont gardés au moins aussi longtemps que les échantillons
+        retention = dict(history_retention, samples=args.retention_days,
+                         rollup_1m=max(history_retention['rollup_1m'], args.retention_days))
+        database = SampleDatabase(args.history, retention)
+    collector = Collector(args.log or [default_log_path()], database, alerts, args.gap_multiple)
+    collector.start()
+    server = ThreadingHTTPServer((args.host, args.port), CollectorRequestHandler)
+    server.daemon_threads = True
+    server.collector = collector
+
+    # SIGTERM (systemd, docker stop) : arrêt propre, le cache est enregistré avant de quitter
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+    print(f"Collecteur en écoute sur http://{args.host}:{args.port} pour {', '.join(collector.ingestor.file_paths)}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        collector.stop()
+
+
+if __name__ == "__main__":
+    main()
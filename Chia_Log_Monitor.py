@@ -1,40 +1,73 @@
+import argparse
+import multiprocessing
 import os
-import platform
-import re
+import queue
+import sqlite3
 import sys
 import threading
+import time
 import tkinter as tk
-from collections import defaultdict
 from datetime import datetime, timedelta
 from tkinter import filedialog, messagebox, ttk
 
+import matplotlib.colors as mcolors
 import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
 import mplcursors
+import numpy as np
 from matplotlib import ticker
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-# Chemin du log par défaut
-system = platform.system()
-if system == "Linux":
-    default_log_file = os.path.expanduser("~/.chia/mainnet/log/debug.log")
-elif system == "Windows":
-    default_log_file = os.path.expandvars(r"%systemdrive%\%homepath%\.chia\mainnet\log\debug.log")
-elif system == "Darwin":  # MacOS
-    default_log_file = os.path.expanduser("~/Library/Application Support/Chia/mainnet/log/debug.log")
+from Chia_Log_Collector import (
+    CollectorClient,
+    EventSink,
+    LogIngestor,
+    LogStore,
+    SampleDatabase,
+    cadence_gap_multiple,
+    create_alert_engine,
+    default_history_path,
+    default_log_path,
+    from_epoch_ms,
+    missed_signage_points,
+    ms_per_day,
+    naive_epoch,
+    one_millisecond,
+    parse_giga_horse_info,
+    to_epoch_ms,
+)
+
+# Rafraîchissement de l'interface : vérification côté Tk de la file d'événements du thread d'ingestion
+tail_poll_delay = 25  # millisecondes
+
+# Nombre maximal de lignes conservées dans le résumé détaillé, et taille d'une page rechargée au défilement
+summary_max_rows = 10000
+summary_page_rows = 1000
+
+# Périodes proposées pour les graphiques : durée, libellé du titre, pas d'arrondi des axes, format de l'axe x
+chart_ranges = {
+    "1 heure": (timedelta(hours=1), "la dernière heure", timedelta(minutes=1), '%Hh%M'),
+    "6 heures": (timedelta(hours=6), "les 6 dernières heures", timedelta(minutes=5), '%Hh%M'),
+    "24 heures": (timedelta(hours=24), "les dernières 24 heures", timedelta(minutes=15), '%Hh%M'),
+    "7 jours": (timedelta(days=7), "les 7 derniers jours", timedelta(hours=1), '%d/%m %Hh'),
+    "30 jours": (timedelta(days=30), "les 30 derniers jours", timedelta(hours=6), '%d/%m'),
+    "90 jours": (timedelta(days=90), "les 90 derniers jours", timedelta(days=1), '%d/%m'),
+}
+default_chart_range = "1 heure"
+
+# Périodes lues dans les agrégats de l'historique persistant plutôt que dans les échantillons en mémoire,
+# et délai avant de relire l'historique d'une période déjà affichée
+history_chart_ranges = ("30 jours", "90 jours")
+history_refresh_delay = 60  # secondes
+
+# Choix du sélecteur de harvester qui regroupe toutes les sources
+farm_choice = "Ferme entière"
+
+
+def epoch_ms_to_num(timestamps_ms):
+    # Conversion vectorisée vers les dates numériques de matplotlib
+    return np.asarray(timestamps_ms) / ms_per_day + mdates.date2num(naive_epoch)
 
-personal_log = r'\\VM-CHIA\.chia\mainnet\log\debug.log'
-
-# Regex de recherche des logs
-log_pattern = re.compile(r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}) \S+ harvester chia\.harvester\.harvester: INFO\s+(\d+) plots were eligible for farming \w+\.\.\. Found (\d+) proofs\. Time: ([\d.]+) s\. Total (\d+) plots')
-pool_info_pattern = re.compile(r"GET /pool_info response:\s+({.*})")
-farmer_info_pattern = re.compile(r"GET /farmer response:\s+({.*})")
-giga_horse_fee_pattern = re.compile(r"fee_rate = (?P<fee_rate>\d+\.\d+) %")
-points_pattern = re.compile(r"Points: (\d+)")
-
-log_data = defaultdict(list)
-pool_info = {}
-farmer_info = {}
 
 # Définition des couleurs
 font_family = "Arial"
@@ -60,115 +93,241 @@ def on_leave(event):
     event.widget.configure(style="Normal.Vertical.TScrollbar")
 
 
-def parse_log_line(line):
-    match = log_pattern.match(line)
-    if match:
-        timestamp_str = match.group(1)
-        timestamp = datetime.strptime(timestamp_str, '%Y-%m-%dT%H:%M:%S.%f')
-        eligible_plots = int(match.group(2))
-        proofs_found = int(match.group(3))
-        time_taken = float(match.group(4))
-        total_plots = int(match.group(5))
-        return timestamp, eligible_plots, proofs_found, time_taken, total_plots
-    return None
-
-
-def parse_pool_info(line):
-    match = pool_info_pattern.search(line)
-    if match:
-        info = eval(match.group(1))
-        pool_info['name'] = info.get('name')
-        pool_info['discord'] = info.get('description').split(' ')[-1].strip('()')
-        pool_info['fee'] = info.get('fee')
-        return True
-    return False
-
-
-def parse_farmer_info(line):
-    match = farmer_info_pattern.search(line)
-    if match:
-        info = eval(match.group(1))  # Using eval for simplicity, but json.loads is safer for actual use
-        farmer_info['current_difficulty'] = info.get('current_difficulty')
-        farmer_info['current_points'] = info.get('current_points')
-        return True
-    return False
-
-
-def parse_giga_horse_info(log_lines):
-    for line in log_lines:
-        if "Found proof" in line:
-            match = giga_horse_fee_pattern.search(line)
-            if match:
-                info = match.groupdict()
-                return float(info.get('fee_rate'))
-    return False
-
-
-def parse_points(line):
-    match = points_pattern.search(line)
-    if match:
-        points = int(match.group(1))
-        log_data['points'].append(points)
-        return True
-    return False
-
-
-def print_summary(text_widget):
-    total_entries = len(log_data['timestamp'])
-    if total_entries == 0:
-        return "No log data found."
-
-    special_color = color_green
-
-    detailed_summary = "Résumé détaillé du journal:\n\n"
-    for i in range(total_entries):
-        detailed_summary += (f"{log_data['timestamp'][i]} - Parcelles admissibles: {log_data['eligible_plots'][i]}, "
-                             f"Preuves trouvées: {log_data['proofs_found'][i]}, "
-                             f"Temps pris: {log_data['time_taken'][i]:.2f} s, "
-                             f"Total des parcelles: {log_data['total_plots'][i]}\n")
-
-    # Insertion du texte avec balises
-    if text_widget:
-        text_widget.delete(1.0, tk.END)
-        text_widget.insert(tk.END, detailed_summary)
-
-        # Ajouter une balise pour le titre "Résumé détaillé du journal"
-        title_index = text_widget.search("Résumé détaillé du journal", "1.0", tk.END)
-        if title_index:
-            end_title_index = text_widget.index(f"{title_index} + {len('Résumé détaillé du journal')} chars")
-            text_widget.tag_add("title", title_index, end_title_index)
-            text_widget.tag_configure("title", foreground=special_color)
+# Couleurs RGBA des points : <= 8 secondes, > 8 secondes, preuve trouvée
+chart_colors = mcolors.to_rgba_array([color_green, color_red, color_blue])
+
+
+def empty_chart_data():
+    data = {name: np.empty(0, dtype=dtype) for name, dtype in LogStore.columns.items()}
+    data['count'] = np.empty(0, dtype=np.int64)
+    return data
+
+
+def decimate_chart_data(data, start_ms, end_ms, columns):
+    """Réduit les points à afficher en regroupant les échantillons par colonne de pixels.
+
+    Chaque groupe garde son échantillon de temps minimal et maximal ainsi que le nombre d'échantillons
+    regroupés (colonne 'count'). Les échantillons avec preuve trouvée sont toujours conservés.
+    """
+    total = len(data['timestamp'])
+    if total <= 2 * columns:
+        return dict(data, count=np.ones(total, dtype=np.int64))
+
+    # Colonne de pixels de chaque échantillon (les horodatages sont triés)
+    buckets = (data['timestamp'] - start_ms) * columns // max(end_ms - start_ms, 1)
+    bucket_starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    bucket_counts = np.diff(np.r_[bucket_starts, total])
+
+    # Tri par groupe puis par temps : le premier et le dernier de chaque groupe sont le min et le max
+    order = np.lexsort((data['time_taken'], buckets))
+    minimum = order[bucket_starts]
+    maximum = order[bucket_starts + bucket_counts - 1]
+    proofs = np.flatnonzero(data['proofs_found'] > 0)
+    selected = np.unique(np.concatenate((minimum, maximum, proofs)))
+
+    decimated = {name: values[selected] for name, values in data.items()}
+    decimated['count'] = np.repeat(bucket_counts, bucket_counts)[selected]
+    return decimated
+
+
+def history_chart_data(history, start_ms, end_ms, columns):
+    """Points du graphique d'une longue période, à partir des agrégats de l'historique.
+
+    Les agrégats se combinent sans perte (min, max, sommes) : ils sont regroupés par colonne de pixels
+    et chaque groupe donne deux points, ses temps minimal et maximal, avec le nombre d'échantillons
+    regroupés et la moyenne des parcelles éligibles. Les preuves trouvées, gardées une à une dans
+    l'historique, s'y ajoutent.
+    """
+    rollups = history['rollups']
+    timestamps = rollups['timestamp'] + history['resolution'] // 2
+    data = empty_chart_data()
+    if len(timestamps):
+        buckets = (timestamps - start_ms) * columns // max(end_ms - start_ms, 1)
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        counts = np.add.reduceat(rollups['count'], starts)
+        eligible = np.add.reduceat(rollups['eligible_plots'], starts) // np.maximum(counts, 1)
+        data = {
+            'timestamp': np.repeat(timestamps[starts], 2),
+            'eligible_plots': np.repeat(eligible, 2),
+            'proofs_found': np.zeros(2 * len(starts), dtype=np.int64),
+            'time_taken': np.column_stack((np.minimum.reduceat(rollups['time_min'], starts),
+                                           np.maximum.reduceat(rollups['time_max'], starts))).ravel(),
+            'total_plots': np.repeat(np.maximum.reduceat(rollups['total_plots'], starts), 2),
+            'harvester': np.zeros(2 * len(starts), dtype=np.int64),
+            'count': np.repeat(counts, 2),
+        }
+
+    proofs = dict(history['proofs'], count=np.ones(len(history['proofs']['timestamp']), dtype=np.int64))
+    merged = {name: np.concatenate((data[name], proofs[name])) for name in data}
+    order = np.argsort(merged['timestamp'], kind='stable')
+    return {name: values[order] for name, values in merged.items()}
+
+
+def chart_offsets(data):
+    return np.column_stack((epoch_ms_to_num(data['timestamp']), data['time_taken']))
+
+
+def format_summary_rows(rows, harvesters=()):
+    # Une ligne de texte par échantillon, préfixée du nom du harvester lorsqu'il y a plusieurs sources
+    prefixes = [f"[{name}] " for name in harvesters] if len(harvesters) > 1 else None
+    return "".join(
+        f"{prefixes[harvester] if prefixes else ''}{from_epoch_ms(timestamp)} - Parcelles admissibles: {eligible_plots}, "
+        f"Preuves trouvées: {proofs_found}, "
+        f"Temps pris: {time_taken:.2f} s, "
+        f"Total des parcelles: {total_plots}\n"
+        for timestamp, eligible_plots, proofs_found, time_taken, total_plots, harvester in zip(
+            rows['timestamp'].tolist(), rows['eligible_plots'].tolist(), rows['proofs_found'].tolist(),
+            rows['time_taken'].tolist(), rows['total_plots'].tolist(), rows['harvester'].tolist())
+    )
 
 
-def print_summary_stats(text_widget):
-    if not log_data['timestamp']:
+class SummaryView:
+    """Résumé détaillé en ajout seul.
+
+    Seules les lignes arrivées depuis le dernier rendu sont insérées, le widget garde au plus
+    max_rows lignes et l'historique plus ancien est rechargé depuis le LogStore au défilement.
+    """
+
+    title = "Résumé détaillé du journal"
+    first_row_line = 3  # Titre + ligne vide
+
+    def __init__(self, text_widget, scrollbar, store, max_rows=summary_max_rows, page_rows=summary_page_rows):
+        self.text_widget = text_widget
+        self.scrollbar = scrollbar
+        self.store = store
+        # Noms des harvesters, indexés par la colonne 'harvester'
+        self.harvesters = ()
+        self.max_rows = max_rows
+        self.page_rows = page_rows
+        # Intervalle [first_row, last_row) du LogStore actuellement affiché
+        self.first_row = 0
+        self.last_row = 0
+        # Les indices ne sont valables que pour un même LogStore et une même génération (voir LogStore.sort)
+        self.origin = store.origin
+        self.generation = store.generation
+        self.paging = False
+
+        self.text_widget.configure(yscrollcommand=self.on_scroll)
+
+    @property
+    def rendered_rows(self):
+        return self.last_row - self.first_row
+
+    def row_line(self, row):
+        return self.first_row_line + row - self.first_row
+
+    def is_following(self):
+        # L'utilisateur est en bas du journal : les nouvelles lignes sont suivies
+        return self.rendered_rows == 0 or self.text_widget.yview()[1] >= 1.0
+
+    def insert_title(self):
+        self.text_widget.delete(1.0, tk.END)
+        self.text_widget.insert(tk.END, f"{self.title}:\n\n")
+        self.text_widget.tag_add("title", "1.0", f"1.0 + {len(self.title)} chars")
+        self.text_widget.tag_configure("title", foreground=color_green)
+
+    def refresh(self):
+        if self.store.origin is not self.origin or self.store.generation != self.generation:
+            # Nouveau chargement, collecteur redémarré ou échantillons réordonnés : le rendu repart des dernières lignes
+            self.origin = self.store.origin
+            self.generation = self.store.generation
+            self.first_row = self.last_row = 0
+            self.insert_title()
+        total_entries = len(self.store)
+        if total_entries == 0 or self.last_row >= total_entries or not self.is_following():
+            return
+
+        # Trop de retard (premier rendu, gros rattrapage) : on repart des max_rows dernières lignes
+        if self.rendered_rows == 0 or total_entries - self.last_row > self.max_rows:
+            self.insert_title()
+            self.first_row = self.last_row = max(0, total_entries - self.max_rows)
+
+        self.append_rows(total_entries)
+        self.trim_top()
+        self.text_widget.see(tk.END)
+
+    def append_rows(self, stop):
+        self.text_widget.insert(tk.END, format_summary_rows(self.store.slice(self.last_row, stop), self.harvesters))
+        self.last_row = stop
+
+    def trim_top(self):
+        excess = self.rendered_rows - self.max_rows
+        if excess > 0:
+            self.text_widget.delete(f"{self.first_row_line}.0", f"{self.first_row_line + excess}.0")
+            self.first_row += excess
+
+    def trim_bottom(self):
+        excess = self.rendered_rows - self.max_rows
+        if excess > 0:
+            self.text_widget.delete(f"{self.row_line(self.last_row - excess)}.0", "end-1c")
+            self.last_row -= excess
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self.paging:
+            return
+        if float(first) <= 0.0 and self.first_row > 0:
+            self.paging = True
+            self.text_widget.after_idle(self.page_older)
+        elif float(last) >= 1.0 and 0 < self.last_row < len(self.store):
+            self.paging = True
+            self.text_widget.after_idle(self.page_newer)
+
+    def page_older(self):
+        # Recharge une page de lignes plus anciennes au-dessus de la vue
+        start = max(0, self.first_row - self.page_rows)
+        count = self.first_row - start
+        self.text_widget.insert(f"{self.first_row_line}.0", format_summary_rows(self.store.slice(start, self.first_row), self.harvesters))
+        self.first_row = start
+        self.trim_bottom()
+        # Garder à l'écran les lignes que l'utilisateur regardait
+        self.text_widget.yview(f"{self.first_row_line + count}.0")
+        self.paging = False
+
+    def page_newer(self):
+        # Recharge une page de lignes plus récentes sous la vue
+        stop = min(len(self.store), self.last_row + self.page_rows)
+        top_line = int(self.text_widget.index("@0,0").split(".")[0])
+        self.append_rows(stop)
+        excess = max(0, self.rendered_rows - self.max_rows)
+        self.trim_top()
+        self.text_widget.yview(f"{max(self.first_row_line, top_line - excess)}.0")
+        self.paging = False
+
+
+def print_summary_stats(text_widget, snapshot, harvester=None, history=None):
+    # harvester : indice du harvester affiché, None pour toute la ferme ; history : (titre de la période, historique)
+    stats = None
+    if snapshot is not None:
+        stats = snapshot.stats if harvester is None else snapshot.harvester_stats[harvester]
+    if stats is None or not stats.count:
         text_widget.delete('1.0', tk.END)
         text_widget.insert(tk.END, "Aucune donnée de journal trouvée.")
+        if snapshot is not None:
+            text_widget.insert(tk.END, "\n\n" + format_source_status(snapshot, harvester))
         return
 
-    # Mise à jour du pourcentage de preuves
-    calculate_proof_times(log_data['time_taken'])
-    calculate_proof_info()
-
-    total_entries = len(log_data['timestamp'])
-    min_proof_time, max_proof_time, avg_proof_time = calculate_proof_times(log_data['time_taken'])
-    total_proofs_found = sum(log_data['proofs_found'])
-    total_plots = log_data['total_plots'][-1] if log_data['total_plots'] else 0
+    # Toutes les valeurs proviennent des agrégats cumulés, sans parcourir l'historique
+    total_entries = stats.count
+    min_proof_time, max_proof_time, avg_proof_time = calculate_proof_times(stats)
+    total_proofs_found = stats.total_proofs
+    # Parcelles de la ferme : somme du dernier total relevé sur chaque harvester
+    total_plots = stats.total_plots if harvester is not None else sum(item.total_plots for item in snapshot.harvester_stats)
 
     # Mise à jour du nombre de preuves
-    proof_info_le_8, proof_info_gt_8 = calculate_proof_info()
+    proof_info_le_8, proof_info_gt_8 = calculate_proof_info(stats)
 
     # Récupère depuis quand le log a été créé
-    elapsed_time_formatted = calculate_elapsed_time()
+    elapsed_time_formatted = calculate_elapsed_time(stats)
 
     # Récupère les informations du pool
-    pool_name, pool_discord, pool_fee = extract_pool_info()
+    pool_name, pool_discord, pool_fee = extract_pool_info(snapshot.pool_info)
 
     # Récupère les informations du farmer
-    current_difficulty, current_points = extract_farmer_info()
+    current_difficulty, current_points = extract_farmer_info(snapshot.farmer_info)
 
     # Récupère les informations de GigaHorse
-    fee_rate = parse_giga_horse_info(log_data['giga_horse_info'])
+    fee_rate = parse_giga_horse_info(snapshot.giga_horse_info)
     if fee_rate is not False and fee_rate is not None:
         fee_rate = f"{fee_rate}%"
     else:
@@ -179,27 +338,19 @@ def print_summary_stats(text_widget):
 
     # Affiche l'heure de la dernière preuve <= 8 sec
     last_proof_le_8_time = "Aucune preuve inférieure à 8 sec trouvée"
-    if total_proofs_found > 0:
-        last_proof_le_8_indices = [
-            i for i, (proof, time_taken) in enumerate(zip(log_data['proofs_found'], log_data['time_taken']))
-            if proof > 0 and time_taken <= 8
-        ]
-        if last_proof_le_8_indices:
-            last_proof_le_8_day = log_data['timestamp'][last_proof_le_8_indices[-1]].strftime('%d/%m/%Y')
-            last_proof_le_8_time = log_data['timestamp'][last_proof_le_8_indices[-1]].strftime('%H heures %M minutes %S secondes')
-            last_proof_le_8_time = f"Dernière preuve inférieure à 8 sec trouvée le {last_proof_le_8_day} à {last_proof_le_8_time}"
+    if stats.last_proof_le_8 is not None:
+        last_proof_le_8 = from_epoch_ms(stats.last_proof_le_8)
+        last_proof_le_8_day = last_proof_le_8.strftime('%d/%m/%Y')
+        last_proof_le_8_time = last_proof_le_8.strftime('%H heures %M minutes %S secondes')
+        last_proof_le_8_time = f"Dernière preuve inférieure à 8 sec trouvée le {last_proof_le_8_day} à {last_proof_le_8_time}"
 
     # Affiche l'heure de la dernière preuve > 8 sec
     last_proof_gt_8_time = "Aucune preuve supérieure à 8 sec trouvée"
-    if total_proofs_found > 0:
-        last_proof_gt_8_indices = [
-            i for i, (proof, time_taken) in enumerate(zip(log_data['proofs_found'], log_data['time_taken']))
-            if proof > 0 and time_taken > 8
-        ]
-        if last_proof_gt_8_indices:
-            last_proof_gt_8_day = log_data['timestamp'][last_proof_gt_8_indices[-1]].strftime('%d/%m/%Y')
-            last_proof_gt_8_time = log_data['timestamp'][last_proof_gt_8_indices[-1]].strftime('%H heures %M minutes %S secondes')
-            last_proof_gt_8_time = f"Dernière preuve supérieure à 8 sec trouvée le {last_proof_gt_8_day} à {last_proof_gt_8_time}"
+    if stats.last_proof_gt_8 is not None:
+        last_proof_gt_8 = from_epoch_ms(stats.last_proof_gt_8)
+        last_proof_gt_8_day = last_proof_gt_8.strftime('%d/%m/%Y')
+        last_proof_gt_8_time = last_proof_gt_8.strftime('%H heures %M minutes %S secondes')
+        last_proof_gt_8_time = f"Dernière preuve supérieure à 8 sec trouvée le {last_proof_gt_8_day} à {last_proof_gt_8_time}"
 
     # Crée l'affichage des statistiques
     summary_stats = (
@@ -209,7 +360,9 @@ def print_summary_stats(text_widget):
         f" Fee: {pool_fee}%\n"
 
         "\n:: Infos sur la ferme ::\n"
-        f" Total de parcelles: {total_plots}\n"
+        + (f" Harvester: {snapshot.harvesters[harvester]}\n" if harvester is not None else "")
+        + format_source_status(snapshot, harvester)
+        + f" Total de parcelles: {total_plots}\n"
         f" Difficulté de la ferme: {current_difficulty}\n"
         f" Points de la ferme: {current_points}\n"
 
@@ -226,7 +379,12 @@ def print_summary_stats(text_widget):
         f" {last_proof_le_8_time}\n"
         f" {last_proof_gt_8_time}\n\n"
 
-        "\n:: Autres données ::\n"
+        + format_alert_summary(snapshot, harvester)
+        + format_latency_summary(snapshot, harvester)
+        + format_cadence_summary(snapshot, harvester)
+        + format_harvester_summary(snapshot, harvester)
+        + (format_history_summary(*history) if history else "")
+        + "\n:: Autres données ::\n"
         f" GigaHorse Fee: {fee_rate}\n"
         f" Temps écoulé depuis le début du log: {elapsed_time_formatted}\n\n"
 
@@ -256,22 +414,98 @@ def print_summary_stats(text_widget):
             text_widget.tag_configure("update_time", foreground=color_update_time)
 
 
-def calculate_proof_times(time_taken_list):
-    if not time_taken_list:
+def format_source_status(snapshot, harvester):
+    # Sources en erreur ou qui ne répondent plus : les autres continuent d'être suivies
+    harvesters = range(len(snapshot.harvesters)) if harvester is None else [harvester]
+    return "".join(f" Source {snapshot.harvesters[index]}: {snapshot.harvester_status[index]}\n"
+                   for index in harvesters if snapshot.harvester_status[index])
+
+
+def format_alert_summary(snapshot, harvester):
+    # Alertes en cours, pour la ferme ou le harvester choisi
+    alerts = [alert for alert in snapshot.alerts if harvester is None or alert['harvester'] == snapshot.harvesters[harvester]]
+    if not alerts:
+        return ""
+    return "\n:: Alertes ::\n" + "".join(f" Depuis {from_epoch_ms(alert['since']).strftime('%d/%m %H:%M')}: {alert['message']}\n"
+                                         for alert in alerts)
+
+
+def format_latency_summary(snapshot, harvester):
+    # Quantiles des temps de recherche sur les fenêtres glissantes, pour la ferme ou le harvester choisi
+    if not snapshot.latency:
+        return ""
+    position = 0 if harvester is None else harvester + 1
+    lines = ["\n:: Temps de recherche récents ::\n"]
+    for label, summaries in snapshot.latency.items():
+        summary = summaries[position]
+        if summary is None:
+            lines.append(f" {label}: aucune donnée\n")
+            continue
+        quantiles = ", ".join(f"{name} {value:.2f} s" for name, value in summary.items() if name.startswith("p"))
+        lines.append(f" {label}: {quantiles}, min {summary['min']:.2f} s, max {summary['max']:.2f} s ({summary['count']} entrées)\n")
+    return "".join(lines)
+
+
+def format_cadence_summary(snapshot, harvester):
+    # Signage points manqués (trous dans la cadence des lignes) de chaque harvester, ou du harvester choisi
+    harvesters = range(len(snapshot.harvesters)) if harvester is None else [harvester]
+    now_ms = to_epoch_ms(datetime.now())
+    lines = ["\n:: Signage points manqués ::\n"]
+    for index in harvesters:
+        cadence = snapshot.cadence[index]
+        name = f"{snapshot.harvesters[index]}: " if harvester is None and len(snapshot.harvesters) > 1 else ""
+        last_gap = ""
+        if cadence['gaps']:
+            start_ms, end_ms, missed = cadence['gaps'][-1]
+            last_gap = f", dernier trou le {from_epoch_ms(start_ms).strftime('%d/%m %H:%M')} ({(end_ms - start_ms) / 1000:.0f} s)"
+        lines.append(f" {name}{missed_signage_points(cadence, now_ms - 3600000)} la dernière heure, "
+                     f"{missed_signage_points(cadence, now_ms - ms_per_day)} sur 24 heures, {cadence['missed']} au total "
+                     f"(intervalle habituel {cadence['interval'] / 1000:.2f} s{last_gap})\n")
+    return "".join(lines)
+
+
+def format_history_summary(range_title, history):
+    # Statistiques d'une longue période, calculées sur les agrégats de l'historique
+    rollups = history['rollups']
+    count = int(rollups['count'].sum())
+    lines = [f"\n:: Historique sur {range_title} ::\n"]
+    if not count:
+        lines.append(" Aucune donnée enregistrée\n")
+    else:
+        slow = int(rollups['slow'].sum())
+        lines.append(f" Total des entrées: {count}\n"
+                     f" Total des preuves trouvées: {int(rollups['proofs'].sum())}\n"
+                     f" Temps moyen des preuves: {rollups['time_sum'].sum() / count:.2f} secondes\n"
+                     f" Temps maximal des preuves: {rollups['time_max'].max():.2f} secondes\n"
+                     f" Total de preuves supérieures à 8 secondes: {slow} ({slow / count * 100:.2f}%)\n")
+    return "".join(lines) + "\n"
+
+
+def format_harvester_summary(snapshot, harvester):
+    # Une ligne par harvester dans la vue de toute la ferme, lorsqu'il y a plusieurs sources
+    if harvester is not None or len(snapshot.harvesters) < 2:
+        return ""
+    lines = ["\n:: Infos par harvester ::\n"]
+    for name, stats in zip(snapshot.harvesters, snapshot.harvester_stats):
+        if not stats.count:
+            lines.append(f" {name}: aucune donnée\n")
+            continue
+        slow_percentage = stats.count_gt_8 / stats.count * 100
+        lines.append(f" {name}: {stats.total_plots} parcelles, {stats.count} entrées, {stats.total_proofs} preuves, "
+                     f"moyenne {stats.time_avg:.2f} s, {slow_percentage:.2f}% > 8 s\n")
+    return "".join(lines) + "\n"
+
+
+def calculate_proof_times(stats):
+    if not stats.count:
         return None, None, None
 
-    min_time = min(time_taken_list)
-    max_time = max(time_taken_list)
-    avg_time = sum(time_taken_list) / len(time_taken_list)
-    return min_time, max_time, avg_time
+    return stats.time_min, stats.time_max, stats.time_avg
 
 
-def calculate_proof_info():
-    time_taken_le_8 = [time for time in log_data['time_taken'] if time <= 8]
-    time_taken_gt_8 = [time for time in log_data['time_taken'] if time > 8]
-
-    total_count_le_8 = len(time_taken_le_8)
-    total_count_gt_8 = len(time_taken_gt_8)
+def calculate_proof_info(stats):
+    total_count_le_8 = stats.count_le_8
+    total_count_gt_8 = stats.count_gt_8
 
     total_proofs = total_count_le_8 + total_count_gt_8
     if total_proofs > 0:
@@ -287,21 +521,20 @@ def calculate_proof_info():
     return proof_info_le_8, proof_info_gt_8
 
 
-def calculate_elapsed_time():
-    first_timestamp = log_data['timestamp'][0]
-    last_timestamp = log_data['timestamp'][-1]
-    elapsed_time = last_timestamp - first_timestamp
+def calculate_elapsed_time(stats):
+    elapsed_time = timedelta(milliseconds=int(stats.last_timestamp - stats.first_timestamp))
     return format_elapsed_time(elapsed_time)
 
 
-def extract_pool_info():
+def extract_pool_info(pool_info):
     pool_name = pool_info.get('name', 'Données en attente')
-    pool_discord = pool_info.get('discord', 'Données en attente')
+    # Discord absent de la réponse du pool (description manquante) : affiché comme tel, pas comme en attente
+    pool_discord = pool_info.get('discord', 'Données en attente') or 'Non communiqué'
     pool_fee = pool_info.get('fee', 'Données en attente')
     return pool_name, pool_discord, pool_fee
 
 
-def extract_farmer_info():
+def extract_farmer_info(farmer_info):
     current_difficulty = farmer_info.get('current_difficulty', 'Données en attente')
     current_points = farmer_info.get('current_points', 'Données en attente')
     return current_difficulty, current_points
@@ -322,7 +555,7 @@ def format_elapsed_time(elapsed_time):
         formatted_time += f"{minutes} minute{'s' if minutes > 1 else ''} "
 
     # Gérer l'affichage des secondes avec précision
-    if seconds.is_integer():
+    if float(seconds).is_integer():
         formatted_time += f"{int(seconds)} seconde{'s' if seconds != 1 else ''}"
     else:
         formatted_time += f"{seconds:.2f} secondes"
@@ -337,9 +570,17 @@ def resource_path(relative_path):
 
 
 class LogMonitorApp:
-    def __init__(self, root):
+    def __init__(self, root, collector_url=None, log_sources=None, alert_config=None, gap_multiple=cadence_gap_multiple):
         # Initialisation de l'application et des variables
         self.root = root
+        # Adresse de l'API d'un collecteur (Chia_Log_Collector.py) : l'interface n'analyse alors aucun log
+        self.collector_url = collector_url
+        # Logs des harvesters à suivre ("chemin" ou "nom=chemin") ; par défaut le log local
+        self.log_sources = log_sources
+        # Configuration JSON des règles et destinataires des alertes ; par défaut les règles de default_alert_rules
+        self.alert_config = alert_config
+        # Écart entre deux signage points, en multiple de l'intervalle habituel, compté comme un trou
+        self.gap_multiple = gap_multiple
         self.root.title("Chia Log Monitor")
         # Set dark background for the root window
         self.root.configure(bg=color_dark_gray)
@@ -352,10 +593,14 @@ class LogMonitorApp:
 
         # Indicateur de chargement du log
         self.log_loaded = False
-        # Verrou pour synchroniser l'accès à log_loaded
-        self.log_loaded_lock = threading.Lock()
-        self.last_file_size = 0
-        self.monitor_file_path = ""
+        # File d'événements alimentée par le thread d'ingestion et vidée par la boucle Tk
+        self.events = queue.Queue()
+        self.ingestor = None
+        # Dernier instantané publié : seul état lu par l'interface
+        self.snapshot = None
+        # Historique des longues périodes par (période, harvester) : (heure de lecture, historique), lu en arrière-plan
+        self.history = {}
+        self.history_requests = set()
 
         # Initialize custom style for progress bar
         self.custom_style = ttk.Style()
@@ -397,6 +642,19 @@ class LogMonitorApp:
         self.load_button = tk.Button(self.frame, text="Charger le fichier de logs", command=lambda: self.load_log_file(), bg='#999999', fg='#000000')
         self.load_button.grid(row=0, column=0, columnspan=2, padx=10, pady=(20, 5), sticky=tk.N)
 
+        # Choix de la période affichée par les graphiques
+        self.chart_range = tk.StringVar(value=default_chart_range)
+        self.range_menu = tk.OptionMenu(self.frame, self.chart_range, *chart_ranges, command=lambda _: self.select_chart_range())
+        self.range_menu.configure(bg=color_light_gray, fg=color_black, highlightthickness=0)
+        self.range_menu.grid(row=0, column=0, columnspan=2, padx=10, pady=(20, 5), sticky=tk.NE)
+
+        # Choix du harvester affiché par les statistiques et les graphiques
+        self.harvester = tk.StringVar(value=farm_choice)
+        self.harvester_menu = tk.OptionMenu(self.frame, self.harvester, farm_choice)
+        self.harvester_menu.configure(bg=color_light_gray, fg=color_black, highlightthickness=0)
+        self.harvester_menu.grid(row=0, column=0, columnspan=2, padx=10, pady=(20, 5), sticky=tk.NW)
+        self.harvester_names = ()
+
         self.top_frame = tk.Frame(self.frame, bg=color_dark_gray)
         self.top_frame.grid(row=1, column=0, sticky=tk.NSEW)
 
@@ -408,7 +666,8 @@ class LogMonitorApp:
 
         self.summary_scrollbar = ttk.Scrollbar(self.summary_frame, orient=tk.VERTICAL, style="Normal.Vertical.TScrollbar", command=self.summary_text.yview)
         self.summary_scrollbar.grid(row=0, column=1, sticky=tk.NS)
-        self.summary_text.configure(yscrollcommand=self.summary_scrollbar.set, padx=10, pady=5)
+        self.summary_text.configure(padx=10, pady=5)
+        self.summary_view = SummaryView(self.summary_text, self.summary_scrollbar, LogStore())
 
         # Bind enter and leave events to the scrollbar
         self.summary_scrollbar.bind("<Enter>", on_enter)
@@ -476,9 +735,9 @@ class LogMonitorApp:
         self.canvas2 = FigureCanvasTkAgg(self.fig2, master=self.plot_frame2)
         self.canvas2.get_tk_widget().grid(row=0, column=0, sticky=tk.NSEW)
 
-        # Initialize cursor attributes
-        self.cursor1 = None
-        self.cursor2 = None
+        # Données actuellement affichées par chaque graphique (utilisées par les tooltips)
+        self.chart1_data = empty_chart_data()
+        self.chart2_data = empty_chart_data()
 
         # Sets the style of the chart
         self.fig1.patch.set_facecolor(color_dark_gray)
@@ -506,161 +765,229 @@ class LogMonitorApp:
         self.ax2.xaxis.label.set_color(color_dark_gray)
         self.ax2.yaxis.label.set_color(color_dark_gray)
 
+        # Artistes persistants des graphiques, mis à jour sur place à chaque rafraîchissement
+        self.setup_charts()
+
         # Load default log file and start periodic update
         self.load_default_log_file()
+        self.root.after(tail_poll_delay, self.poll_events)
 
         if not self.log_loaded:
             self.update_ui()
 
-        if self.log_loaded:
-            self.update_periodically()
-
-    def read_log_file(self, file_path):
-        try:
-            # Display the progress bar at the beginning of file reading
-            self.progress_bar.grid(row=1, column=0, columnspan=2, padx=(215, 5), ipady=8, sticky=tk.NSEW)
-
-            # Place the loading message in the middle of the progress bar
-            self.loading_label = tk.Label(self.root, text="Chargement en cours: ", background=color_dark_gray, foreground=color_green, font=(font_family, 11, 'bold'))
-            self.loading_label.grid(row=1, column=0, columnspan=2, padx=5, ipadx=5, ipady=7, sticky=tk.NW)
-
-            # Place the percentage label
-            self.percentage_label = tk.Label(self.root, text="", background=color_dark_gray, foreground=color_green, font=(font_family, 11))
-            self.percentage_label.grid(row=1, column=0, columnspan=2, padx=(173, 0), ipadx=5, ipady=7, sticky=tk.NW)
-
-            with open(file_path, 'r') as file:
-                file_lines = file.readlines()
-                self.progress_bar['maximum'] = len(file_lines)
-
-                for line in file_lines:
-                    # Parsing log lines
-                    parsed_line = parse_log_line(line)
-                    if parsed_line:
-                        timestamp, eligible_plots, proofs_found, time_taken, total_plots = parsed_line
-                        log_data['timestamp'].append(timestamp)
-                        log_data['eligible_plots'].append(eligible_plots)
-                        log_data['proofs_found'].append(proofs_found)
-                        log_data['time_taken'].append(time_taken)
-                        log_data['total_plots'].append(total_plots)
-                    else:
-                        # Parsing other info
-                        if not parse_pool_info(line) and not parse_farmer_info(line) and not parse_points(line):
-                            parse_giga_horse_info(line)
-
-                    self.progress_bar.step(1)
-                    # Mettre à jour la barre de progression
-                    self.progress_bar.update_idletasks()
-                    # Mise à jour du pourcentage
-                    self.percentage_label.config(text=f"{int((self.progress_bar['value'] / self.progress_bar['maximum']) * 100)}%")
-
-            # Marquer le chargement comme terminé en toute sécurité avec le verrou
-            with self.log_loaded_lock:
-                self.log_loaded = True
-
-            # Appeler update_ui après la fin du chargement
-            self.root.after(0, self.update_ui)
-
-        except FileNotFoundError:
-            messagebox.showerror("Erreur de fichier", f"Le fichier de log '{file_path}' est introuvable.")
-        except Exception as e:
-            messagebox.showerror("Erreur de lecture", f"Une erreur est survenue lors de la lecture du fichier de log : {str(e)}")
-        finally:
-            # Cacher le message de chargement une fois la lecture terminée
-            self.loading_label.grid_remove()
-            # Assurez-vous que la barre de progression est cachée à la fin
-            self.progress_bar.grid_remove()
-            self.percentage_label.config(text="")
-            # Signalisation de la fin du chargement
+    def show_progress(self):
+        # Display the progress bar at the beginning of file reading
+        self.progress_bar['value'] = 0
+        self.progress_bar.grid(row=1, column=0, columnspan=2, padx=(215, 5), ipady=8, sticky=tk.NSEW)
+
+        # Place the loading message in the middle of the progress bar
+        self.loading_label = tk.Label(self.root, text="Chargement en cours: ", background=color_dark_gray, foreground=color_green, font=(font_family, 11, 'bold'))
+        self.loading_label.grid(row=1, column=0, columnspan=2, padx=5, ipadx=5, ipady=7, sticky=tk.NW)
+
+        # Place the percentage label
+        self.percentage_label = tk.Label(self.root, text="", background=color_dark_gray, foreground=color_green, font=(font_family, 11))
+        self.percentage_label.grid(row=1, column=0, columnspan=2, padx=(173, 0), ipadx=5, ipady=7, sticky=tk.NW)
+
+    def hide_progress(self):
+        # Cacher le message de chargement une fois la lecture terminée
+        self.loading_label.grid_remove()
+        # Assurez-vous que la barre de progression est cachée à la fin
+        self.progress_bar.grid_remove()
+        self.percentage_label.config(text="")
+
+    def poll_events(self):
+        # Vide la file d'événements depuis la boucle Tk ; seul le dernier instantané est affiché
+        snapshot = None
+        finished = False
+        while True:
+            try:
+                kind, first, second = self.events.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "progress":
+                consumed, file_size = first, second
+                self.progress_bar['maximum'] = max(file_size, 1)
+                self.progress_bar['value'] = consumed
+                # Mise à jour du pourcentage
+                self.percentage_label.config(text=f"{int((consumed / self.progress_bar['maximum']) * 100)}%")
+            elif kind == "history":
+                self.store_history(first, second)
+            elif kind == "alert":
+                self.show_alert(first)
+            elif kind == "default_log":
+                if first:
+                    self.start_read_log_file([first])
+                else:
+                    messagebox.showerror("Erreur de fichier", "Les fichiers de log sont introuvables.")
+            elif kind == "error":
+                messagebox.showerror(first, second)
+                finished = True
+            elif kind == "done":
+                finished = True
+                snapshot = first
+            elif kind == "snapshot":
+                snapshot = first
+
+        if finished:
+            self.hide_progress()
+
+            # Marquer le chargement comme terminé
             self.log_loaded = True
 
+        if snapshot is not None:
+            self.snapshot = snapshot
+        if finished or snapshot is not None:
+            self.update_ui()
+            if self.log_loaded:
+                self.plot_data()
+                self.set_chart_style()
+
+        self.root.after(tail_poll_delay, self.poll_events)
+
     def load_log_file(self):
         # Réinitialiser le statut de chargement
         self.log_loaded = False
 
-        file_path = filedialog.askopenfilename(filetypes=[("Log Files", "*.log")])
-        if file_path:
-            self.root.after(50, self.start_read_log_file, file_path)
+        # Plusieurs fichiers peuvent être choisis : un par harvester
+        file_paths = filedialog.askopenfilenames(filetypes=[("Log Files", "*.log")])
+        if file_paths:
+            self.root.after(50, self.start_read_log_file, list(file_paths))
 
     def load_default_log_file(self):
         # Réinitialiser le statut de chargement
         self.log_loaded = False
 
-        if os.path.exists(personal_log):
-            self.root.after(50, self.start_read_log_file, personal_log)
-        elif os.path.exists(default_log_file):
-            self.root.after(50, self.start_read_log_file, default_log_file)
+        if self.collector_url:
+            self.root.after(50, self.start_collector_client, self.collector_url)
+        elif self.log_sources:
+            self.root.after(50, self.start_read_log_file, self.log_sources)
         else:
-            messagebox.showerror("Erreur de fichier", "Les fichiers de log sont introuvables.")
-
-    def read_new_lines(self, file_path):
-        current_size = os.path.getsize(file_path)
-        if current_size > self.last_file_size:
-            with open(file_path, 'r') as file:
-                # Commencez à lire à partir de la dernière position lue
-                file.seek(self.last_file_size)
-                new_lines = file.readlines()
-                # Mettre à jour la dernière taille du fichier
-                self.last_file_size = current_size
-
-                for line in new_lines:
-                    parsed_line = parse_log_line(line)
-                    if parsed_line:
-                        timestamp, eligible_plots, proofs_found, time_taken, total_plots = parsed_line
-                        log_data['timestamp'].append(timestamp)
-                        log_data['eligible_plots'].append(eligible_plots)
-                        log_data['proofs_found'].append(proofs_found)
-                        log_data['time_taken'].append(time_taken)
-                        log_data['total_plots'].append(total_plots)
-                    else:
-                        if not parse_pool_info(line) and not parse_farmer_info(line) and not parse_points(line):
-                            parse_giga_horse_info(line)
-
-                self.update_ui()
-
-                if hasattr(self, 'log_loaded') and self.log_loaded:
-                    self.plot_data()
-                    self.set_chart_style()
-
-    def start_monitoring(self, file_path):
-        self.last_file_size = os.path.getsize(file_path)
-        self.monitor_file_path = file_path
-        self.root.after(1000, self.update_log_file)
-
-    def update_log_file(self):
-        self.read_new_lines(self.monitor_file_path)
-        self.root.after(1000, self.update_log_file)
-
-    def start_read_log_file(self, file_path):
-        thread = threading.Thread(target=self.read_log_file, args=(file_path,))
-        thread.daemon = True
-        thread.start()
-        self.start_monitoring(file_path)
-
-    def update_periodically(self):
-        # Update UI periodically
-        self.update_ui()
-        self.root.after(1000, self.update_periodically)
-
-        if hasattr(self, 'log_loaded') and self.log_loaded:
-            self.plot_data()
-            self.set_chart_style()
+            # Le log partagé peut mettre longtemps à répondre (machine éteinte) : recherche hors de la boucle Tk
+            threading.Thread(target=self.find_default_log_file, daemon=True).start()
+
+    def find_default_log_file(self):
+        file_path = default_log_path()
+        self.events.put(("default_log", file_path if os.path.exists(file_path) else None, None))
+
+    def start_read_log_file(self, sources):
+        # Un seul thread d'ingestion à la fois, pour toutes les sources : le précédent est arrêté avant de lancer le suivant
+        if self.ingestor:
+            self.ingestor.stop()
+        self.show_progress()
+
+        self.history.clear()
+        alerts = create_alert_engine(self.alert_config, [EventSink(self.events)])
+        self.ingestor = LogIngestor(sources, self.events, SampleDatabase(default_history_path()), alerts, self.gap_multiple)
+        self.ingestor.start()
+
+    def start_collector_client(self, url):
+        # Le client de l'API publie les mêmes événements que le thread d'ingestion
+        if self.ingestor:
+            self.ingestor.stop()
+        self.show_progress()
+
+        self.history.clear()
+        self.ingestor = CollectorClient(url, self.events)
+        self.ingestor.start()
+
+    def show_alert(self, alert):
+        # Fenêtre non modale au premier plan : le suivi des logs continue pendant qu'elle est affichée
+        window = tk.Toplevel(self.root, bg=color_dark_gray)
+        window.title(f"Alerte {alert['state']}")
+        window.attributes('-topmost', True)
+        color = color_red if alert['state'] == "déclenchée" else color_green
+        text = f"{from_epoch_ms(alert['timestamp']).strftime('%d/%m/%Y %H:%M:%S')}\n{alert['message']}"
+        tk.Label(window, text=text, background=color_dark_gray, foreground=color, font=(font_family, 11), justify=tk.LEFT,
+                 wraplength=500).pack(padx=15, pady=(15, 10))
+        tk.Button(window, text="OK", command=window.destroy, width=10).pack(pady=(0, 15))
 
     def update_ui(self):
         # Sauvegarder la position actuelle de défilement
-        current_summary_yview = self.summary_text.yview()
         current_stats_yview = self.stats_text.yview()
 
-        # Mettre à jour le texte de résumé et les statistiques
-        print_summary(self.summary_text)
-        print_summary_stats(self.stats_text)
+        # Mettre à jour le texte de résumé (nouvelles lignes uniquement) et les statistiques
+        if self.snapshot is not None:
+            self.summary_view.store = self.snapshot.store
+            self.summary_view.harvesters = self.snapshot.harvesters
+            self.update_harvester_menu(self.snapshot.harvesters)
+        self.summary_view.refresh()
+        print_summary_stats(self.stats_text, self.snapshot, self.selected_harvester(), self.displayed_history())
 
         # Restaurez la position de défilement
-        self.summary_text.yview_moveto(current_summary_yview[0])
         self.stats_text.yview_moveto(current_stats_yview[0])
 
-        self.summary_text.see(tk.END)
         self.stats_text.see(tk.END)
 
+    def update_harvester_menu(self, names):
+        # Le menu n'est reconstruit que lorsque la liste des sources change
+        if names == self.harvester_names:
+            return
+        self.harvester_names = names
+        menu = self.harvester_menu['menu']
+        menu.delete(0, tk.END)
+        for choice in (farm_choice,) + tuple(names):
+            menu.add_command(label=choice, command=lambda choice=choice: self.select_harvester(choice))
+        if self.harvester.get() not in names:
+            self.harvester.set(farm_choice)
+
+    def select_chart_range(self):
+        self.plot_data()
+        self.update_ui()
+
+    def history_key(self):
+        harvester = self.selected_harvester()
+        return self.chart_range.get(), self.harvester_names[harvester] if harvester is not None else None
+
+    def displayed_history(self):
+        # (titre de la période, historique) pour les statistiques d'une longue période, None sinon
+        choice, name = self.history_key()
+        fetched = self.history.get((choice, name))
+        if choice not in history_chart_ranges or fetched is None:
+            return None
+        return chart_ranges[choice][1], fetched[1]
+
+    def current_history(self, start_ms, end_ms):
+        # Historique de la période affichée ; relu en arrière-plan au plus toutes les history_refresh_delay secondes
+        key = self.history_key()
+        fetched = self.history.get(key)
+        if (fetched is None or time.monotonic() - fetched[0] >= history_refresh_delay) and key not in self.history_requests:
+            self.history_requests.add(key)
+            threading.Thread(target=self.fetch_history, args=(self.ingestor, key, start_ms, end_ms), daemon=True).start()
+        return fetched[1] if fetched else None
+
+    def fetch_history(self, ingestor, key, start_ms, end_ms):
+        # Lecture de la base locale ou requête au collecteur, hors de la boucle Tk
+        try:
+            history = ingestor.history(start_ms, end_ms, key[1])
+        except (OSError, ValueError, sqlite3.Error):
+            history = None
+        self.events.put(("history", (ingestor, key), history))
+
+    def store_history(self, request, history):
+        ingestor, key = request
+        self.history_requests.discard(key)
+        if ingestor is not self.ingestor:
+            return
+        # Après une erreur, l'historique précédent reste affiché jusqu'à la prochaine tentative
+        previous = self.history.get(key)
+        if history is None:
+            history = previous[1] if previous else None
+        self.history[key] = (time.monotonic(), history)
+        if key == self.history_key():
+            self.plot_data()
+            self.update_ui()
+
+    def select_harvester(self, choice):
+        self.harvester.set(choice)
+        self.update_ui()
+        self.plot_data()
+
+    def selected_harvester(self):
+        # Indice du harvester choisi, None pour toute la ferme
+        choice = self.harvester.get()
+        return self.harvester_names.index(choice) if choice in self.harvester_names else None
+
     def set_chart_style(self):
         # Sets the style of the chart
         self.fig1.patch.set_facecolor(color_dark_gray)
@@ -688,241 +1015,221 @@ class LogMonitorApp:
         self.ax2.xaxis.label.set_color(color_white)
         self.ax2.yaxis.label.set_color(color_white)
 
+    def setup_charts(self):
+        # Décorations créées une seule fois, les points sont mis à jour avec set_offsets/set_facecolors
+        for fig, ax in ((self.fig1, self.ax1), (self.fig2, self.ax2)):
+            ax.axhline(y=8, color=color_white, linestyle='--', linewidth=0.5)
+            # Utilisation de MaxNLocator pour limiter le nombre de ticks sur l'axe x
+            ax.xaxis.set_major_locator(ticker.MaxNLocator(20))
+            ax.tick_params(axis='x', labelrotation=30)
+            fig.subplots_adjust(bottom=0.2)
+
+        # Trous dans la cadence des signage points, grisés sur le graphique de toutes les preuves (fond non animé)
+        self.gap_spans = []
+        self.gap_key = None
+
+        # Points de la ferme (axe de droite, en escalier) et changements de difficulté sur le graphique des
+        # preuves trouvées, d'après les réponses /farmer ; eux aussi font partie du fond
+        self.ax2_points = self.ax2.twinx()
+        self.ax2_points.tick_params(axis='y', colors=color_yellow)
+        self.ax2_points.spines['right'].set_color(color_yellow)
+        for side in ('top', 'bottom', 'left'):
+            self.ax2_points.spines[side].set_visible(False)
+        self.ax2_points.set_ylabel("Points", color=color_yellow)
+        self.points_line, = self.ax2_points.step([], [], where='post', color=color_yellow, linewidth=1)
+        self.difficulty_marks = []
+        self.farmer_key = None
+
+        # Les nuages de points sont animés : ils sont redessinés seuls par blitting sur un fond mis en cache
+        self.scatter1 = self.ax1.scatter([], [], marker='o', s=25, animated=True)
+        self.scatter2 = self.ax2.scatter([], [], marker='o', animated=True)
+
+        self.chart_backgrounds = {}
+        self.canvas1.mpl_connect('draw_event', lambda event: self.on_chart_draw(self.canvas1, self.ax1, self.scatter1))
+        self.canvas2.mpl_connect('draw_event', lambda event: self.on_chart_draw(self.canvas2, self.ax2, self.scatter2))
+
+        # Un seul curseur par graphique, attaché aux artistes persistants
+        self.cursor1 = mplcursors.cursor(self.scatter1, hover=True)
+        self.cursor1.connect("add", lambda sel: self.proof_tooltip(sel, self.chart1_data, unit=" s"))
+        self.cursor2 = mplcursors.cursor(self.scatter2, hover=True)
+        self.cursor2.connect("add", lambda sel: self.proof_tooltip(sel, self.chart2_data, unit=""))
+
     def plot_data(self):
-        if hasattr(self, 'log_loaded') and self.log_loaded:
-            if not log_data['timestamp']:
+        if self.log_loaded:
+            if self.snapshot is None or not len(self.snapshot.store):
+                return
+            store = self.snapshot.store
+
+            duration, range_title, step, date_format = chart_ranges[self.chart_range.get()]
+
+            # Fin de la période arrondie au pas de la période pour ne pas déplacer les axes à chaque seconde
+            step_ms = step // one_millisecond
+            end_ms = (to_epoch_ms(datetime.now()) // step_ms + 1) * step_ms
+            start_ms = end_ms - duration // one_millisecond
+            start_time, end_time = from_epoch_ms(start_ms), from_epoch_ms(end_ms)
+
+            for ax in (self.ax1, self.ax2):
+                ax.xaxis.set_major_formatter(mdates.DateFormatter(date_format))
+            columns = max(int(self.ax1.bbox.width), 1)
+
+            if self.chart_range.get() in history_chart_ranges:
+                # Au-delà de ce que garde le log : agrégats de l'historique, au même coût quelle que soit la durée
+                history = self.current_history(start_ms, end_ms)
+                if history is None:
+                    return
+                window = history_chart_data(history, start_ms, end_ms, columns)
+                self.all_proof_graphs(window, start_time, end_time, range_title, self.chart_gaps(start_ms, end_ms))
+                self.found_proof_graphs(self.filter_data(window), start_time, end_time, range_title)
                 return
 
-            # Calculer l'heure actuelle moins une heure
-            now = datetime.now()
-            start_time = now - timedelta(minutes=60)
-
-            # Filtrer les données pour ne garder que celles dans l'intervalle de la dernière heure
-            filtered_data = {
-                '<= 8 sec': [],
-                '> 8 sec': []
-            }
-
-            for timestamp, time_taken, proofs_found, eligible_plots in zip(log_data['timestamp'], log_data['time_taken'], log_data['proofs_found'], log_data['eligible_plots']):
-                if timestamp >= start_time:
-                    if time_taken <= 8:
-                        filtered_data['<= 8 sec'].append((timestamp, time_taken, proofs_found, eligible_plots))
-                    else:
-                        filtered_data['> 8 sec'].append((timestamp, time_taken, proofs_found, eligible_plots))
-
-            # Préparer les données pour le graphique 1 (<= 8 secondes)
-            timestamps_le_8 = [data[0] for data in filtered_data['<= 8 sec']]
-            time_taken_le_8 = [data[1] for data in filtered_data['<= 8 sec']]
-            proofs_found_le_8 = [data[2] for data in filtered_data['<= 8 sec']]
-            eligible_plots_le_8 = [data[3] for data in filtered_data['<= 8 sec']]
-
-            # Préparer les données pour le graphique 2 (> 8 secondes)
-            timestamps_gt_8 = [data[0] for data in filtered_data['> 8 sec']]
-            time_taken_gt_8 = [data[1] for data in filtered_data['> 8 sec']]
-            proofs_found_gt_8 = [data[2] for data in filtered_data['> 8 sec']]
-            eligible_plots_gt_8 = [data[3] for data in filtered_data['> 8 sec']]
-
-            # Filtrer les données avec preuves trouvées pour all_proof_graphs
-            self.all_proof_graphs(timestamps_le_8, time_taken_le_8, proofs_found_le_8, eligible_plots_le_8, timestamps_gt_8, time_taken_gt_8, proofs_found_gt_8, eligible_plots_gt_8)
-
-            # Filtrer les données avec preuves trouvées > 0 pour found_proof_graph
-            timestamps_le_8_filtered, proofs_found_le_8_filtered, time_taken_le_8_filtered, eligible_plots_le_8_filtered = self.filter_data(timestamps_le_8, proofs_found_le_8, time_taken_le_8, eligible_plots_le_8)
-            timestamps_gt_8_filtered, proofs_found_gt_8_filtered, time_taken_gt_8_filtered, eligible_plots_gt_8_filtered = self.filter_data(timestamps_gt_8, proofs_found_gt_8, time_taken_gt_8, eligible_plots_gt_8)
-            self.found_proof_graphs(timestamps_le_8_filtered, time_taken_le_8_filtered, eligible_plots_le_8_filtered, proofs_found_le_8_filtered, timestamps_gt_8_filtered, time_taken_gt_8_filtered, eligible_plots_gt_8_filtered,
-                                    proofs_found_gt_8_filtered)
-
-    @staticmethod
-    def filter_data(timestamps, proofs_found, time_taken, eligible_plots):
-        timestamps_filtered = [ts for ts, proof in zip(timestamps, proofs_found) if proof > 0]
-        proofs_found_filtered = [proof for proof in proofs_found if proof > 0]
-        time_taken_filtered = [time for time, proof in zip(time_taken, proofs_found) if proof > 0]
-        eligible_plots_filtered = [plots for plots, proof in zip(eligible_plots, proofs_found) if proof > 0]
-
-        return timestamps_filtered, proofs_found_filtered, time_taken_filtered, eligible_plots_filtered
-
-    def all_proof_graphs(self, timestamps_le_8, time_taken_le_8, proofs_found_le_8, eligible_plots_le_8, timestamps_gt_8, time_taken_gt_8, proofs_found_gt_8, eligible_plots_gt_8):
-        # Efface les tracés précédents
-        self.ax1.cla()
-
-        # Déterminer le début et la fin de la période à afficher
-        end_time = datetime.now()
-        start_time = end_time - timedelta(minutes=60)
-
-        # Filtrage des données
-        timestamps_le_8_filtered = [ts for ts in timestamps_le_8 if ts >= start_time]
-        time_taken_le_8_filtered = [time_taken_le_8[i] for i, ts in enumerate(timestamps_le_8) if ts >= start_time]
-        proofs_found_le_8_filtered = [proofs_found_le_8[i] for i, ts in enumerate(timestamps_le_8) if ts >= start_time]
-
-        timestamps_gt_8_filtered = [ts for ts in timestamps_gt_8 if ts >= start_time]
-        time_taken_gt_8_filtered = [time_taken_gt_8[i] for i, ts in enumerate(timestamps_gt_8) if ts >= start_time]
-        proofs_found_gt_8_filtered = [proofs_found_gt_8[i] for i, ts in enumerate(timestamps_gt_8) if ts >= start_time]
-
-        # Ajouter des marqueurs pour <= 8 secondes sans relier avec des lignes
-        scatter_le_8 = self.ax1.scatter(timestamps_le_8_filtered, time_taken_le_8_filtered, color=color_green, marker='o', s=25)
+            # Filtrer les données pour ne garder que celles de la période affichée, et du harvester choisi
+            window = store.window(start_ms, end_ms)
+            harvester = self.selected_harvester()
+            if harvester is not None:
+                rows = window['harvester'] == harvester
+                window = {name: values[rows] for name, values in window.items()}
 
-        # Ajouter des marqueurs pour > 8 secondes sans relier avec des lignes
-        scatter_gt_8 = self.ax1.scatter(timestamps_gt_8_filtered, time_taken_gt_8_filtered, color=color_red, marker='o', s=25, label='> 8 secondes')
+            # Les longues périodes sont réduites à un min/max par colonne de pixels
+            self.all_proof_graphs(decimate_chart_data(window, start_ms, end_ms, columns), start_time, end_time, range_title,
+                                  self.chart_gaps(start_ms, end_ms))
 
-        # Ajouter des points pour proofs_found_le_8 > 0 sans relier avec des lignes
-        for x, y, proof in zip(timestamps_le_8_filtered, time_taken_le_8_filtered, proofs_found_le_8_filtered):
-            if proof > 0:
-                self.ax1.scatter(x, y, color=color_blue, marker='o', s=25)
+            # Filtrer les données avec preuves trouvées > 0 pour found_proof_graph
+            self.found_proof_graphs(self.filter_data(window), start_time, end_time, range_title)
+
+    def chart_gaps(self, start_ms, end_ms):
+        # Trous du harvester choisi, ou de tous les harvesters, qui recoupent la période affichée
+        harvester = self.selected_harvester()
+        cadences = self.snapshot.cadence if harvester is None else [self.snapshot.cadence[harvester]]
+        return tuple((gap[0], gap[1]) for cadence in cadences for gap in cadence['gaps'] if gap[1] > start_ms and gap[0] < end_ms)
+
+    def update_gap_spans(self, gaps):
+        # Les bandes font partie du fond mis en cache : recréées, avec un rendu complet, seulement si les trous changent
+        if gaps == self.gap_key:
+            return False
+        for span in self.gap_spans:
+            span.remove()
+        self.gap_spans = [self.ax1.axvspan(*epoch_ms_to_num(np.array(gap, dtype=np.int64)), color=color_red, alpha=0.25, linewidth=0,
+                                           zorder=0) for gap in gaps]
+        self.gap_key = gaps
+        return True
 
-        # Ajouter des points pour proofs_found_gt_8 > 0 sans relier avec des lignes
-        for x, y, proof in zip(timestamps_gt_8_filtered, time_taken_gt_8_filtered, proofs_found_gt_8_filtered):
-            if proof > 0:
-                self.ax1.scatter(x, y, color=color_blue, marker='o', s=25)
+    def update_farmer_chart(self, start_ms, end_ms):
+        # Redessiné, avec un rendu complet, seulement quand un nouveau relevé /farmer entre dans la période
+        series = self.snapshot.store.farmer.window(start_ms, end_ms)
+        timestamps = series['timestamp']
+        key = (start_ms, end_ms, len(timestamps), int(timestamps[-1]) if len(timestamps) else None)
+        if key == self.farmer_key:
+            return False
+        self.farmer_key = key
+        for mark in self.difficulty_marks:
+            mark.remove()
+        self.difficulty_marks = []
+        if not len(timestamps):
+            self.points_line.set_data([], [])
+            return True
+
+        # Le dernier relevé vaut jusqu'à maintenant ; le premier peut précéder la période
+        x = epoch_ms_to_num(np.append(np.maximum(timestamps, start_ms), min(end_ms, to_epoch_ms(datetime.now()))))
+        points = np.append(series['points'], series['points'][-1])
+        self.points_line.set_data(x, points)
+        low, high = int(points.min()), int(points.max())
+        margin = max((high - low) * 0.05, 1)
+        self.ax2_points.set_ylim(low - margin, high + margin)
+
+        difficulty = series['difficulty']
+        for index in np.flatnonzero(difficulty[1:] != difficulty[:-1]).tolist():
+            self.difficulty_marks.append(self.ax2.axvline(x[index + 1], color=color_light_gray, linestyle=':', linewidth=1))
+            self.difficulty_marks.append(self.ax2_points.text(x[index + 1], high + margin, f" difficulté {difficulty[index + 1]}",
+                                                              color=color_light_gray, fontsize=8, rotation=90, va='top'))
+        return True
 
-        # Ajouter le quadrillage à l'arrière-plan
-        self.ax1.axhline(y=8, color=color_white, linestyle='--', linewidth=0.5)
-        self.ax1.set_title('Temps de toutes les preuves sur la dernière heure', color=color_white)
+    @staticmethod
+    def filter_data(data):
+        found = data['proofs_found'] > 0
+        filtered = {name: values[found] for name, values in data.items()}
+        filtered['count'] = np.ones(len(filtered['timestamp']), dtype=np.int64)
+        return filtered
 
-        # Définition du formateur personnalisé pour l'axe x
-        self.ax1.xaxis.set_major_formatter(mdates.DateFormatter('%Hh%M'))
+    @staticmethod
+    def proof_tooltip(sel, data, unit):
+        index = sel.index
+        if not 0 <= index < len(data['timestamp']):
+            sel.annotation.set(text="")
+            return
+
+        sel.annotation.set(text=f"{from_epoch_ms(data['timestamp'][index]).strftime('%d-%m-%Y %H:%M:%S')}\n"
+                                f"Parcelles éligibles: {data['eligible_plots'][index]}\n"
+                                f"Preuves trouvées: {data['proofs_found'][index]}\n"
+                                f"Temps: {data['time_taken'][index]:.2f}{unit}"
+                                + (f"\nÉchantillons regroupés: {data['count'][index]}" if data['count'][index] > 1 else ""),
+                           color=color_white,
+                           bbox=dict(facecolor=color_black, edgecolor='none'),
+                           ha='left')
 
-        # Définir la limite temporelle de la dernière heure
-        self.ax1.set_xlim(start_time, end_time)
+    @staticmethod
+    def update_axes(ax, data, start_time, end_time):
+        # Limite temporelle de la période affichée
+        x_limits = (mdates.date2num(start_time), mdates.date2num(end_time))
 
         # Calculer la limite maximale de l'axe Y
-        max_time_taken = max(max(time_taken_le_8_filtered, default=0), max(time_taken_gt_8_filtered, default=0))
+        max_time_taken = float(data['time_taken'].max(initial=0))
         y_upper_limit = max_time_taken + 2 if max_time_taken > 10 else 10
-        self.ax1.set_ylim(0, y_upper_limit)
-
-        # Utilisation de MaxNLocator pour limiter le nombre de ticks sur l'axe x
-        self.ax1.xaxis.set_major_locator(ticker.MaxNLocator(20))
-        self.fig1.autofmt_xdate()
-
-        # Gérer les tooltips avec mplcursors
-        if self.cursor1:
-            self.cursor1.visible = False
-
-        # Créez un curseur pour les objets scatter
-        self.cursor1 = mplcursors.cursor([scatter_le_8, scatter_gt_8], hover=True)
-
-        @self.cursor1.connect("add")
-        def on_add_cursor1(sel):
-            tooltip_color = color_white
-            face_color = color_black
-            artist = sel.artist
-
-            # Vérifier si l'artiste est un scatter
-            if artist == scatter_le_8:
-                index = sel.index
-                if 0 <= index < len(timestamps_le_8_filtered):
-                    ts = timestamps_le_8_filtered[index]
-                    parcelles = eligible_plots_le_8[index]
-                    temps = time_taken_le_8_filtered[index]
-                    sel.annotation.set(text=f"{ts.strftime('%d-%m-%Y %H:%M:%S')}\n"
-                                            f"Parcelles éligibles: {parcelles}\n"
-                                            f"Preuves trouvées: {proofs_found_le_8_filtered[index]}\n"
-                                            f"Temps: {temps:.2f} s",
-                                       color=tooltip_color,
-                                       bbox=dict(facecolor=face_color, edgecolor='none'),
-                                       ha='left')
-            elif artist == scatter_gt_8:
-                index = sel.index
-                if 0 <= index < len(timestamps_gt_8_filtered):
-                    ts = timestamps_gt_8_filtered[index]
-                    parcelles = eligible_plots_gt_8[index]
-                    temps = time_taken_gt_8_filtered[index]
-                    sel.annotation.set(text=f"{ts.strftime('%d-%m-%Y %H:%M:%S')}\n"
-                                            f"Parcelles éligibles: {parcelles}\n"
-                                            f"Preuves trouvées: {proofs_found_gt_8_filtered[index]}\n"
-                                            f"Temps: {temps:.2f} s",
-                                       color=tooltip_color,
-                                       bbox=dict(facecolor=face_color, edgecolor='none'),
-                                       ha='left')
-            else:
-                sel.annotation.set(text="",
-                                   color=tooltip_color,
-                                   bbox=dict(facecolor=face_color, edgecolor='none'),
-                                   ha='left')
+        y_limits = (0, y_upper_limit)
 
-        # Redessine le canevas
-        self.canvas1.draw()
+        # Les axes ne sont modifiés (et le fond redessiné) que si les limites changent
+        if tuple(ax.get_xlim()) == x_limits and tuple(ax.get_ylim()) == y_limits:
+            return False
+        ax.set_xlim(*x_limits)
+        ax.set_ylim(*y_limits)
+        return True
+
+    def on_chart_draw(self, canvas, ax, scatter):
+        # Après un rendu complet, mémoriser le fond de l'axe puis y dessiner les points
+        self.chart_backgrounds[ax] = canvas.copy_from_bbox(ax.bbox)
+        ax.draw_artist(scatter)
 
-    def found_proof_graphs(self, timestamps_le_8, time_taken_le_8, eligible_plots_le_8, proofs_found_le_8, timestamps_gt_8, time_taken_gt_8, eligible_plots_gt_8, proofs_found_gt_8):
-        # Clear previous plots
-        self.ax2.cla()
+    def refresh_chart(self, canvas, ax, scatter, axes_changed):
+        background = self.chart_backgrounds.get(ax)
+        if axes_changed or background is None:
+            canvas.draw_idle()
+            return
 
-        # Déterminer le début et la fin de la période à afficher
-        end_time = datetime.now()
-        start_time = end_time - timedelta(minutes=60)
+        # Seuls les points sont redessinés sur le fond mis en cache
+        canvas.restore_region(background)
+        ax.draw_artist(scatter)
+        canvas.blit(ax.bbox)
 
-        # Filtrer les données pour la période spécifiée
-        filtered_data_le_8 = [(ts, tt, pf, ep) for ts, tt, pf, ep in zip(timestamps_le_8, time_taken_le_8, proofs_found_le_8, eligible_plots_le_8) if ts >= start_time and pf > 0]
-        filtered_data_gt_8 = [(ts, tt, pf, ep) for ts, tt, pf, ep in zip(timestamps_gt_8, time_taken_gt_8, proofs_found_gt_8, eligible_plots_gt_8) if ts >= start_time and pf > 0]
+    def all_proof_graphs(self, data, start_time, end_time, range_title, gaps=()):
+        self.chart1_data = data
 
-        # Plot points where proofs_found_le_8 > 0
-        scatter_le_8 = self.ax2.scatter([ts for ts, _, _, _ in filtered_data_le_8],
-                                        [tt for _, tt, _, _ in filtered_data_le_8],
-                                        color=color_blue, marker='o', label='<= 8 secondes')
+        # Vert pour <= 8 secondes, rouge pour > 8 secondes, bleu pour les preuves trouvées
+        color_index = np.where(data['proofs_found'] > 0, 2, np.where(data['time_taken'] <= 8, 0, 1))
+        self.scatter1.set_offsets(chart_offsets(data))
+        self.scatter1.set_facecolors(chart_colors[color_index])
+        self.scatter1.set_edgecolors(chart_colors[color_index])
 
-        # Plot points where proofs_found_gt_8 > 0
-        scatter_gt_8 = self.ax2.scatter([ts for ts, _, _, _ in filtered_data_gt_8],
-                                        [tt for _, tt, _, _ in filtered_data_gt_8],
-                                        color=color_red, marker='o', label='> 8 secondes')
+        self.ax1.set_title(f'Temps de toutes les preuves sur {range_title}', color=color_white)
+        axes_changed = self.update_axes(self.ax1, data, start_time, end_time)
+        axes_changed = self.update_gap_spans(gaps) or axes_changed
 
-        # Add background grid
-        self.ax2.axhline(y=8, color=color_white, linestyle='--', linewidth=0.5)
-        self.ax2.set_title('Temps des preuves trouvées sur la dernière heure', color=color_white)
+        # Redessine le canevas
+        self.refresh_chart(self.canvas1, self.ax1, self.scatter1, axes_changed)
 
-        # Définir le format de l'axe x
-        self.ax2.xaxis.set_major_formatter(mdates.DateFormatter('%Hh%M'))
-        self.ax2.set_xlim(start_time, end_time)
+    def found_proof_graphs(self, data, start_time, end_time, range_title):
+        self.chart2_data = data
 
-        # Calculer la limite maximale de l'axe Y
-        time_taken_le_8_values = [tt for _, tt, _, _ in filtered_data_le_8]
-        time_taken_gt_8_values = [tt for _, tt, _, _ in filtered_data_gt_8]
+        # Bleu pour <= 8 secondes, rouge pour > 8 secondes
+        color_index = np.where(data['time_taken'] <= 8, 2, 1)
+        self.scatter2.set_offsets(chart_offsets(data))
+        self.scatter2.set_facecolors(chart_colors[color_index])
+        self.scatter2.set_edgecolors(chart_colors[color_index])
 
-        max_time_taken = max(max(time_taken_le_8_values, default=0), max(time_taken_gt_8_values, default=0))
-        y_upper_limit = max_time_taken + 2 if max_time_taken > 10 else 10
-        self.ax2.set_ylim(0, y_upper_limit)
-
-        # Utilisation de MaxNLocator pour limiter le nombre de ticks sur l'axe x
-        self.ax2.xaxis.set_major_locator(ticker.MaxNLocator(20))
-        self.fig2.autofmt_xdate()
-
-        # Gestion du curseur
-        if self.cursor2:
-            self.cursor2.visible = False
-
-        self.cursor2 = mplcursors.cursor([scatter_le_8, scatter_gt_8], hover=True)
-
-        @self.cursor2.connect("add")
-        def on_add_cursor2(sel):
-            tooltip_color = color_white
-            face_color = color_black
-            artist = sel.artist
-
-            if artist == scatter_le_8:
-                index = sel.index
-                if 0 <= index < len(filtered_data_le_8):
-                    ts, tt, pf, ep = filtered_data_le_8[index]
-                    timestamp_le_8 = ts.strftime('%d-%m-%Y %H:%M:%S')
-                    sel.annotation.set(text=f"{timestamp_le_8}\n"
-                                            f"Parcelles éligibles: {ep}\n"
-                                            f"Preuves trouvées: {pf}\n"
-                                            f"Temps: {tt:.2f}",
-                                       color=tooltip_color,
-                                       bbox=dict(facecolor=face_color, edgecolor='none'),
-                                       ha='left')
-
-            elif artist == scatter_gt_8:
-                index = sel.index
-                if 0 <= index < len(filtered_data_gt_8):
-                    ts, tt, pf, ep = filtered_data_gt_8[index]
-                    timestamp_gt_8 = ts.strftime('%d-%m-%Y %H:%M:%S')
-                    sel.annotation.set(text=f"{timestamp_gt_8}\n"
-                                            f"Parcelles éligibles: {ep}\n"
-                                            f"Preuves trouvées: {pf}\n"
-                                            f"Temps: {tt:.2f}",
-                                       color=tooltip_color,
-                                       bbox=dict(facecolor=face_color, edgecolor='none'),
-                                       ha='left')
+        self.ax2.set_title(f'Temps des preuves trouvées sur {range_title}', color=color_white)
+        axes_changed = self.update_axes(self.ax2, data, start_time, end_time)
+        axes_changed = self.update_farmer_chart(to_epoch_ms(start_time), to_epoch_ms(end_time)) or axes_changed
 
         # Mettre à jour le canevas
-        self.canvas2.draw()
+        self.refresh_chart(self.canvas2, self.ax2, self.scatter2, axes_changed)
 
     def center_window(self, width, height):
         screen_width = self.root.winfo_screenwidth()
@@ -932,13 +1239,34 @@ class LogMonitorApp:
         self.root.geometry(f'{width}x{height}+{x}+{y}')
 
     def close_app(self):
+        # Le thread d'ingestion enregistre le cache et ferme le fichier suivi avant de s'arrêter
+        if self.ingestor:
+            self.ingestor.stop()
         self.root.quit()
         self.root.destroy()
 
 
 def main():
+    # Nécessaire pour les processus d'analyse parallèle dans l'exécutable PyInstaller
+    multiprocessing.freeze_support()
+
+    parser = argparse.ArgumentParser(description="Surveillance des logs Chia")
+    parser.add_argument("--collector", help="adresse de l'API d'un collecteur, par exemple http://vm-chia:8765")
+    parser.add_argument("--log", action="append",
+                        help="fichier debug.log à suivre, \"nom=chemin\" pour nommer le harvester ; à répéter pour chaque harvester")
+    parser.add_argument("--alerts", help="configuration JSON des règles et des destinataires (webhook, script) des alertes")
+    parser.add_argument("--gap-multiple", type=float, default=cadence_gap_multiple,
+                        help="écart entre deux signage points, en multiple de l'intervalle habituel, au-delà duquel des signage points sont comptés manqués")
+    args = parser.parse_args()
+    # Configuration vérifiée avant d'ouvrir la fenêtre ; chaque chargement repart ensuite d'un moteur neuf
+    try:
+        create_alert_engine(args.alerts)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
     root = tk.Tk()
-    LogMonitorApp(root)
+    LogMonitorApp(root, collector_url=args.collector, log_sources=args.log, alert_config=args.alerts,
+                  gap_multiple=args.gap_multiple)
     root.mainloop()
 
 
@@ -4,7 +4,8 @@ import sys
 # Définir les bibliothèques nécessaires
 required_libraries = [
     'matplotlib',
-    'mplcursors'
+    'mplcursors',
+    'numpy'
 ]
 
 # Sous-modules pour vérification complète (inclus pour la clarté, mais pas installés via pip)
@@ -16,6 +17,7 @@ submodules = [
     'threading',
     'tkinter',
     'collections',
+    'array',
     'datetime',
     'tkinter.messagebox',
     'tkinter.ttk',
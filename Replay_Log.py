@@ -0,0 +1,77 @@
+import argparse
+import socket
+import sys
+import threading
+import time
+from datetime import datetime
+
+# Horodatage en tête de chaque ligne de debug.log : 2024-05-01T12:34:56.789
+timestamp_format = '%Y-%m-%dT%H:%M:%S.%f'
+timestamp_length = 23
+
+
+def replay_lines(file_path, rate, now):
+    """Relit file_path ligne par ligne, au rythme de rate lignes par seconde (0 : sans attente).
+
+    Avec now, l'horodatage de chaque ligne est remplacé par l'heure courante : le flux ressemble à un
+    harvester en fonctionnement, visible dans les graphiques de la dernière heure.
+    """
+    interval = 1 / rate if rate > 0 else 0
+    next_time = time.monotonic()
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
+        for line in file:
+            if now and line[:timestamp_length].count('-') == 2:
+                line = datetime.now().strftime(timestamp_format)[:-3] + line[timestamp_length:]
+            yield line
+            if interval:
+                next_time += interval
+                time.sleep(max(0, next_time - time.monotonic()))
+
+
+def replay_to_client(connection, args):
+    # Un client qui se déconnecte n'arrête que sa propre relecture
+    with connection:
+        try:
+            for line in replay_lines(args.log, args.rate, args.now):
+                connection.sendall(line.encode('utf-8'))
+            if args.hold:
+                # Connexion gardée ouverte sans données, comme un tail -F sur un log inactif
+                threading.Event().wait()
+        except OSError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejoue un debug.log comme une source en flux (sortie standard ou TCP), "
+                                                 "pour essayer les sources tcp:// et cmd: du collecteur")
+    parser.add_argument("log", help="debug.log à rejouer")
+    parser.add_argument("--rate", type=float, default=10, help="lignes par seconde (0 : le plus vite possible)")
+    parser.add_argument("--now", action="store_true", help="remplace l'horodatage des lignes par l'heure courante")
+    parser.add_argument("--port", type=int, help="sert le log à chaque client TCP de ce port au lieu de l'écrire sur la sortie standard")
+    parser.add_argument("--host", default="127.0.0.1", help="adresse d'écoute avec --port")
+    parser.add_argument("--hold", action="store_true", help="garde la connexion ou la sortie ouverte à la fin du log")
+    args = parser.parse_args()
+
+    if args.port is None:
+        try:
+            for line in replay_lines(args.log, args.rate, args.now):
+                sys.stdout.write(line)
+                sys.stdout.flush()
+            if args.hold:
+                threading.Event().wait()
+        except (BrokenPipeError, KeyboardInterrupt):
+            pass
+        return
+
+    with socket.create_server((args.host, args.port)) as server:
+        print(f"Relecture de {args.log} sur tcp://{args.host}:{args.port}", flush=True)
+        try:
+            while True:
+                connection, _ = server.accept()
+                threading.Thread(target=replay_to_client, args=(connection, args), daemon=True).start()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
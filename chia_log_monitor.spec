@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[('C:\\PycharmProjects\\Chia_Log_Monitor\\.venv\\Lib\\site-packages\\tqdm', 'Lib\\site-packages\\tqdm'), ('C:\\PycharmProjects\\Chia_Log_Monitor\\.venv\\Lib\\site-packages\\matplotlib', 'Lib\\site-packages\\matplotlib'), ('C:\\PycharmProjects\\Chia_Log_Monitor\\.venv\\Lib\\site-packages\\mplcursors', 'Lib\\site-packages\\mplcursors')],
     datas=[('C:\\PycharmProjects\\Chia_Log_Monitor\\images', 'images'), ('C:\\PycharmProjects\\Chia_Log_Monitor\\images\\icon.ico', 'images')],
-    hiddenimports=['matplotlib', 'mplcursors', 'platform', 'threading', 'tkinter', 'collections', 'datetime', 'tkinter.messagebox', 'tkinter.ttk', 'tkinter.filedialog', 'matplotlib.dates', 'matplotlib.pyplot', 'matplotlib.ticker', 'matplotlib.backends.backend_tkagg'],
+    hiddenimports=['matplotlib', 'mplcursors', 'numpy', 'platform', 'threading', 'tkinter', 'collections', 'datetime', 'tkinter.messagebox', 'tkinter.ttk', 'tkinter.filedialog', 'matplotlib.dates', 'matplotlib.pyplot', 'matplotlib.ticker', 'matplotlib.backends.backend_tkagg'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,93 @@
+import os
+import sys
+import unittest
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Chia_Log_Collector as collector
+
+names = ["nas"]
+second = 1000
+
+
+class RecordingSink:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, alert):
+        self.sent.append((alert['state'], alert['timestamp']))
+
+
+class AlertEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.now = collector.to_epoch_ms(datetime.now())
+        self.sink = RecordingSink()
+
+    def engine(self, rule):
+        return collector.AlertEngine([rule], [self.sink])
+
+    def feed(self, engine, start_ms, plots, step=9 * second):
+        for index, total_plots in enumerate(plots):
+            engine.add(0, start_ms + index * step, 0.5, total_plots, names)
+        return start_ms + len(plots) * step
+
+    def test_hysteresis(self):
+        # Déclenchée au-delà de 5 recherches lentes, retombée seulement à 2 ou moins
+        engine = self.engine(collector.SlowLookupsRule(count=5, window=600, clear=2))
+        start = self.now - 300 * second
+        for index in range(6):
+            engine.add(0, start + index * second, 9.0, 100, names)
+        self.assertEqual([state for state, _ in self.sink.sent], ["déclenchée"])
+        self.assertEqual(len(engine.snapshot()), 1)
+
+        # Recherches lentes qui sortent de la fenêtre : 3 restantes, sous le seuil mais l'alerte tient
+        engine.add(0, start + 602 * second, 0.5, 100, names)
+        self.assertEqual(len(engine.snapshot()), 1)
+        engine.add(0, start + 603 * second, 0.5, 100, names)
+        self.assertEqual(engine.snapshot(), ())
+        self.assertEqual([state for state, _ in self.sink.sent], ["déclenchée", "résolue"])
+
+    def test_cooldown_limits_notifications(self):
+        engine = self.engine(collector.PlotDropRule(plots=10, cooldown=1800))
+        start = self.now - 120 * second
+        end = self.feed(engine, start, [100, 50, 100, 50, 100])
+        # Deuxième chute dans le cooldown : active mais ni notifiée, ni son retour à la normale
+        self.assertEqual([state for state, _ in self.sink.sent], ["déclenchée", "résolue"])
+        self.assertEqual(engine.snapshot(), ())
+        self.feed(engine, end, [50])
+        self.assertFalse(engine.snapshot()[0]['notified'])
+
+    def test_old_samples_do_not_notify_or_start_cooldown(self):
+        engine = self.engine(collector.PlotDropRule(plots=10))
+        # Chute et retour dans l'historique chargé : rien n'est envoyé
+        self.feed(engine, self.now - 3600 * second, [100, 50, 100])
+        self.assertEqual(self.sink.sent, [])
+        # Une chute récente est notifiée, le cooldown n'ayant pas démarré
+        self.feed(engine, self.now - 20 * second, [100, 50, 100])
+        self.assertEqual([state for state, _ in self.sink.sent], ["déclenchée", "résolue"])
+
+    def test_backfilled_alert_notified_when_still_active(self):
+        engine = self.engine(collector.PlotDropRule(plots=10))
+        self.feed(engine, self.now - 3600 * second, [100, 50])
+        self.assertEqual(self.sink.sent, [])
+        engine.add(0, self.now, 0.5, 50, names)
+        self.assertEqual(self.sink.sent, [("déclenchée", self.now)])
+        engine.add(0, self.now + 9 * second, 0.5, 100, names)
+        self.assertEqual([state for state, _ in self.sink.sent], ["déclenchée", "résolue"])
+
+    def test_quantile_rule_sees_spike_inside_batch(self):
+        # Pic au milieu d'un lot, retombé avant sa fin : évalué échantillon par échantillon
+        engine = self.engine(collector.LatencyQuantileRule(threshold=5, clear=3, quantile=0.5, window="10 min", min_count=3))
+        times = np.array([0.5] * 5 + [20.0] * 10 + [0.5] * 40, dtype=np.float32)
+        count = len(times)
+        chunk = {'timestamp': self.now - 60 * second + np.arange(count, dtype=np.int64) * second, 'time_taken': times,
+                 'total_plots': np.full(count, 100, dtype=np.int32), 'harvester': np.zeros(count, dtype=np.int16)}
+        engine.add_columns(chunk, names)
+        self.assertEqual([state for state, _ in self.sink.sent], ["déclenchée", "résolue"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Chia_Log_Collector as collector
+
+
+def signage_timestamps(seed, count=20000):
+    # Cadence bruitée autour de 9,4 s, avec des trous, des écarts très courts et des lignes en retard
+    rng = np.random.default_rng(seed)
+    intervals = rng.normal(collector.signage_point_interval, 2500, count).clip(50)
+    gaps = rng.random(count) < 0.02
+    intervals[gaps] = rng.uniform(15000, 120000, gaps.sum())
+    timestamps = (1_790_000_000_000 + np.cumsum(intervals)).astype(np.int64)
+    late = np.flatnonzero(rng.random(count) < 0.01)
+    late = late[late > 0]
+    timestamps[late] = timestamps[late - 1] - rng.integers(0, 3000, len(late))
+    return timestamps
+
+
+class CadenceTrackerTest(unittest.TestCase):
+    def assertSameState(self, online, columns):
+        self.assertEqual(columns.missed, online.missed)
+        self.assertEqual(list(columns.gaps), list(online.gaps))
+        self.assertEqual(list(columns.hourly), list(online.hourly))
+        self.assertEqual(columns.last, online.last)
+        self.assertAlmostEqual(columns.interval, online.interval, places=6)
+
+    def test_add_columns_matches_add(self):
+        for seed in range(10):
+            timestamps = signage_timestamps(seed)
+            online = collector.CadenceTracker()
+            for timestamp in timestamps.tolist():
+                online.add(timestamp)
+            columns = collector.CadenceTracker()
+            for chunk in np.array_split(timestamps, 7):
+                columns.add_columns(chunk)
+            self.assertGreater(online.missed, 0)
+            self.assertSameState(online, columns)
+
+    def test_columns_then_online(self):
+        # Chargement en colonnes puis suivi ligne par ligne : même état que tout en suivi
+        timestamps = signage_timestamps(42, 5000)
+        online = collector.CadenceTracker()
+        for timestamp in timestamps.tolist():
+            online.add(timestamp)
+        mixed = collector.CadenceTracker()
+        mixed.add_columns(timestamps[:3000])
+        for timestamp in timestamps[3000:].tolist():
+            mixed.add(timestamp)
+        self.assertSameState(online, mixed)
+
+    def test_gap_counts_missed_signage_points(self):
+        tracker = collector.CadenceTracker()
+        start = 1_790_000_000_000
+        tracker.add_columns(np.array([start + index * 9375 for index in range(10)], dtype=np.int64))
+        tracker.add(start + 9 * 9375 + 5 * 9375)
+        self.assertEqual(tracker.missed, 4)
+        self.assertEqual(tracker.gaps[-1], (start + 9 * 9375, start + 14 * 9375, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
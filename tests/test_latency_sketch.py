@@ -0,0 +1,86 @@
+import os
+import sys
+import unittest
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Chia_Log_Collector as collector
+
+quantiles = (0.5, 0.9, 0.95, 0.99)
+
+
+def sketch_of(values):
+    sketch = collector.LatencySketch()
+    for value in values:
+        sketch.add(collector.LatencySketch.index(value))
+    return sketch
+
+
+def exact_quantile(values, quantile):
+    # Même définition que LatencySketch.quantiles : rang au plus proche de q × (n - 1)
+    return np.sort(values)[int(quantile * (len(values) - 1))]
+
+
+class LatencySketchTest(unittest.TestCase):
+    def test_relative_error_bounded(self):
+        rng = np.random.default_rng(0)
+        values = rng.lognormal(-0.5, 1.2, 20000).clip(0.002, 250)
+        sketch = sketch_of(values)
+        self.assertEqual(sketch.count, len(values))
+        for quantile, estimate in zip(quantiles, sketch.quantiles(quantiles)):
+            exact = exact_quantile(values, quantile)
+            self.assertLessEqual(abs(estimate - exact), collector.sketch_relative_accuracy * exact * (1 + 1e-9), quantile)
+
+    def test_merge_matches_single_sketch(self):
+        rng = np.random.default_rng(1)
+        first, second = rng.exponential(0.7, 3000), rng.exponential(4, 1000)
+        merged = sketch_of(first)
+        merged.merge(sketch_of(second))
+        whole = sketch_of(np.concatenate((first, second)))
+        self.assertEqual(merged.count, whole.count)
+        self.assertTrue(np.array_equal(merged.counts, whole.counts))
+        self.assertEqual(merged.quantiles(quantiles), whole.quantiles(quantiles))
+
+    def test_removed_sample_no_longer_counted(self):
+        sketch = sketch_of([0.5, 0.6, 30])
+        sketch.add(collector.LatencySketch.index(30), -1)
+        self.assertEqual(sketch.count, 2)
+        self.assertLess(sketch.quantiles([1])[0], 1)
+
+
+class SlidingLatencyTest(unittest.TestCase):
+    def test_window_keeps_only_recent_samples(self):
+        rng = np.random.default_rng(2)
+        duration = 60000
+        window = collector.SlidingLatency(duration)
+        timestamps = 1_790_000_000_000 + np.cumsum(rng.integers(1000, 15000, 2000))
+        times = rng.exponential(1, len(timestamps))
+        for position, (timestamp, time_taken) in enumerate(zip(timestamps.tolist(), times.tolist())):
+            window.add(timestamp, time_taken, collector.LatencySketch.index(time_taken))
+            inside = times[:position + 1][timestamps[:position + 1] > timestamp - duration]
+            self.assertEqual(window.sketch.count, len(inside))
+            self.assertEqual(len(window.samples), len(inside))
+            self.assertEqual(window.minimum[0][1], inside.min())
+            self.assertEqual(window.maximum[0][1], inside.max())
+
+        # Sans nouvel échantillon, la fenêtre se vide en vieillissant
+        window.expire(int(timestamps[-1]) + duration)
+        self.assertEqual(window.sketch.count, 0)
+        self.assertFalse(window.samples or window.minimum or window.maximum)
+        self.assertEqual(int(window.sketch.counts.sum()), 0)
+
+    def test_backfill_bounded_by_current_time(self):
+        # Chargement : seuls les échantillons encore dans la plus longue fenêtre à l'heure actuelle sont ajoutés
+        now = collector.to_epoch_ms(datetime.now())
+        longest = max(collector.latency_windows.values())
+        timestamps = np.arange(now - 2 * longest, now, 60000, dtype=np.int64)
+        latency = collector.HarvesterLatency()
+        latency.add_columns({'timestamp': timestamps, 'time_taken': np.full(len(timestamps), 0.5, dtype=np.float32)})
+        self.assertEqual(latency.windows[-1].sketch.count, int((timestamps > now - longest).sum()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Chia_Log_Collector as collector
+
+
+def interleaved_timestamps(seed, count=3000):
+    # Deux harvesters dont les lignes arrivent par lots, l'un avec 90 s de retard, plus quelques rattrapages
+    rng = np.random.default_rng(seed)
+    base = 1_790_000_000_000 + np.cumsum(rng.integers(1000, 10000, count))
+    harvesters = rng.integers(0, 2, count)
+    timestamps = base - harvesters * 90000
+    late = rng.random(count) < 0.01
+    timestamps[late] -= rng.integers(0, 3600000, late.sum())
+    return timestamps.astype(np.int64), harvesters.astype(np.int16)
+
+
+def store_of(timestamps, harvesters, chunked=False):
+    store = collector.LogStore()
+    if chunked:
+        for rows in np.array_split(np.arange(len(timestamps)), 5):
+            store.extend({'timestamp': timestamps[rows], 'eligible_plots': rows.astype(np.int32),
+                          'proofs_found': np.zeros(len(rows), dtype=np.int32), 'time_taken': np.full(len(rows), 0.5, dtype=np.float32),
+                          'total_plots': np.full(len(rows), 10, dtype=np.int32), 'harvester': harvesters[rows]})
+    else:
+        for row, (timestamp, harvester) in enumerate(zip(timestamps.tolist(), harvesters.tolist())):
+            store.append(timestamp, row, 0, 0.5, 10, harvester)
+    return store
+
+
+class LogStoreWindowTest(unittest.TestCase):
+    def check_windows(self, store, timestamps, rng, ranks=None):
+        ranks = np.arange(len(timestamps)) if ranks is None else ranks
+        for _ in range(200):
+            start, end = np.sort(rng.choice(timestamps, 2))
+            end = None if rng.random() < 0.2 else int(end)
+            window = store.window(int(start), end)
+            mask = timestamps >= start
+            if end is not None:
+                mask &= timestamps <= end
+            rows = np.flatnonzero(mask)
+            rows = rows[np.argsort(timestamps[rows], kind='stable')]
+            self.assertTrue(np.array_equal(window['timestamp'], timestamps[rows]))
+            # Les autres colonnes suivent les mêmes lignes (eligible_plots porte le rang d'arrivée)
+            self.assertTrue(np.array_equal(window['eligible_plots'], ranks[rows]))
+
+    def test_out_of_order_rows(self):
+        for chunked in (False, True):
+            timestamps, harvesters = interleaved_timestamps(int(chunked))
+            store = store_of(timestamps, harvesters, chunked)
+            self.assertGreater(store.max_lag, 0)
+            self.check_windows(store, timestamps, np.random.default_rng(3))
+
+    def test_sort_keeps_windows_and_snapshots(self):
+        timestamps, harvesters = interleaved_timestamps(4)
+        store = store_of(timestamps, harvesters)
+        before = store.snapshot()
+        generation = store.generation
+        store.sort()
+        self.assertEqual(store.max_lag, 0)
+        self.assertEqual(store.generation, generation + 1)
+        self.assertTrue(np.all(np.diff(store.column('timestamp')) >= 0))
+        order = np.argsort(timestamps, kind='stable')
+        self.check_windows(store, timestamps[order], np.random.default_rng(5), order)
+        # L'instantané pris avant le tri voit toujours les lignes dans l'ordre d'arrivée
+        self.assertTrue(np.array_equal(before.column('timestamp'), timestamps))
+        self.check_windows(before, timestamps, np.random.default_rng(6))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Chia_Log_Collector as collector
+
+
+def zero_inode(function):
+    # Partage réseau qui ne fournit pas d'inode : seule la taille reste utilisable
+    def stat(*args, **kwargs):
+        result = function(*args, **kwargs)
+        return SimpleNamespace(st_ino=0, st_size=result.st_size, st_mtime=result.st_mtime)
+    return stat
+
+
+class LogTailerZeroInodeTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.log_path = os.path.join(self.directory.name, "debug.log")
+        patches = [mock.patch.object(collector.os, 'stat', zero_inode(os.stat)),
+                   mock.patch.object(collector.os, 'fstat', zero_inode(os.fstat))]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def write(self, path, lines, mode='a'):
+        with open(path, mode) as file:
+            file.writelines(f"{line}\n" for line in lines)
+
+    def test_rotation_follows_new_file_without_duplicates(self):
+        old_lines = [f"ancienne ligne {index}" for index in range(20)]
+        self.write(self.log_path, old_lines)
+        tailer = collector.LogTailer(self.log_path)
+        self.addCleanup(tailer.close)
+        self.assertEqual(tailer.read_new_lines(), old_lines)
+
+        # Rotation : debug.log renommé, puis un nouveau debug.log plus court que la position lue
+        self.write(self.log_path, ["fin de l'ancien fichier"])
+        os.replace(self.log_path, f"{self.log_path}.1")
+        self.write(self.log_path, ["nouvelle ligne 0"], mode='w')
+
+        self.assertEqual(tailer.read_new_lines(), ["fin de l'ancien fichier", "nouvelle ligne 0"])
+        self.assertEqual(tailer.read_new_lines(), [])
+
+        self.write(self.log_path, ["nouvelle ligne 1"])
+        self.assertEqual(tailer.read_new_lines(), ["nouvelle ligne 1"])
+        self.assertEqual(tailer.read_new_lines(), [])
+
+    def test_truncation_restarts_at_beginning(self):
+        self.write(self.log_path, [f"ligne {index}" for index in range(20)])
+        tailer = collector.LogTailer(self.log_path)
+        self.addCleanup(tailer.close)
+        tailer.read_new_lines()
+
+        self.write(self.log_path, ["après troncature"], mode='w')
+        self.assertEqual(tailer.read_new_lines(), ["après troncature"])
+        self.assertEqual(tailer.read_new_lines(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
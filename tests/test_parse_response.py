@@ -0,0 +1,50 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Chia_Log_Collector as collector
+
+
+class ParseResponseTest(unittest.TestCase):
+    def test_python_and_json_literals(self):
+        self.assertEqual(collector.parse_response("{'current_difficulty': 12, 'ok': True, 'fee': None, 'items': [1, 2.5]}"),
+                         {'current_difficulty': 12, 'ok': True, 'fee': None, 'items': [1, 2.5]})
+        self.assertEqual(collector.parse_response('{"current_points": 7, "ok": true, "fee": null}'),
+                         {'current_points': 7, 'ok': True, 'fee': None})
+
+    def test_rejects_code(self):
+        with tempfile.TemporaryDirectory() as directory:
+            marker = os.path.join(directory, "executed")
+            for text in (f"{{'a': __import__('os').mkdir({marker!r})}}",
+                         f"{{'a': open({marker!r}, 'w')}}",
+                         "{'a': (lambda: 1)()}",
+                         "{'a': [x for x in range(3)]}",
+                         "{'a': 1 if True else 2}",
+                         "{'a': b}"):
+                self.assertIsNone(collector.parse_response(text), text)
+            self.assertFalse(os.path.exists(marker))
+
+    def test_rejects_non_dict_and_malformed(self):
+        for text in ("{1, 2}", "[1, 2]", "{'a': 1", "{'a': 1}}", "{'a' 1}", '{"a": }', ""):
+            self.assertIsNone(collector.parse_response(text), text)
+
+    def test_rejects_deep_nesting(self):
+        depth = 100000
+        self.assertIsNone(collector.parse_response("{'a': " + "[" * depth + "]" * depth + "}"))
+
+    def test_farmer_line_with_code_is_ignored(self):
+        collector.reset_log_data(["test"])
+        self.addCleanup(collector.reset_log_data, ["local"])
+        prefix = "2026-10-18T10:00:00.000 2.4.1 farmer chia.farmer.farmer: INFO     GET /farmer response: "
+        self.assertTrue(collector.parse_farmer_info(prefix + "{'current_difficulty': __import__('os').getpid(), 'current_points': 3}"))
+        self.assertEqual(collector.farmer_info, {})
+        self.assertTrue(collector.parse_farmer_info(prefix + "{'current_difficulty': 12, 'current_points': 3}"))
+        self.assertEqual(collector.farmer_info, {'current_difficulty': 12, 'current_points': 3})
+        self.assertEqual(len(collector.log_data.farmer), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
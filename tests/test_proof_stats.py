@@ -0,0 +1,62 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Chia_Log_Collector as collector
+
+minute = 60 * 1000
+day = 24 * 60 * minute
+now = 1_792_000_000_000
+
+
+def chunk(timestamps, proofs, total_plots, harvester):
+    count = len(timestamps)
+    return {'timestamp': np.array(timestamps, dtype=np.int64),
+            'eligible_plots': np.ones(count, dtype=np.int32),
+            'proofs_found': np.array(proofs, dtype=np.int32),
+            'time_taken': np.full(count, 0.5, dtype=np.float32),
+            'total_plots': np.full(count, total_plots, dtype=np.int32),
+            'harvester': np.full(count, harvester, dtype=np.int16)}
+
+
+class ProofStatsMultiHarvesterTest(unittest.TestCase):
+    # Harvester A suivi en direct, puis rattrapage du harvester B dont l'historique est plus ancien
+    live_a = chunk([now - 20 * minute, now - 10 * minute, now - 5 * minute], [0, 1, 0], 100, 0)
+    backfill_b = chunk([now - 3 * day, now - 2 * day, now - day], [0, 1, 0], 200, 1)
+
+    def check(self, stats):
+        self.assertEqual(stats.first_timestamp, now - 3 * day)
+        self.assertEqual(stats.last_timestamp, now - 5 * minute)
+        self.assertEqual(stats.last_proof_le_8, now - 10 * minute)
+        self.assertIsNone(stats.last_proof_gt_8)
+        self.assertEqual(stats.total_plots, 100)
+        self.assertEqual(stats.total_proofs, 2)
+
+    def test_add_columns_independent_of_ingestion_order(self):
+        for chunks in ((self.live_a, self.backfill_b), (self.backfill_b, self.live_a)):
+            stats = collector.ProofStats()
+            for columns in chunks:
+                stats.add_columns(columns)
+            self.check(stats)
+
+    def test_add_matches_add_columns(self):
+        stats = collector.ProofStats()
+        for columns in (self.live_a, self.backfill_b):
+            for row in range(len(columns['timestamp'])):
+                stats.add(int(columns['timestamp'][row]), 1, int(columns['proofs_found'][row]), 0.5, int(columns['total_plots'][row]))
+        self.check(stats)
+
+    def test_unordered_chunk(self):
+        stats = collector.ProofStats()
+        stats.add_columns(chunk([now - minute, now - 3 * minute, now - 2 * minute], [1, 1, 0], 50, 0))
+        self.assertEqual(stats.first_timestamp, now - 3 * minute)
+        self.assertEqual(stats.last_timestamp, now - minute)
+        self.assertEqual(stats.last_proof_le_8, now - minute)
+
+
+if __name__ == "__main__":
+    unittest.main()